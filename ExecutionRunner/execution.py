@@ -1,11 +1,20 @@
 import asyncio
-import ccxt.pro
 import time
+import uuid
 import nest_asyncio
 import asyncio
 
+from price_stream import PriceStream
+from order_tracker import OrderTracker
+from order_book import OrderBookCache
+from paired import Leg, PairedExecutor
+from slicing import SliceScheduler
+from latency import LatencyRecorder, BackgroundPrinter
+
+BATCH_SIZE = 5  # create_orders 1회당 최대 주문 수 (binance 선물 batchOrders 한도)
+
 class UniversalOrderManager:
-    def __init__(self, primary_exchange_name, primary_api_key, primary_api_secret, primary_password=None, secondary_exchange_name=None, secondary_api_key=None, secondary_api_secret=None, secondary_password=None):
+    def __init__(self, primary_exchange_name, primary_api_key, primary_api_secret, primary_password=None, secondary_exchange_name=None, secondary_api_key=None, secondary_api_secret=None, secondary_password=None, exchange_factory=None):
         """
         주문 관리자 초기화
         :param primary_exchange_name: 주요 거래소 이름
@@ -16,6 +25,7 @@ class UniversalOrderManager:
         :param secondary_api_key: 보조 거래소 API 키 (선택사항)
         :param secondary_api_secret: 보조 거래소 API 시크릿 (선택사항)
         :param secondary_password: 보조 거래소 API 비밀번호 (선택사항)
+        :param exchange_factory: 거래소 이름 -> 거래소 클래스 함수 (선택사항, 기본값은 ccxt.pro, 시뮬레이터 주입용)
         """
         self.primary_exchange_name = primary_exchange_name
         self.primary_api_key = primary_api_key
@@ -25,8 +35,9 @@ class UniversalOrderManager:
         self.secondary_api_key = secondary_api_key
         self.secondary_api_secret = secondary_api_secret
         self.secondary_password = secondary_password
+        self.exchange_factory = exchange_factory
 
-        self.primary_exchange = getattr(ccxt.pro, self.primary_exchange_name)({
+        self.primary_exchange = self._exchange_class(self.primary_exchange_name)({
             "apiKey": self.primary_api_key,
             "secret": self.primary_api_secret,
             "password": self.primary_password,
@@ -35,44 +46,90 @@ class UniversalOrderManager:
 
         self.secondary_exchange = None
         if self.secondary_exchange_name and self.secondary_api_key and self.secondary_api_secret:
-            self.secondary_exchange = getattr(ccxt.pro, self.secondary_exchange_name)({
+            self.secondary_exchange = self._exchange_class(self.secondary_exchange_name)({
                 "apiKey": self.secondary_api_key,
                 "secret": self.secondary_api_secret,
                 "password": self.secondary_password,
                 "enableRateLimit": True,
             })
 
+        self._init_state()
+
+    def _exchange_class(self, name):
+        if self.exchange_factory is not None:
+            return self.exchange_factory(name)
+        import ccxt.pro
+        return getattr(ccxt.pro, name)
+
+    @classmethod
+    def from_exchanges(cls, primary_exchange, secondary_exchange=None, trackers=None, order_books=None, latency=None):
+        """
+        이미 생성된(공유) 거래소 인스턴스로 주문 관리자 생성
+        :param primary_exchange: 주요 거래소 인스턴스
+        :param secondary_exchange: 보조 거래소 인스턴스 (선택사항)
+        :param trackers: id(거래소 인스턴스) -> 공유 OrderTracker (선택사항)
+        :param order_books: id(거래소 인스턴스) -> 공유 OrderBookCache (선택사항)
+        :param latency: 공유 LatencyRecorder (선택사항)
+        """
+        manager = cls.__new__(cls)
+        manager.primary_exchange_name = getattr(primary_exchange, "id", None)
+        manager.primary_api_key = manager.primary_api_secret = manager.primary_password = None
+        manager.secondary_exchange_name = getattr(secondary_exchange, "id", None)
+        manager.secondary_api_key = manager.secondary_api_secret = manager.secondary_password = None
+        manager.exchange_factory = None
+        manager.primary_exchange = primary_exchange
+        manager.secondary_exchange = secondary_exchange
+        manager._init_state(trackers, order_books, latency)
+        return manager
+
+    def _init_state(self, trackers=None, order_books=None, latency=None):
         self.active_orders = {"spot": [], "futures": []}  # 시장 유형별 활성 주문
 
-        # 실시간 가격 저장 변수
-        self.prices = {
-            "primary": {},
-            "secondary": {}
-        }
+        # 주문 지연 시간 기록기 및 주문 경로 밖에서 출력하는 로그
+        self.latency = latency or LatencyRecorder()
+        self.log = BackgroundPrinter()
+
+        # 거래소별 웹소켓 주문 상태 추적기 및 L2 호가창 캐시
+        self.trackers = dict(trackers or {})
+        self.order_books = dict(order_books or {})
+        for exchange in (self.primary_exchange, self.secondary_exchange):
+            if exchange is not None:
+                self.trackers.setdefault(id(exchange), OrderTracker(exchange))
+                self.order_books.setdefault(id(exchange), OrderBookCache(exchange))
+        for tracker in self.trackers.values():
+            if tracker.recorder is None:
+                tracker.recorder = self.latency
+
+        # 두 다리 동시 주문 실행기 (전송/응답 시차 기록)
+        self.pairs = PairedExecutor(self.trackers, self.latency, self.log)
+
+        # 실시간 가격 스트림 (거래소/심볼 동시 구독)
+        self.price_stream = PriceStream({
+            "primary": self.primary_exchange,
+            "secondary": self.secondary_exchange
+        })
+
+        # 실시간 가격 저장 변수 (스트림이 메시지 수신 시 갱신)
+        self.prices = self.price_stream.prices
 
     async def update_prices(self, symbols):
         """
         실시간으로 가격 업데이트
         :param symbols: 주요 및 보조 거래소 심볼 딕셔너리 {"primary": [심볼1, 심볼2], "secondary": [심볼1, 심볼2]}
         """
-        while True:
-            try:
-                for symbol in symbols["primary"]:
-                    primary_ticker = await self.primary_exchange.watch_ticker(symbol)
-                    self.prices["primary"][symbol] = primary_ticker['last']
-                    print(f"[가격 업데이트] 주요 거래소 {symbol} 가격: {self.prices['primary'][symbol]}")
+        await self.price_stream.run(symbols)
 
-                if self.secondary_exchange:
-                    for symbol in symbols["secondary"]:
-                        secondary_ticker = await self.secondary_exchange.watch_ticker(symbol)
-                        self.prices["secondary"][symbol] = secondary_ticker['last']
-                        print(f"[가격 업데이트] 보조 거래소 {symbol} 가격: {self.prices['secondary'][symbol]}")
-
-                await asyncio.sleep(1)  # 가격 업데이트 주기
-            except Exception as e:
-                print(f"가격 업데이트 중 에러 발생: {e}")
+    async def wait_price(self, key, symbol, timeout=None):
+        """
+        가격 변경 시까지 대기
+        :param key: "primary" 또는 "secondary"
+        :param symbol: 거래 심볼
+        :param timeout: 최대 대기 시간(초)
+        :return: Quote 객체 (bid/ask/last)
+        """
+        return await self.price_stream.wait_changed(key, symbol, timeout)
 
-    async def place_order(self, exchange, symbol, price, amount, market_type, side, order_type="limit"):
+    async def place_order(self, exchange, symbol, price, amount, market_type, side, order_type="limit", decision_ns=None, params=None):
         """
         주문 생성 함수
         :param exchange: ccxt.pro 거래소 인스턴스
@@ -82,8 +139,13 @@ class UniversalOrderManager:
         :param market_type: "spot" 또는 "futures"
         :param side: "buy" 또는 "sell"
         :param order_type: "limit" 또는 "market"
+        :param decision_ns: 주문 결정 시각 (time.perf_counter_ns, 선택사항)
+        :param params: 거래소별 추가 파라미터 (선택사항)
         :return: 주문 객체
         """
+        params = params or {}
+        if decision_ns is None:
+            decision_ns = LatencyRecorder.now()
         try:
             if order_type == "limit":
                 order_func = exchange.create_limit_buy_order if side == "buy" else exchange.create_limit_sell_order
@@ -92,70 +154,269 @@ class UniversalOrderManager:
             else:
                 raise ValueError("order_type은 'limit' 또는 'market'이어야 합니다.")
 
-            order = await order_func(symbol, amount, price) if order_type == "limit" else await order_func(symbol, amount)
-            print(f"[{market_type.upper()}] {side.upper()} {order_type.upper()} 주문 생성 완료: {order}")
+            sent_ns = LatencyRecorder.now()
+            order = await order_func(symbol, amount, price, params) if order_type == "limit" \
+                else await order_func(symbol, amount, params)
+            self.latency.order_sent(getattr(exchange, "id", "unknown"), order_type, decision_ns, sent_ns,
+                                    LatencyRecorder.now(), order)
+            self.log(f"[{market_type.upper()}] {side.upper()} {order_type.upper()} 주문 생성 완료: {order}")
             return order
         except Exception as e:
-            print(f"주문 생성 중 에러 발생: {e}")
+            self.log(f"주문 생성 중 에러 발생: {e}")
             return None
 
+    async def place_orders(self, exchange, orders, batch_size=BATCH_SIZE):
+        """
+        여러 주문 일괄 생성 (create_orders 지원 거래소는 배치 전송, 미지원 시 단일 주문 동시 전송)
+        :param exchange: ccxt.pro 거래소 인스턴스
+        :param orders: 주문 설정 리스트 [{"symbol", "side", "amount", "price", "order_type", "market_type", "params", "tag"}]
+        :param batch_size: create_orders 1회당 최대 주문 수
+        :return: 입력 순서대로 [(tag, 주문 객체 또는 None)] (tag 미지정 시 입력 순번)
+        """
+        decision_ns = LatencyRecorder.now()
+        tags = [order.get('tag', i) for i, order in enumerate(orders)]
+        has = getattr(exchange, "has", {}) or {}
+        if not has.get("createOrders"):
+            results = await asyncio.gather(*(
+                self.place_order(exchange, order['symbol'], order.get('price'), order['amount'],
+                                 order.get('market_type', "spot"), order['side'], order.get('order_type', "limit"),
+                                 decision_ns, order.get('params'))
+                for order in orders))
+            return list(zip(tags, results))
+
+        chunks = [orders[i:i + batch_size] for i in range(0, len(orders), batch_size)]
+        results = await asyncio.gather(*(self._place_batch(exchange, chunk, decision_ns) for chunk in chunks))
+        return list(zip(tags, [order for chunk in results for order in chunk]))
+
+    async def _place_batch(self, exchange, orders, decision_ns):
+        requests = []
+        for order in orders:
+            order_type = order.get('order_type', "limit")
+            params = dict(order.get('params') or {})
+            # 거절된 주문을 응답에서 빼는 거래소가 있어 순서가 아닌 clientOrderId로 결과를 매칭
+            params.setdefault('clientOrderId', f"uom{uuid.uuid4().hex[:20]}")
+            requests.append({
+                "symbol": order['symbol'],
+                "type": order_type,
+                "side": order['side'],
+                "amount": order['amount'],
+                "price": order.get('price') if order_type == "limit" else None,
+                "params": params,
+            })
+
+        sent_ns = LatencyRecorder.now()
+        try:
+            created = await exchange.create_orders(requests)
+        except Exception as e:
+            self.log(f"일괄 주문 생성 중 에러 발생: {e}")
+            return [None] * len(orders)
+        acked_ns = LatencyRecorder.now()
+
+        created = [order for order in created or [] if order]
+        by_client_id = {order['clientOrderId']: order for order in created if order.get('clientOrderId')}
+        # clientOrderId를 돌려주지 않는 거래소는 응답이 빠짐없이 올 때만 순서로 매칭
+        positional = not by_client_id and len(created) == len(requests)
+
+        results = []
+        for i, request in enumerate(requests):
+            if positional:
+                order = created[i]
+            else:
+                order = by_client_id.get(request['params']['clientOrderId'])
+            if order is None or order.get('id') is None:
+                self.log(f"[일괄 주문] {request['symbol']} {request['side'].upper()} 주문 거절 또는 응답 누락: {order}")
+                results.append(None)
+                continue
+            self.latency.order_sent(getattr(exchange, "id", "unknown"), request['type'], decision_ns, sent_ns,
+                                    acked_ns, order)
+            results.append(order)
+        self.log(f"[일괄 주문] {len(results)}건 중 {sum(r is not None for r in results)}건 생성 완료")
+        return results
+
+    async def cancel_orders(self, exchange, orders):
+        """
+        여러 주문 일괄 취소 (cancel_orders 지원 거래소는 심볼별 배치 전송, 미지원 시 단일 취소 동시 전송)
+        :param exchange: ccxt.pro 거래소 인스턴스
+        :param orders: 주문 객체 리스트 (id, symbol 필요)
+        :return: 입력 순서대로 [(주문 ID, 취소 응답 또는 None)]
+        """
+        has = getattr(exchange, "has", {}) or {}
+
+        async def cancel_one(order):
+            try:
+                return await exchange.cancel_order(order['id'], order['symbol'])
+            except Exception as e:
+                self.log(f"주문 취소 중 에러 발생 ({order['id']}): {e}")
+                return None
+
+        if not has.get("cancelOrders"):
+            results = await asyncio.gather(*(cancel_one(order) for order in orders))
+            return [(order['id'], result) for order, result in zip(orders, results)]
+
+        by_symbol = {}
+        for order in orders:
+            by_symbol.setdefault(order['symbol'], []).append(order['id'])
+
+        async def cancel_batch(symbol, ids):
+            try:
+                # 응답 순서/누락과 무관하게 주문 ID로 매칭
+                return {order['id']: order for order in await exchange.cancel_orders(ids, symbol) or []
+                        if order and order.get('id') is not None}
+            except Exception as e:
+                self.log(f"일괄 주문 취소 중 에러 발생 ({symbol}): {e}")
+                return {}
+
+        cancelled = {}
+        for batch in await asyncio.gather(*(cancel_batch(symbol, ids) for symbol, ids in by_symbol.items())):
+            cancelled.update(batch)
+        return [(order['id'], cancelled.get(order['id'])) for order in orders]
+
+    def tracker(self, exchange):
+        """
+        거래소 인스턴스의 주문 추적기 조회 (최초 조회 시 스트림 시작)
+        :param exchange: ccxt.pro 거래소 인스턴스
+        :return: OrderTracker 객체
+        """
+        tracker = self.trackers.get(id(exchange))
+        if tracker is None:
+            tracker = self.trackers[id(exchange)] = OrderTracker(exchange)
+        tracker.start()
+        return tracker
+
+    def order_book(self, exchange):
+        """
+        거래소 인스턴스의 호가창 캐시 조회
+        :param exchange: ccxt.pro 거래소 인스턴스
+        :return: OrderBookCache 객체
+        """
+        cache = self.order_books.get(id(exchange))
+        if cache is None:
+            cache = self.order_books[id(exchange)] = OrderBookCache(exchange)
+        return cache
+
     async def monitor_orders(self, exchange, market_type):
         """
-        활성 주문의 상태를 주기적으로 확인
+        활성 주문의 상태를 추적기 기준으로 갱신 (REST 조회 없음)
         :param exchange: ccxt.pro 거래소 인스턴스
         :param market_type: "spot" 또는 "futures"
         """
         try:
-            # 활성 주문 확인
-            open_orders = await exchange.fetch_open_orders()
-            print(f"[{market_type.upper()}] 활성 주문: {open_orders}")
+            tracker = self.tracker(exchange)
+            for order in self.active_orders[market_type]:
+                if tracker.get(order['id']) is None:
+                    tracker.track(order)
 
-            # 주문 상태 업데이트
+            # 순회 중 리스트를 변경하지 않도록 새 리스트로 교체
+            remaining = []
             for order in self.active_orders[market_type]:
-                # 활성 주문에서 해당 주문을 찾기
-                matching_orders = [o for o in open_orders if o['id'] == order['id']]
-                
-                if matching_orders:
-                    order_status = matching_orders[0]
-                    print(f"[{market_type.upper()}] 주문 상태 (활성): {order_status['status']}")
+                state = tracker.get(order['id'])
+                if state is not None and state.done:
+                    self.log(f"[{market_type.upper()}] 주문 상태 (완료): {state}")
                 else:
-                    # 주문이 더 이상 활성 상태가 아니면 체결 확인
-                    closed_orders = await exchange.fetch_closed_orders(symbol=order['symbol'])
-                    matching_closed_orders = [o for o in closed_orders if o['id'] == order['id']]
-                    
-                    if matching_closed_orders:
-                        order_status = matching_closed_orders[0]
-                        print(f"[{market_type.upper()}] 주문 상태 (완료): {order_status['status']}")
-                        self.active_orders[market_type].remove(order)
-
+                    remaining.append(order)
+            self.active_orders[market_type] = remaining
         except Exception as e:
-            print(f"주문 상태 확인 중 에러 발생: {e}")
+            self.log(f"주문 상태 확인 중 에러 발생: {e}")
 
-    async def execute_twap(self, primary_config, secondary_config, total_amount, duration_minutes, interval_seconds):
+    async def wait_fill(self, exchange, order, amount=None, timeout=None):
+        """
+        주문 체결 이벤트 대기 (폴링 없음)
+        :param exchange: ccxt.pro 거래소 인스턴스
+        :param order: 주문 객체
+        :param amount: 목표 체결 수량 (None이면 주문 전체)
+        :param timeout: 최대 대기 시간(초)
+        :return: OrderState 객체
+        """
+        tracker = self.tracker(exchange)
+        if tracker.get(order['id']) is None:
+            tracker.track(order)
+        return await tracker.wait_filled(order['id'], amount, timeout)
+
+    async def execute_pair(self, primary_config, secondary_config, amount, primary_price, hedge_mode="concurrent", timeout=None):
+        """
+        주요 거래소 지정가 + 보조 거래소 시장가 페어 주문
+        :param primary_config: 주요 거래소 주문 설정
+        :param secondary_config: 보조 거래소 주문 설정
+        :param amount: 거래 수량
+        :param primary_price: 주요 거래소 지정가
+        :param hedge_mode: "concurrent" (두 다리 동시 전송) 또는 "on_fill" (체결 이벤트마다 헤지)
+        :param timeout: on_fill 모드의 최대 대기 시간(초)
+        :return: PairResult 객체
+        """
+        primary_leg = Leg(self.primary_exchange, primary_config['symbol'], primary_config['side'], amount,
+                          primary_price, "limit", primary_config['market_type'])
+        secondary_leg = Leg(self.secondary_exchange, secondary_config['symbol'], secondary_config['side'], amount,
+                            None, "market", secondary_config['market_type'])
+
+        if hedge_mode == "on_fill":
+            result = await self.pairs.hedge_on_fill(primary_leg, secondary_leg, timeout=timeout)
+            secondary_orders = [hedge for _, _, hedge in result.hedges]
+        elif hedge_mode == "concurrent":
+            result = await self.pairs.submit(primary_leg, secondary_leg)
+            secondary_orders = [secondary_leg.order] if secondary_leg.order else []
+        else:
+            raise ValueError("hedge_mode는 'concurrent' 또는 'on_fill'이어야 합니다.")
+
+        if primary_leg.order:
+            self.active_orders[primary_config['market_type']].append(primary_leg.order)
+            await self.monitor_orders(self.primary_exchange, primary_config['market_type'])
+        if secondary_orders:
+            self.active_orders[secondary_config['market_type']].extend(secondary_orders)
+            await self.monitor_orders(self.secondary_exchange, secondary_config['market_type'])
+        return result
+
+    async def execute_twap(self, primary_config, secondary_config, total_amount, duration_minutes, interval_seconds,
+                           hedge_mode="concurrent", jitter=0.0, overrun="catch_up", amount_step=None):
         """
         TWAP 전략 실행 (실시간 가격 사용, default_price 제거)
+        :param hedge_mode: "concurrent" (두 다리 동시 전송) 또는 "on_fill" (체결 이벤트마다 헤지)
+        :param jitter: 슬라이스 간격 대비 무작위 흔들림 비율 (0 ~ 0.5)
+        :param overrun: 슬라이스 지연 시 처리 방식 ("catch_up" 또는 "skip")
+        :param amount_step: 최소 수량 단위 (지정 시 단위 배수로 나머지 없이 배분)
+        :return: SliceScheduler 객체 (슬라이스별 예정/실제 전송 시각 기록)
         """
+        schedule = SliceScheduler(total_amount, duration_minutes * 60, interval_seconds,
+                                  jitter=jitter, policy=overrun, amount_step=amount_step)
         try:
-            num_orders = int((duration_minutes * 60) / interval_seconds)  # 주문 횟수
-            order_amount = total_amount / num_orders  # 주문당 수량
+            num_orders = schedule.num_slices  # 주문 횟수
+
+            # 주요 거래소 호가창 구독 (슬라이스마다 REST 조회하지 않음)
+            books_primary = self.order_book(self.primary_exchange)
+            books_primary.subscribe(primary_config['symbol'])
 
-            for i in range(num_orders):
-                # 주요 거래소의 현재 호가 정보 가져오기
-                orderbook_primary = await self.primary_exchange.fetch_order_book(primary_config['symbol'])
-                if not orderbook_primary or not orderbook_primary['bids']:
+            # 처리 시간과 무관하게 monotonic 마감 시각마다 슬라이스 실행
+            async for slice_ in schedule:
+                order_amount = slice_.amount  # 주문당 수량
+
+                # 주요 거래소의 현재 호가 정보 가져오기 (캐시)
+                best_bid, best_ask = await books_primary.top(primary_config['symbol'])
+                if best_bid is None:
                     print("[TWAP] 주요 거래소의 매수 1호가 정보를 가져올 수 없습니다.")
                     break
 
                 # TWAP 매수 주문일 경우 매수 1호가(Best Bid), 매도 주문일 경우 매도 1호가(Best Ask)
                 if primary_config['side'] == "buy":
-                    primary_price = orderbook_primary['bids'][0][0]  # 매수 1호가
+                    primary_price = best_bid  # 매수 1호가
                 elif primary_config['side'] == "sell":
-                    primary_price = orderbook_primary['asks'][0][0]  # 매도 1호가
+                    primary_price = best_ask  # 매도 1호가
                 else:
                     print("[TWAP] 유효하지 않은 주문 방향입니다.")
                     break
 
-                print(f"[TWAP] 주요 거래소 {primary_config['side']} 주문 가격: {primary_price}")
+                self.log(f"[TWAP] 주요 거래소 {primary_config['side']} 주문 가격: {primary_price}")
+                slice_.mark_sent()
+
+                # 두 다리를 순차 전송하지 않고 동시에 (또는 체결 이벤트에 연동해) 전송
+                if self.secondary_exchange:
+                    result = await self.execute_pair(primary_config, secondary_config, order_amount, primary_price,
+                                                     hedge_mode=hedge_mode,
+                                                     timeout=schedule.time_to_next(slice_.index))
+                    slice_.ok = result.ok
+                    if result.ok:
+                        self.log(f"[TWAP] {slice_.index + 1}/{num_orders} 페어 주문: {result}")
+                    else:
+                        self.log(f"[TWAP] {slice_.index + 1}/{num_orders} 페어 주문 실패: {result}")
+                    continue
 
                 # 주요 거래소 주문 생성 (지정가)
                 primary_order = await self.place_order(
@@ -168,32 +429,23 @@ class UniversalOrderManager:
                     "limit"  # 지정가 주문
                 )
 
+                slice_.ok = primary_order is not None
                 if primary_order:
                     self.active_orders[primary_config['market_type']].append(primary_order)
                     await self.monitor_orders(self.primary_exchange, primary_config['market_type'])
 
-                # 보조 거래소 주문 생성 (시장가)
-                if self.secondary_exchange:
-                    print(f"[TWAP] 보조 거래소 {secondary_config['side']} 시장가 주문 실행")
-                    secondary_order = await self.place_order(
-                        self.secondary_exchange,
-                        secondary_config['symbol'],
-                        None,  # 시장가는 가격 필요 없음
-                        order_amount,
-                        secondary_config['market_type'],
-                        secondary_config['side'],
-                        "market"  # 시장가 주문
-                    )
-
-                    if secondary_order:
-                        self.active_orders[secondary_config['market_type']].append(secondary_order)
-                        await self.monitor_orders(self.secondary_exchange, secondary_config['market_type'])
-
-                await asyncio.sleep(interval_seconds)
-
-            print(f"[TWAP] 총 {num_orders}개의 주문 완료.")
+            self.log.flush()
+            failed = [s for s in schedule.slices if s.ok is False]
+            print(f"[TWAP] 총 {len(schedule.slices) - len(failed)}/{num_orders}개의 주문 완료.")
+            if failed:
+                print(f"[TWAP] 실패한 슬라이스 {len(failed)}개: {[s.index + 1 for s in failed]}")
+            print(f"[TWAP] 슬라이스 타이밍 요약: {schedule.summary()}")
+            if self.secondary_exchange:
+                print(f"[TWAP] 다리 간 시차 요약: {self.pairs.skew_summary()}")
+            print(f"[TWAP] 지연 시간 요약:\n{self.latency.format_summary()}")
         except Exception as e:
             print(f"TWAP 실행 중 에러 발생: {e}")
+        return schedule
 nest_asyncio.apply()
 
 if __name__ == "__main__":
@@ -0,0 +1,191 @@
+import asyncio
+import csv
+import json
+import time
+from array import array
+from collections import deque
+
+STAGES = ("decision_to_send", "send_to_ack", "ack_to_fill")
+# 히스토그램 버킷 상한 (마이크로초, 2의 거듭제곱)
+BUCKETS_US = tuple(2 ** i for i in range(6, 26))
+
+
+class RingBuffer:
+    """
+    미리 할당된 고정 크기 ns 기록 버퍼 (가득 차면 가장 오래된 값부터 덮어씀)
+    """
+    __slots__ = ("data", "capacity", "index", "count")
+
+    def __init__(self, capacity):
+        self.data = array("q", bytes(8 * capacity))
+        self.capacity = capacity
+        self.index = 0
+        self.count = 0
+
+    def append(self, value):
+        self.data[self.index] = value
+        self.index = (self.index + 1) % self.capacity
+        if self.count < self.capacity:
+            self.count += 1
+
+    def values(self):
+        if self.count < self.capacity:
+            return self.data[:self.count].tolist()
+        return (self.data[self.index:] + self.data[:self.index]).tolist()
+
+    def __len__(self):
+        return self.count
+
+
+def _percentile(values, q):
+    if not values:
+        return None
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+class LatencyRecorder:
+    def __init__(self, capacity=4096):
+        """
+        거래소/주문 유형/구간별 지연 시간 기록기 (time.perf_counter_ns 기준)
+        :param capacity: 키별 링 버퍼 크기
+        """
+        self.capacity = capacity
+        self.buffers = {}  # (거래소, 주문 유형, 구간) -> RingBuffer
+        self._acks = {}  # 주문 ID -> (거래소, 주문 유형, 응답 ns)
+
+    @staticmethod
+    def now():
+        return time.perf_counter_ns()
+
+    def record(self, exchange, order_type, stage, elapsed_ns):
+        """
+        구간 지연 시간 기록 (핫패스에서는 버퍼 쓰기만 수행)
+        :param exchange: 거래소 이름
+        :param order_type: "limit" 또는 "market"
+        :param stage: "decision_to_send", "send_to_ack", "ack_to_fill"
+        :param elapsed_ns: 경과 시간(ns)
+        """
+        key = (exchange, order_type, stage)
+        buffer = self.buffers.get(key)
+        if buffer is None:
+            buffer = self.buffers[key] = RingBuffer(self.capacity)
+        buffer.append(elapsed_ns)
+
+    def order_sent(self, exchange, order_type, decision_ns, sent_ns, acked_ns, order=None):
+        """
+        주문 전송 기록 (결정→전송, 전송→응답) 및 체결 측정을 위한 응답 시각 보관
+        """
+        if decision_ns is not None:
+            self.record(exchange, order_type, "decision_to_send", sent_ns - decision_ns)
+        self.record(exchange, order_type, "send_to_ack", acked_ns - sent_ns)
+        if order and order.get("id") is not None:
+            self._acks[order["id"]] = (exchange, order_type, acked_ns)
+            if len(self._acks) > self.capacity:
+                # 추적되지 않은 주문이 쌓이지 않도록 가장 오래된 응답부터 제거
+                self._acks.pop(next(iter(self._acks)))
+
+    def order_filled(self, order_id, filled_ns=None):
+        """
+        주문 전체 체결 시 응답→체결 구간 기록
+        """
+        entry = self._acks.pop(order_id, None)
+        if entry is None:
+            return
+        exchange, order_type, acked_ns = entry
+        self.record(exchange, order_type, "ack_to_fill", (filled_ns or self.now()) - acked_ns)
+
+    def forget(self, order_id):
+        self._acks.pop(order_id, None)
+
+    def histogram(self, exchange, order_type, stage):
+        """
+        구간 지연 히스토그램 (마이크로초 상한 -> 건수)
+        """
+        buffer = self.buffers.get((exchange, order_type, stage))
+        counts = dict.fromkeys(BUCKETS_US, 0)
+        counts["inf"] = 0
+        if buffer is None:
+            return counts
+        for value in buffer.values():
+            us = value / 1000
+            for bound in BUCKETS_US:
+                if us <= bound:
+                    counts[bound] += 1
+                    break
+            else:
+                counts["inf"] += 1
+        return counts
+
+    def summary(self):
+        """
+        키별 건수와 백분위 지연 시간(ms)
+        """
+        res = {}
+        for (exchange, order_type, stage), buffer in self.buffers.items():
+            values = sorted(buffer.values())
+            res[f"{exchange}/{order_type}/{stage}"] = {
+                "count": len(values),
+                "p50_ms": _percentile(values, 0.5) / 1e6,
+                "p90_ms": _percentile(values, 0.9) / 1e6,
+                "p99_ms": _percentile(values, 0.99) / 1e6,
+                "max_ms": values[-1] / 1e6,
+            }
+        return res
+
+    def export_json(self, path):
+        data = {
+            "summary": self.summary(),
+            "histograms": {f"{e}/{t}/{s}": {str(k): v for k, v in self.histogram(e, t, s).items()}
+                           for (e, t, s) in self.buffers},
+        }
+        with open(path, "w") as f:
+            json.dump(data, f, indent=2)
+
+    def export_csv(self, path):
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["exchange", "order_type", "stage", "elapsed_ns"])
+            for (exchange, order_type, stage), buffer in self.buffers.items():
+                for value in buffer.values():
+                    writer.writerow([exchange, order_type, stage, value])
+
+    def format_summary(self):
+        lines = [f"{key}: n={v['count']} p50={v['p50_ms']:.2f}ms p90={v['p90_ms']:.2f}ms "
+                 f"p99={v['p99_ms']:.2f}ms max={v['max_ms']:.2f}ms"
+                 for key, v in sorted(self.summary().items())]
+        return "\n".join(lines) if lines else "기록 없음"
+
+
+class BackgroundPrinter:
+    def __init__(self):
+        """
+        주문 경로에서 print로 블로킹하지 않도록 메시지를 모아 이벤트 루프 유휴 시 출력
+        """
+        self._messages = deque()
+        self._task = None
+        self._wakeup = None
+
+    def __call__(self, message):
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            print(message)
+            return
+
+        self._messages.append(message)
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._task = loop.create_task(self._drain())
+        self._wakeup.set()
+
+    async def _drain(self):
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            while self._messages:
+                print(self._messages.popleft())
+            await asyncio.sleep(0)
+
+    def flush(self):
+        while self._messages:
+            print(self._messages.popleft())
@@ -0,0 +1,205 @@
+import asyncio
+import bisect
+import time
+
+
+class BookSide:
+    """
+    가격 오름차순 정렬 배열 기반 호가 한쪽 면
+    최우선 호가를 배열 끝에 두어 조회는 O(1), 가격별 수량/누적 수량은 이진 탐색으로 처리
+    """
+    __slots__ = ("keys", "sizes", "sign")
+
+    def __init__(self, descending):
+        # 매수 호가는 가격 그대로, 매도 호가는 부호를 바꿔 저장해 둘 다 끝이 최우선 호가
+        self.sign = -1.0 if descending else 1.0
+        self.keys = []
+        self.sizes = []
+
+    def clear(self):
+        self.keys.clear()
+        self.sizes.clear()
+
+    def load(self, levels):
+        """
+        전체 호가 적재
+        :param levels: [[가격, 수량], ...] (순서 무관)
+        """
+        pairs = sorted((self.sign * price, size) for price, size, *_ in levels if size)
+        self.keys = [key for key, _ in pairs]
+        self.sizes = [size for _, size in pairs]
+
+    def best(self):
+        if not self.keys:
+            return None
+        return self.sign * self.keys[-1], self.sizes[-1]
+
+    def size_at(self, price):
+        key = self.sign * price
+        i = bisect.bisect_left(self.keys, key)
+        if i < len(self.keys) and self.keys[i] == key:
+            return self.sizes[i]
+        return 0.0
+
+    def depth_to(self, price):
+        """
+        최우선 호가부터 지정 가격까지 누적 수량
+        :param price: 한계 가격 (매수면 이상, 매도면 이하)
+        """
+        i = bisect.bisect_left(self.keys, self.sign * price)
+        return sum(self.sizes[i:])
+
+    def levels(self, n=None):
+        count = len(self.keys) if n is None else min(n, len(self.keys))
+        return [[self.sign * self.keys[-1 - i], self.sizes[-1 - i]] for i in range(count)]
+
+    def __len__(self):
+        return len(self.keys)
+
+
+class L2Book:
+    def __init__(self, symbol):
+        """
+        심볼별 L2 호가창
+        :param symbol: 거래 심볼
+        """
+        self.symbol = symbol
+        self.bids = BookSide(descending=False)
+        self.asks = BookSide(descending=True)
+        self.nonce = None
+        self.timestamp = 0.0  # 마지막 갱신 시각 (monotonic)
+
+    def side(self, side):
+        return self.bids if side in ("buy", "bids", "bid") else self.asks
+
+    def load(self, bids, asks, nonce=None):
+        self.bids.load(bids)
+        self.asks.load(asks)
+        self.nonce = nonce
+        self.timestamp = time.monotonic()
+
+    @property
+    def best_bid(self):
+        best = self.bids.best()
+        return best[0] if best else None
+
+    @property
+    def best_ask(self):
+        best = self.asks.best()
+        return best[0] if best else None
+
+    @property
+    def mid(self):
+        if self.best_bid is None or self.best_ask is None:
+            return None
+        return (self.best_bid + self.best_ask) / 2
+
+    def size_at(self, side, price):
+        return self.side(side).size_at(price)
+
+    def depth_to(self, side, price):
+        return self.side(side).depth_to(price)
+
+    @property
+    def age(self):
+        return time.monotonic() - self.timestamp if self.timestamp else None
+
+    def is_stale(self, max_age):
+        """
+        호가창 신선도 확인
+        :param max_age: 허용 최대 경과 시간(초)
+        """
+        return not self.timestamp or self.age > max_age or not self.bids or not self.asks
+
+    def to_dict(self, depth=None):
+        # 기존 fetch_order_book 응답 형식
+        return {"symbol": self.symbol,
+                "bids": self.bids.levels(depth),
+                "asks": self.asks.levels(depth),
+                "nonce": self.nonce}
+
+
+class OrderBookCache:
+    def __init__(self, exchange, depth=50, retry_delay=1.0):
+        """
+        watch_order_book 기반 심볼별 L2 호가창 캐시
+        :param exchange: ccxt.pro 거래소 인스턴스
+        :param depth: 구독/유지할 호가 단계 수
+        :param retry_delay: 스트림 에러 발생 시 재구독 대기 시간(초)
+        """
+        self.exchange = exchange
+        self.depth = depth
+        self.retry_delay = retry_delay
+
+        self.books = {}  # 심볼 -> L2Book
+        self._ready = {}  # 심볼 -> asyncio.Event
+        self._tasks = {}
+
+    def book(self, symbol):
+        return self.books.get(symbol)
+
+    def _ready_event(self, symbol):
+        event = self._ready.get(symbol)
+        if event is None:
+            event = self._ready[symbol] = asyncio.Event()
+        return event
+
+    async def _watch(self, symbol):
+        book = self.books.setdefault(symbol, L2Book(symbol))
+        while True:
+            try:
+                snapshot = await self.exchange.watch_order_book(symbol, self.depth)
+                # ccxt.pro가 거래소 델타를 이미 반영한 호가창을 넘겨주므로 유지 단계만 적재
+                book.load(snapshot["bids"][:self.depth], snapshot["asks"][:self.depth],
+                          snapshot.get("nonce"))
+                self._ready_event(symbol).set()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"[호가창] {symbol} 구독 에러 발생: {e}")
+                await asyncio.sleep(self.retry_delay)
+
+    def subscribe(self, symbol):
+        """
+        심볼 호가창 구독 시작 (이미 구독 중이면 무시)
+        :param symbol: 거래 심볼
+        """
+        task = self._tasks.get(symbol)
+        if task is None or task.done():
+            self._tasks[symbol] = asyncio.get_running_loop().create_task(self._watch(symbol))
+
+    async def wait_ready(self, symbol, timeout=None):
+        """
+        첫 호가창 수신 대기
+        :param symbol: 거래 심볼
+        :param timeout: 최대 대기 시간(초)
+        :return: L2Book 객체 (시간 초과 시 None)
+        """
+        self.subscribe(symbol)
+        try:
+            await asyncio.wait_for(self._ready_event(symbol).wait(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        return self.books.get(symbol)
+
+    async def top(self, symbol, max_age=2.0, timeout=5.0):
+        """
+        최우선 호가 조회 (캐시가 오래되면 REST 스냅샷으로 보정)
+        :param symbol: 거래 심볼
+        :param max_age: 캐시 허용 최대 경과 시간(초)
+        :param timeout: 첫 수신 최대 대기 시간(초)
+        :return: (매수 1호가, 매도 1호가)
+        """
+        book = self.books.get(symbol)
+        if book is None:
+            book = await self.wait_ready(symbol, timeout)
+        if book is None or book.is_stale(max_age):
+            snapshot = await self.exchange.fetch_order_book(symbol, self.depth)
+            book = self.books.setdefault(symbol, L2Book(symbol))
+            book.load(snapshot["bids"], snapshot["asks"], snapshot.get("nonce"))
+        return book.best_bid, book.best_ask
+
+    def stop(self):
+        for task in self._tasks.values():
+            task.cancel()
+        self._tasks = {}
@@ -0,0 +1,265 @@
+import asyncio
+import time
+
+DONE_STATUSES = ("closed", "canceled", "cancelled", "rejected", "expired")
+
+
+class OrderState:
+    """
+    주문 ID별 상태 (체결 수량, 평균가, 상태)
+    """
+    __slots__ = ("id", "symbol", "side", "amount", "status", "order_filled", "average",
+                 "trade_filled", "trade_cost", "trade_ids", "updated_at")
+
+    def __init__(self, order_id, symbol=None, side=None, amount=None):
+        self.id = order_id
+        self.symbol = symbol
+        self.side = side
+        self.amount = amount
+        self.status = "open"
+        self.order_filled = 0.0
+        self.average = None
+        self.trade_filled = 0.0
+        self.trade_cost = 0.0
+        self.trade_ids = set()
+        self.updated_at = time.monotonic()
+
+    @property
+    def filled(self):
+        # 주문 이벤트와 체결 이벤트 중 먼저 도착한 쪽을 반영
+        return max(self.order_filled, self.trade_filled)
+
+    @property
+    def remaining(self):
+        if self.amount is None:
+            return None
+        return max(self.amount - self.filled, 0.0)
+
+    @property
+    def average_price(self):
+        if self.average is not None:
+            return self.average
+        if self.trade_filled > 0:
+            return self.trade_cost / self.trade_filled
+        return None
+
+    @property
+    def done(self):
+        return self.status in DONE_STATUSES
+
+    def __repr__(self):
+        return (f"OrderState(id={self.id}, {self.symbol} {self.side}, status={self.status}, "
+                f"filled={self.filled}/{self.amount}, avg={self.average_price})")
+
+
+class OrderTracker:
+    def __init__(self, exchange, name="", retry_delay=1.0, poll_interval=2.0, recorder=None):
+        """
+        웹소켓 주문/체결 이벤트 기반 주문 상태 추적기
+        :param exchange: ccxt.pro 거래소 인스턴스
+        :param name: 로그 표시용 이름
+        :param retry_delay: 스트림 끊김 시 재연결 대기 시간(초)
+        :param poll_interval: watch_orders 미지원 거래소의 REST 조회 주기(초)
+        :param recorder: 응답→체결 지연을 기록할 LatencyRecorder (선택사항)
+        """
+        self.exchange = exchange
+        self.recorder = recorder
+        self.name = name or getattr(exchange, "id", "")
+        self.retry_delay = retry_delay
+        self.poll_interval = poll_interval
+
+        self.orders = {}  # 주문 ID -> OrderState
+        self._changed = {}  # 주문 ID -> asyncio.Event
+        self._tasks = []
+        self.reconnects = 0
+
+    def _state(self, order_id, symbol=None, side=None, amount=None):
+        state = self.orders.get(order_id)
+        if state is None:
+            state = self.orders[order_id] = OrderState(order_id, symbol, side, amount)
+        else:
+            # 웹소켓 이벤트가 REST 응답보다 먼저 도착한 경우 누락된 정보 보완
+            state.symbol = state.symbol or symbol
+            state.side = state.side or side
+            state.amount = state.amount if state.amount is not None else amount
+        return state
+
+    def _check_fill(self, state):
+        if self.recorder is None:
+            return
+        if state.amount is not None and state.filled >= state.amount:
+            self.recorder.order_filled(state.id)
+        elif state.done:
+            self.recorder.forget(state.id)
+
+    def _notify(self, order_id):
+        event = self._changed.pop(order_id, None)
+        if event is not None:
+            event.set()
+
+    def track(self, order):
+        """
+        주문 생성 응답을 추적 대상으로 등록
+        :param order: 주문 객체 (ccxt 주문 딕셔너리)
+        :return: OrderState 객체
+        """
+        state = self._state(order["id"], order.get("symbol"), order.get("side"), order.get("amount"))
+        self._on_order(order)
+        return state
+
+    def _on_order(self, order):
+        order_id = order.get("id")
+        if order_id is None:
+            return
+        state = self._state(order_id, order.get("symbol"), order.get("side"), order.get("amount"))
+        if order.get("status"):
+            state.status = order["status"]
+        if order.get("filled") is not None:
+            state.order_filled = max(state.order_filled, float(order["filled"]))
+        if order.get("average") is not None:
+            state.average = order["average"]
+        state.updated_at = time.monotonic()
+        self._check_fill(state)
+        self._notify(order_id)
+
+    def _on_trade(self, trade):
+        order_id = trade.get("order")
+        trade_id = trade.get("id")
+        if order_id is None:
+            return
+        state = self._state(order_id, trade.get("symbol"), trade.get("side"))
+        if trade_id is not None:
+            if trade_id in state.trade_ids:
+                return
+            state.trade_ids.add(trade_id)
+
+        amount = float(trade.get("amount") or 0.0)
+        cost = trade.get("cost")
+        if cost is None and trade.get("price") is not None:
+            cost = amount * trade["price"]
+        state.trade_filled += amount
+        state.trade_cost += float(cost or 0.0)
+        state.updated_at = time.monotonic()
+        self._check_fill(state)
+        self._notify(order_id)
+
+    def get(self, order_id):
+        return self.orders.get(order_id)
+
+    def active(self, symbol=None):
+        """
+        미체결 주문 목록
+        :param symbol: 특정 심볼만 조회 (선택사항)
+        """
+        return [state for state in self.orders.values()
+                if not state.done and (symbol is None or state.symbol == symbol)]
+
+    def is_done(self, order_id):
+        state = self.orders.get(order_id)
+        return state is not None and state.done
+
+    async def wait_update(self, order_id, timeout=None):
+        """
+        주문 상태/체결 변경 이벤트 대기
+        :param order_id: 주문 ID
+        :param timeout: 최대 대기 시간(초)
+        :return: OrderState 객체
+        """
+        event = self._changed.get(order_id)
+        if event is None:
+            event = self._changed[order_id] = asyncio.Event()
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        return self.orders.get(order_id)
+
+    async def wait_filled(self, order_id, amount=None, timeout=None):
+        """
+        주문이 지정 수량만큼 체결되거나 종료될 때까지 대기
+        :param order_id: 주문 ID
+        :param amount: 목표 체결 수량 (None이면 주문 전체)
+        :param timeout: 최대 대기 시간(초)
+        :return: OrderState 객체
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            state = self.orders.get(order_id)
+            if state is not None:
+                target = amount if amount is not None else state.amount
+                if state.done or (target is not None and state.filled >= target):
+                    return state
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return state
+            await self.wait_update(order_id, remaining)
+
+    async def reconcile(self):
+        """
+        재연결 시 REST로 누락된 주문 상태 보정 (심볼별 1회 조회, ID 인덱스 매칭)
+        """
+        symbols = {state.symbol for state in self.active()}
+        for symbol in symbols:
+            try:
+                open_orders = {o["id"]: o for o in await self.exchange.fetch_open_orders(symbol)}
+                for order in open_orders.values():
+                    self._on_order(order)
+
+                missing = [state for state in self.active(symbol) if state.id not in open_orders]
+                if not missing:
+                    continue
+
+                has = getattr(self.exchange, "has", {}) or {}
+                if has.get("fetchOrder"):
+                    for state in missing:
+                        self._on_order(await self.exchange.fetch_order(state.id, symbol))
+                else:
+                    closed = {o["id"]: o for o in await self.exchange.fetch_closed_orders(symbol)}
+                    for state in missing:
+                        if state.id in closed:
+                            self._on_order(closed[state.id])
+            except Exception as e:
+                print(f"[주문 추적] {self.name} {symbol} 주문 보정 중 에러 발생: {e}")
+
+    async def _watch(self, method, handler):
+        failed = False
+        while True:
+            try:
+                if failed:
+                    await self.reconcile()
+                    failed = False
+                for item in await getattr(self.exchange, method)():
+                    handler(item)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"[주문 추적] {self.name} {method} 연결 끊김: {e}")
+                self.reconnects += 1
+                failed = True
+                await asyncio.sleep(self.retry_delay)
+
+    async def _poll(self):
+        while True:
+            await self.reconcile()
+            await asyncio.sleep(self.poll_interval)
+
+    def start(self):
+        """
+        주문/체결 스트림 시작 (이미 실행 중이면 무시)
+        """
+        if self._tasks and not all(task.done() for task in self._tasks):
+            return
+        loop = asyncio.get_running_loop()
+        has = getattr(self.exchange, "has", {}) or {}
+        if has.get("watchOrders"):
+            self._tasks = [loop.create_task(self._watch("watch_orders", self._on_order))]
+            if has.get("watchMyTrades"):
+                self._tasks.append(loop.create_task(self._watch("watch_my_trades", self._on_trade)))
+        else:
+            print(f"[주문 추적] {self.name} watch_orders 미지원, REST 조회로 대체")
+            self._tasks = [loop.create_task(self._poll())]
+
+    def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
@@ -0,0 +1,245 @@
+import asyncio
+import time
+
+HEDGE_TOLERANCE = 1e-9  # 헤지 수량 비교 시 부동소수 허용 오차 (체결량 대비)
+
+
+class Leg:
+    def __init__(self, exchange, symbol, side, amount, price=None, order_type="limit", market_type="spot", params=None):
+        """
+        페어 주문의 한쪽 다리
+        :param exchange: ccxt.pro 거래소 인스턴스
+        :param symbol: 거래 심볼
+        :param side: "buy" 또는 "sell"
+        :param amount: 거래 수량
+        :param price: 지정가 주문 가격 (시장가 주문에서는 무시됨)
+        :param order_type: "limit" 또는 "market"
+        :param market_type: "spot" 또는 "futures"
+        :param params: 거래소별 추가 파라미터 (선택사항)
+        """
+        self.exchange = exchange
+        self.symbol = symbol
+        self.side = side
+        self.amount = amount
+        self.price = price
+        self.order_type = order_type
+        self.market_type = market_type
+        self.params = params or {}
+
+        self.sent_ns = None
+        self.acked_ns = None
+        self.order = None
+        self.error = None
+
+    def prepare(self, amount=None):
+        """
+        전송 직전 작업이 없도록 주문 인자를 미리 검증/정규화
+        :param amount: 수량 재지정 (선택사항)
+        :return: create_order에 전달할 인자 튜플
+        """
+        if self.side not in ("buy", "sell"):
+            raise ValueError("side는 'buy' 또는 'sell'이어야 합니다.")
+        if self.order_type not in ("limit", "market"):
+            raise ValueError("order_type은 'limit' 또는 'market'이어야 합니다.")
+        if self.order_type == "limit" and self.price is None:
+            raise ValueError(f"{self.symbol} 지정가 주문에 가격이 없습니다.")
+
+        amount = self.amount if amount is None else amount
+        price = self.price if self.order_type == "limit" else None
+
+        markets = getattr(self.exchange, "markets", None) or {}
+        market = markets.get(self.symbol)
+        if market is not None:
+            amount = float(self.exchange.amount_to_precision(self.symbol, amount))
+            if price is not None:
+                price = float(self.exchange.price_to_precision(self.symbol, price))
+            min_amount = ((market.get("limits") or {}).get("amount") or {}).get("min")
+            if min_amount and amount < min_amount:
+                raise ValueError(f"{self.symbol} 주문 수량 {amount}이 최소 수량 {min_amount}보다 작습니다.")
+        if amount <= 0:
+            raise ValueError(f"{self.symbol} 주문 수량이 0 이하입니다.")
+
+        return self.symbol, self.order_type, self.side, amount, price, self.params
+
+    async def send(self, args, log=print):
+        """
+        준비된 인자로 주문 전송
+        :param args: prepare()가 반환한 create_order 인자 튜플
+        :param log: 실패 메시지 출력 함수 (기본값: print)
+        :return: 주문 객체 (실패 시 None)
+        """
+        self.sent_ns = time.perf_counter_ns()
+        try:
+            self.order = await self.exchange.create_order(*args)
+        except Exception as e:
+            self.error = e
+            log(f"[페어 주문] {self.symbol} {self.side.upper()} {self.order_type.upper()} 주문 실패: {e}")
+        finally:
+            self.acked_ns = time.perf_counter_ns()
+        return self.order
+
+
+class PairResult:
+    def __init__(self, primary, secondary):
+        self.primary = primary
+        self.secondary = secondary
+        self.hedges = []  # 체결 연동 헤지 주문 [(체결 감지 ns, 헤지 응답 ns, 주문)]
+        self.filled = None  # 체결 연동 헤지 시 주요 거래소 최종 체결 수량
+        self.hedged = 0.0  # 체결 연동 헤지 누적 수량
+
+    @property
+    def send_skew_ms(self):
+        if self.primary.sent_ns is None or self.secondary.sent_ns is None:
+            return None
+        return (self.secondary.sent_ns - self.primary.sent_ns) / 1e6
+
+    @property
+    def ack_skew_ms(self):
+        if self.primary.acked_ns is None or self.secondary.acked_ns is None:
+            return None
+        return (self.secondary.acked_ns - self.primary.acked_ns) / 1e6
+
+    @property
+    def unhedged(self):
+        if self.filled is None:
+            return None
+        return max(self.filled - self.hedged, 0.0)
+
+    @property
+    def ok(self):
+        if self.primary.order is None:
+            return False
+        if self.filled is not None:
+            # 체결 연동 헤지: 주요 거래소 체결량이 모두 헤지되어야 성공
+            return self.unhedged <= HEDGE_TOLERANCE * max(1.0, self.filled)
+        return self.secondary.order is not None
+
+    def __repr__(self):
+        return (f"PairResult(ok={self.ok}, send_skew_ms={self.send_skew_ms}, "
+                f"ack_skew_ms={self.ack_skew_ms}, hedges={len(self.hedges)}, unhedged={self.unhedged})")
+
+
+class PairedExecutor:
+    def __init__(self, trackers=None, recorder=None, log=print):
+        """
+        두 다리 주문 동시 실행기
+        :param trackers: 거래소 인스턴스 id -> OrderTracker (체결 연동 헤지에 필요)
+        :param recorder: 주문 지연 시간을 기록할 LatencyRecorder (선택사항)
+        :param log: 메시지 출력 함수, 주문 경로에서는 BackgroundPrinter 사용 (기본값: print)
+        """
+        self.trackers = trackers or {}
+        self.recorder = recorder
+        self.log = log
+        self.results = []
+
+    def _record(self, leg, decision_ns):
+        if self.recorder is None or leg.sent_ns is None:
+            return
+        self.recorder.order_sent(getattr(leg.exchange, "id", "unknown"), leg.order_type,
+                                 decision_ns, leg.sent_ns, leg.acked_ns, leg.order)
+
+    async def submit(self, primary, secondary):
+        """
+        두 다리 주문을 asyncio.gather로 동시에 전송
+        :param primary: 주요 거래소 Leg
+        :param secondary: 보조 거래소 Leg
+        :return: PairResult 객체
+        """
+        decision_ns = time.perf_counter_ns()
+        # 검증은 전송 전에 모두 끝내서 한쪽만 나가는 경우를 막음
+        primary_args = primary.prepare()
+        secondary_args = secondary.prepare()
+
+        await asyncio.gather(primary.send(primary_args, self.log),
+                             secondary.send(secondary_args, self.log))
+        self._record(primary, decision_ns)
+        self._record(secondary, decision_ns)
+        result = PairResult(primary, secondary)
+        self.results.append(result)
+        return result
+
+    async def hedge_on_fill(self, primary, secondary, timeout=None, min_hedge=0.0):
+        """
+        주요 거래소 지정가 주문의 체결 이벤트마다 보조 거래소 시장가로 즉시 헤지
+        :param primary: 주요 거래소 Leg (지정가)
+        :param secondary: 보조 거래소 Leg (시장가, 수량은 체결량으로 대체)
+        :param timeout: 최대 대기 시간(초), 초과 시 주요 거래소 주문을 취소하고 최종 체결량까지 헤지
+        :param min_hedge: 최소 헤지 수량 (이보다 작은 체결은 누적 후 헤지)
+        :return: PairResult 객체
+        """
+        tracker = self.trackers.get(id(primary.exchange))
+        if tracker is None:
+            raise ValueError("체결 연동 헤지에는 주요 거래소 OrderTracker가 필요합니다.")
+        tracker.start()
+
+        decision_ns = time.perf_counter_ns()
+        primary_args = primary.prepare()
+        result = PairResult(primary, secondary)
+        self.results.append(result)
+        order = await primary.send(primary_args, self.log)
+        self._record(primary, decision_ns)
+        if order is None:
+            return result
+        state = tracker.track(order)
+        result.filled = state.filled
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            # 대기 전/헤지 전송 중에 들어온 체결도 놓치지 않도록 매번 누적 체결량과 비교
+            await self._hedge_delta(result, state, time.perf_counter_ns(), min_hedge, state.done)
+            if state.done:
+                break
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                break
+            await tracker.wait_update(order['id'], remaining)
+
+        if not state.done:
+            # 시간 초과 시 미체결분 취소 후 최종 체결량 기준으로 헤지
+            try:
+                tracker.track(await primary.exchange.cancel_order(order['id'], primary.symbol))
+            except Exception as e:
+                self.log(f"[페어 주문] {primary.symbol} 주문 취소 실패: {e}")
+                try:
+                    tracker.track(await primary.exchange.fetch_order(order['id'], primary.symbol))
+                except Exception as e:
+                    self.log(f"[페어 주문] {primary.symbol} 주문 조회 실패: {e}")
+        await self._hedge_delta(result, state, time.perf_counter_ns(), min_hedge, True)
+        return result
+
+    async def _hedge_delta(self, result, state, detected_ns, min_hedge, final):
+        secondary = result.secondary
+        # 헤지 전송 중 추가된 체결분은 바로 이어서 헤지
+        while True:
+            result.filled = state.filled
+            delta = state.filled - result.hedged
+            if delta <= 0 or (delta < min_hedge and not final):
+                return
+            try:
+                args = secondary.prepare(amount=delta)
+            except ValueError as e:
+                # 최소 수량 미달분은 다음 체결과 합쳐서 헤지
+                if final:
+                    self.log(f"[페어 주문] 잔여 헤지 수량 {delta} 전송 불가: {e}")
+                return
+            hedge = await secondary.send(args, self.log)
+            self._record(secondary, detected_ns)
+            if hedge is None:
+                return
+            result.hedged += args[3]
+            result.hedges.append((detected_ns, secondary.acked_ns, hedge))
+            detected_ns = time.perf_counter_ns()
+
+    def skew_summary(self):
+        """
+        전송/응답 시차 요약 (ms)
+        """
+        skews = [abs(r.send_skew_ms) for r in self.results if r.send_skew_ms is not None]
+        acks = [abs(r.ack_skew_ms) for r in self.results if r.ack_skew_ms is not None]
+        if not skews:
+            return {}
+        return {"pairs": len(skews),
+                "send_skew_ms_avg": sum(skews) / len(skews),
+                "send_skew_ms_max": max(skews),
+                "ack_skew_ms_avg": sum(acks) / len(acks) if acks else None,
+                "ack_skew_ms_max": max(acks) if acks else None}
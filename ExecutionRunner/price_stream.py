@@ -0,0 +1,155 @@
+import asyncio
+import time
+
+
+class Quote:
+    """
+    심볼별 최우선 호가/체결가 상태 (메시지마다 생성하지 않고 제자리 갱신)
+    """
+    __slots__ = ("bid", "ask", "last", "timestamp", "version")
+
+    def __init__(self):
+        self.bid = None
+        self.ask = None
+        self.last = None
+        self.timestamp = 0.0
+        self.version = 0
+
+    @property
+    def mid(self):
+        if self.bid is None or self.ask is None:
+            return self.last
+        return (self.bid + self.ask) / 2
+
+    def __repr__(self):
+        return f"Quote(bid={self.bid}, ask={self.ask}, last={self.last}, v={self.version})"
+
+
+class PriceStream:
+    def __init__(self, exchanges, retry_delay=1.0):
+        """
+        여러 거래소/심볼의 가격을 동시에 스트리밍하는 가격 캐시
+        :param exchanges: 거래소 키별 ccxt.pro 인스턴스 {"primary": 인스턴스, "secondary": 인스턴스}
+        :param retry_delay: 스트림 에러 발생 시 재구독 대기 시간(초)
+        """
+        self.exchanges = {key: exchange for key, exchange in exchanges.items() if exchange is not None}
+        self.retry_delay = retry_delay
+
+        # 연결되지 않은 거래소 키도 빈 캐시로 유지 (기존 self.prices["secondary"] 접근 호환)
+        self.quotes = {key: {} for key in exchanges}  # 거래소 키 -> 심볼 -> Quote
+        self.prices = {key: {} for key in exchanges}  # 기존 self.prices 형식 호환 (마지막 체결가)
+        self._changed = {}  # (거래소 키, 심볼) -> asyncio.Event
+        self._tasks = []
+
+    def quote(self, key, symbol):
+        """
+        현재 호가 상태 조회
+        :param key: 거래소 키 ("primary" 또는 "secondary")
+        :param symbol: 거래 심볼
+        :return: Quote 객체 (아직 수신 전이면 None)
+        """
+        return self.quotes.get(key, {}).get(symbol)
+
+    def _event(self, key, symbol):
+        event = self._changed.get((key, symbol))
+        if event is None:
+            event = self._changed[(key, symbol)] = asyncio.Event()
+        return event
+
+    def _apply(self, key, symbol, ticker):
+        quotes = self.quotes[key]
+        quote = quotes.get(symbol)
+        if quote is None:
+            quote = quotes[symbol] = Quote()
+
+        bid = ticker.get("bid")
+        ask = ticker.get("ask")
+        last = ticker.get("last")
+        if bid == quote.bid and ask == quote.ask and (last is None or last == quote.last):
+            return
+
+        if bid is not None:
+            quote.bid = bid
+        if ask is not None:
+            quote.ask = ask
+        if last is not None:
+            quote.last = last
+            self.prices[key][symbol] = last
+        quote.timestamp = time.monotonic()
+        quote.version += 1
+
+        # 대기 중인 코루틴을 깨우고 다음 변경을 위한 새 이벤트로 교체
+        event = self._changed.pop((key, symbol), None)
+        if event is not None:
+            event.set()
+
+    async def wait_changed(self, key, symbol, timeout=None):
+        """
+        가격 변경 알림 대기 (폴링 대신 사용)
+        :param key: 거래소 키
+        :param symbol: 거래 심볼
+        :param timeout: 최대 대기 시간(초), None이면 무기한
+        :return: 변경된 Quote 객체 (시간 초과 시 현재 Quote)
+        """
+        event = self._event(key, symbol)
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        return self.quote(key, symbol)
+
+    async def _watch_many(self, key, exchange, symbols, method):
+        while True:
+            try:
+                tickers = await getattr(exchange, method)(symbols)
+                for symbol, ticker in tickers.items():
+                    self._apply(key, symbol, ticker)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"[가격 스트림] {key} {method} 에러 발생: {e}")
+                await asyncio.sleep(self.retry_delay)
+
+    async def _watch_one(self, key, exchange, symbol):
+        while True:
+            try:
+                ticker = await exchange.watch_ticker(symbol)
+                self._apply(key, symbol, ticker)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"[가격 스트림] {key} {symbol} 에러 발생: {e}")
+                await asyncio.sleep(self.retry_delay)
+
+    def _subscriptions(self, key, exchange, symbols):
+        has = getattr(exchange, "has", {}) or {}
+        if len(symbols) > 1 and has.get("watchTickers"):
+            return [self._watch_many(key, exchange, symbols, "watch_tickers")]
+        if len(symbols) > 1 and has.get("watchBidsAsks"):
+            return [self._watch_many(key, exchange, symbols, "watch_bids_asks")]
+        # 다중 구독을 지원하지 않으면 심볼별 태스크로 동시 구독
+        return [self._watch_one(key, exchange, symbol) for symbol in symbols]
+
+    async def run(self, symbols):
+        """
+        모든 거래소/심볼 구독을 동시에 실행
+        :param symbols: 거래소 키별 심볼 목록 {"primary": [심볼1, 심볼2], "secondary": [심볼1, 심볼2]}
+        """
+        loop = asyncio.get_running_loop()
+        self._tasks = [
+            loop.create_task(coro)
+            for key, exchange in self.exchanges.items()
+            for coro in self._subscriptions(key, exchange, list(symbols.get(key, [])))
+        ]
+        try:
+            await asyncio.gather(*self._tasks)
+        finally:
+            self.stop()
+
+    def stop(self):
+        """
+        모든 구독 태스크 취소
+        """
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
@@ -0,0 +1,308 @@
+import asyncio
+import time
+from collections import OrderedDict, deque
+
+from order_tracker import OrderTracker
+from order_book import OrderBookCache
+from latency import LatencyRecorder
+
+# REST 호출만 예산을 소모 (웹소켓 구독은 제외)
+BUDGETED_PREFIXES = ("create_", "cancel_", "edit_", "fetch_")
+POOL_JOB_ID = "_pool"  # 공유 추적기/호가창 캐시의 예산 대기열
+
+
+class FairBudget:
+    def __init__(self, rate=10.0, burst=20):
+        """
+        거래소별 요청 예산 (토큰 버킷) + 작업 간 라운드로빈 배분
+        :param rate: 초당 허용 요청 수
+        :param burst: 최대 순간 요청 수
+        """
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+
+        self._queues = OrderedDict()  # 작업 ID -> 대기 중인 Future 큐
+        self._dispatcher = None
+        self.granted = {}  # 작업 ID -> 허용된 요청 수
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, job_id):
+        """
+        요청 1건 전송 권한 대기
+        :param job_id: 요청을 보내는 작업 ID
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._queues.setdefault(job_id, deque()).append(future)
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.get_running_loop().create_task(self._dispatch())
+        await future
+
+    async def _dispatch(self):
+        while self._queues:
+            self._refill()
+            if self.tokens < 1:
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+                continue
+
+            # 한 작업이 예산을 독점하지 않도록 1건 처리 후 맨 뒤로 보냄
+            job_id, queue = next(iter(self._queues.items()))
+            future = queue.popleft()
+            if queue:
+                self._queues.move_to_end(job_id)
+            else:
+                del self._queues[job_id]
+            if future.cancelled():
+                continue
+
+            self.tokens -= 1
+            self.granted[job_id] = self.granted.get(job_id, 0) + 1
+            future.set_result(None)
+
+    @property
+    def pending(self):
+        return sum(len(queue) for queue in self._queues.values())
+
+
+class BudgetedExchange:
+    def __init__(self, exchange, budget, job_id):
+        """
+        공유 거래소 클라이언트를 작업별 예산 안에서 사용하는 프록시
+        :param exchange: 공유 ccxt.pro 거래소 인스턴스
+        :param budget: 거래소의 FairBudget
+        :param job_id: 작업 ID
+        """
+        self._exchange = exchange
+        self._budget = budget
+        self._job_id = job_id
+        self._wrapped = {}  # 메서드 이름 -> 예산 적용 래퍼 (접근마다 새로 만들지 않음)
+
+    def __getattr__(self, name):
+        wrapped = self._wrapped.get(name)
+        if wrapped is not None:
+            return wrapped
+        attr = getattr(self._exchange, name)
+        if not callable(attr) or not name.startswith(BUDGETED_PREFIXES):
+            return attr
+
+        async def budgeted(*args, **kwargs):
+            await self._budget.acquire(self._job_id)
+            return await attr(*args, **kwargs)
+        self._wrapped[name] = budgeted
+        return budgeted
+
+
+class ClientPool:
+    def __init__(self, factory=None, budget=None):
+        """
+        거래소/계정별 인증 클라이언트 1개를 모든 작업이 공유
+        :param factory: 거래소 이름 -> 거래소 클래스 (기본값 ccxt.pro)
+        :param budget: 거래소 이름 -> FairBudget (지정 시 공유 추적기/호가창의 REST 호출도 예산 적용)
+        """
+        self.factory = factory
+        self.budget = budget
+        self.clients = {}  # (거래소 이름, API 키) -> 인스턴스
+        self.trackers = {}  # id(인스턴스) -> OrderTracker
+        self.order_books = {}  # id(인스턴스) -> OrderBookCache
+
+    def _exchange_class(self, name):
+        if self.factory is not None:
+            return self.factory(name)
+        import ccxt.pro
+        return getattr(ccxt.pro, name)
+
+    def get(self, name, api_key=None, api_secret=None, password=None):
+        """
+        공유 클라이언트 조회 (없으면 생성)
+        :param name: 거래소 이름
+        :param api_key: API 키
+        :param api_secret: API 시크릿
+        :param password: API 비밀번호 (선택사항)
+        :return: ccxt.pro 거래소 인스턴스
+        """
+        key = (name, api_key)
+        client = self.clients.get(key)
+        if client is None:
+            client = self.clients[key] = self._exchange_class(name)({
+                "apiKey": api_key,
+                "secret": api_secret,
+                "password": password,
+                "enableRateLimit": True,
+            })
+            # 주문 보정/폴링, 호가 REST 대체 조회도 거래소 요청 한도 안에서 실행
+            shared = client if self.budget is None else BudgetedExchange(client, self.budget(name), POOL_JOB_ID)
+            self.trackers[id(client)] = OrderTracker(shared, name=name)
+            self.order_books[id(client)] = OrderBookCache(shared)
+        return client
+
+    async def close(self):
+        for tracker in self.trackers.values():
+            tracker.stop()
+        for cache in self.order_books.values():
+            cache.stop()
+        for client in self.clients.values():
+            try:
+                await client.close()
+            except Exception as e:
+                print(f"[스케줄러] 클라이언트 종료 중 에러 발생: {e}")
+
+
+class ExecutionScheduler:
+    def __init__(self, pool=None, budgets=None, default_budget=(10.0, 20)):
+        """
+        하나의 이벤트 루프에서 여러 TWAP/헤지 작업을 동시에 실행
+        :param pool: ClientPool (기본값 새 풀)
+        :param budgets: 거래소 이름 -> (초당 요청 수, 최대 순간 요청 수)
+        :param default_budget: budgets에 없는 거래소의 기본 예산
+        """
+        self.budget_config = budgets or {}
+        self.default_budget = default_budget
+        self.pool = pool or ClientPool()
+        if self.pool.budget is None:
+            self.pool.budget = self.budget
+
+        # 공유 추적기가 모든 작업의 체결을 같은 기록기로 집계하도록 작업 간 공유
+        self.latency = LatencyRecorder()
+        self.budgets = {}  # 거래소 이름 -> FairBudget
+        self.jobs = {}  # 작업 ID -> asyncio.Task
+        self.results = {}  # 작업 ID -> 결과 또는 예외
+
+    def budget(self, name):
+        budget = self.budgets.get(name)
+        if budget is None:
+            rate, burst = self.budget_config.get(name, self.default_budget)
+            budget = self.budgets[name] = FairBudget(rate, burst)
+        return budget
+
+    def _proxy(self, job_id, venue):
+        if not venue:
+            return None, {}, {}
+        client = self.pool.get(venue['exchange'], venue.get('api_key'), venue.get('api_secret'),
+                               venue.get('password'))
+        proxy = BudgetedExchange(client, self.budget(venue['exchange']), job_id)
+        return proxy, self.pool.trackers[id(client)], self.pool.order_books[id(client)]
+
+    def manager(self, job_id, primary, secondary=None):
+        """
+        공유 클라이언트를 사용하는 작업 전용 UniversalOrderManager 생성
+        :param job_id: 작업 ID
+        :param primary: 주요 거래소 {"exchange", "api_key", "api_secret", "password"}
+        :param secondary: 보조 거래소 (선택사항)
+        """
+        from execution import UniversalOrderManager
+
+        primary_exchange, primary_tracker, primary_books = self._proxy(job_id, primary)
+        secondary_exchange, secondary_tracker, secondary_books = self._proxy(job_id, secondary)
+
+        trackers = {id(primary_exchange): primary_tracker}
+        order_books = {id(primary_exchange): primary_books}
+        if secondary_exchange is not None:
+            trackers[id(secondary_exchange)] = secondary_tracker
+            order_books[id(secondary_exchange)] = secondary_books
+        return UniversalOrderManager.from_exchanges(primary_exchange, secondary_exchange,
+                                                    trackers=trackers, order_books=order_books,
+                                                    latency=self.latency)
+
+    def submit(self, job_id, primary, secondary, run):
+        """
+        작업 등록
+        :param job_id: 작업 ID
+        :param primary: 주요 거래소 설정
+        :param secondary: 보조 거래소 설정 (선택사항)
+        :param run: manager를 받아 실행할 코루틴 함수
+        :return: asyncio.Task
+        """
+        if job_id in self.jobs and not self.jobs[job_id].done():
+            raise ValueError(f"이미 실행 중인 작업입니다: {job_id}")
+
+        manager = self.manager(job_id, primary, secondary)
+
+        async def _run():
+            try:
+                self.results[job_id] = await run(manager)
+            except asyncio.CancelledError:
+                self.results[job_id] = "cancelled"
+                raise
+            except Exception as e:
+                print(f"[스케줄러] 작업 {job_id} 에러 발생: {e}")
+                self.results[job_id] = e
+
+        task = self.jobs[job_id] = asyncio.get_running_loop().create_task(_run())
+        return task
+
+    def submit_twap(self, job_id, primary, secondary, primary_config, secondary_config, total_amount,
+                    duration_minutes, interval_seconds, hedge_mode="concurrent"):
+        """
+        TWAP 작업 등록 (인자는 UniversalOrderManager.execute_twap과 동일)
+        """
+        return self.submit(job_id, primary, secondary,
+                           lambda manager: manager.execute_twap(primary_config, secondary_config, total_amount,
+                                                                duration_minutes, interval_seconds,
+                                                                hedge_mode=hedge_mode))
+
+    def submit_on_signal(self, job_id, primary, secondary, bus, react, filters=None):
+        """
+        펀딩비 기회 신호 구독 작업 등록 (리프레시 완료 즉시 react 호출)
+        :param job_id: 작업 ID
+        :param primary: 주요 거래소 설정
+        :param secondary: 보조 거래소 설정 (선택사항)
+        :param bus: 펀딩비 수집기와 같은 프로세스의 SignalBus (RefreshCoordinator에 전달한 인스턴스)
+        :param react: (manager, OpportunitySet)을 받아 실행할 코루틴 함수 (필터에 맞는 기회가 있을 때만 호출)
+        :param filters: SignalFilter (티커/거래소/최소 ER/상위 k개, 선택사항)
+        :return: asyncio.Task
+        """
+        async def follow(manager):
+            # 구독 이전에 발행된 (오래된) 스냅샷에는 반응하지 않음
+            subscription = bus.subscribe(filters, replay=False)
+            try:
+                async for signal in subscription:
+                    # 발행 -> 작업 반응까지 지연 기록
+                    manager.latency.record("signal", "bus", "publish_to_react",
+                                           time.perf_counter_ns() - signal.published_ns)
+                    try:
+                        await react(manager, signal)
+                    except Exception as e:
+                        print(f"[스케줄러] 작업 {job_id} 신호 처리 중 에러 발생 "
+                              f"(snapshot={signal.snapshot_id}): {e}")
+            finally:
+                subscription.close()
+            return {"received": subscription.received, "dropped": subscription.dropped,
+                    "skipped": subscription.skipped}
+
+        return self.submit(job_id, primary, secondary, follow)
+
+    def cancel(self, job_id):
+        task = self.jobs.get(job_id)
+        if task is not None and not task.done():
+            task.cancel()
+            return True
+        return False
+
+    def status(self):
+        """
+        작업별 상태와 거래소별 예산 사용량
+        """
+        return {
+            "jobs": {job_id: ("done" if task.done() else "running") for job_id, task in self.jobs.items()},
+            "budgets": {name: {"tokens": round(budget.tokens, 2), "pending": budget.pending,
+                               "granted": dict(budget.granted)}
+                        for name, budget in self.budgets.items()},
+        }
+
+    async def run(self):
+        """
+        등록된 모든 작업 완료 대기
+        """
+        await asyncio.gather(*self.jobs.values(), return_exceptions=True)
+        return self.results
+
+    async def close(self):
+        for job_id in list(self.jobs):
+            self.cancel(job_id)
+        await asyncio.gather(*self.jobs.values(), return_exceptions=True)
+        await self.pool.close()
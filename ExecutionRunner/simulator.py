@@ -0,0 +1,406 @@
+import asyncio
+import itertools
+import math
+import random
+import time
+
+
+class SimulatedReject(Exception):
+    """
+    시뮬레이터 주문 거절
+    """
+
+
+class _Stream:
+    def __init__(self):
+        self.items = []
+        self.event = asyncio.Event()
+
+    def push(self, item):
+        self.items.append(item)
+        self.event.set()
+
+    async def next(self):
+        while not self.items:
+            self.event.clear()
+            await self.event.wait()
+        items, self.items = self.items, []
+        return items
+
+
+class SimulatedExchange:
+    def __init__(self, config=None, name="sim", prices=None, latency=0.02, latency_jitter=0.01,
+                 feed_interval=0.1, volatility=0.0005, depth=20, level_size=100.0,
+                 partial_fill=0.5, reject_rate=0.0, tick=None, amount_step=0.001, seed=None,
+                 batch=True):
+        """
+        ccxt.pro 호환 인메모리 시뮬레이션 거래소 (매칭 엔진 + 합성 호가 피드)
+        :param config: ccxt 생성자 설정 (apiKey 등, 무시됨)
+        :param name: 거래소 ID
+        :param prices: 심볼별 초기 가격 {"DOGE/USDT": 0.1}
+        :param latency: REST 호출 평균 지연(초)
+        :param latency_jitter: REST 지연 표준편차(초)
+        :param feed_interval: 호가 피드 갱신 주기(초)
+        :param volatility: 피드 주기당 가격 변동성 (로그 수익률 표준편차)
+        :param depth: 호가 단계 수
+        :param level_size: 호가 단계별 평균 수량
+        :param partial_fill: 대기 주문이 피드 1회에 체결될 수 있는 최대 비율 (1이면 전량)
+        :param reject_rate: 주문 거절 확률
+        :param tick: 호가 단위 (None이면 가격의 1bp)
+        :param amount_step: 수량 단위
+        :param seed: 난수 시드
+        :param batch: create_orders/cancel_orders 지원 여부
+        """
+        self.id = name
+        self.config = config or {}
+        self.options = {}
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.feed_interval = feed_interval
+        self.volatility = volatility
+        self.depth = depth
+        self.level_size = level_size
+        self.partial_fill = partial_fill
+        self.reject_rate = reject_rate
+        self.amount_step = amount_step
+        self.random = random.Random(seed)
+
+        prices = prices or {"BTC/USDT": 60000.0, "DOGE/USDT": 0.1}
+        self.mids = dict(prices)
+        self.ticks = {symbol: tick or self._default_tick(price) for symbol, price in prices.items()}
+        self.markets = {symbol: self._market(symbol) for symbol in prices}
+        self.has = {
+            "createOrders": batch, "cancelOrders": batch, "fetchOrder": True,
+            "fetchOpenOrders": True, "fetchClosedOrders": True, "fetchOrderBook": True,
+            "watchTicker": True, "watchTickers": True, "watchOrderBook": True,
+            "watchOrders": True, "watchMyTrades": True,
+        }
+
+        self.books = {}  # 심볼 -> {"bids": [[가격, 수량]], "asks": [[가격, 수량]]}
+        self.orders = {}  # 주문 ID -> 주문 객체
+        self._resting = {}  # 주문 ID -> 주문 객체 (미체결 지정가)
+        self._ids = itertools.count(1)
+        self._trade_ids = itertools.count(1)
+        self._order_stream = _Stream()
+        self._trade_stream = _Stream()
+        self._tick_event = None
+        self._feed = None
+        self.stats = {"requests": 0, "orders": 0, "rejects": 0, "trades": 0}
+        for symbol in prices:
+            self._rebuild(symbol)
+
+    @staticmethod
+    def _default_tick(price):
+        return 10 ** math.floor(math.log10(price * 1e-4))
+
+    def _market(self, symbol):
+        base, quote = symbol.split("/")
+        return {"id": symbol.replace("/", ""), "symbol": symbol, "base": base, "quote": quote.split(":")[0],
+                "spot": ":" not in symbol, "swap": ":" in symbol, "active": True,
+                "precision": {"amount": self.amount_step, "price": self.ticks[symbol]},
+                "limits": {"amount": {"min": self.amount_step}}}
+
+    # ---- 합성 호가 피드 ----
+
+    def _rebuild(self, symbol):
+        mid = self.mids[symbol]
+        tick = self.ticks[symbol]
+        best_bid = math.floor(mid / tick) * tick
+        best_ask = best_bid + tick
+        size = lambda: self._lots(self.level_size * self.random.uniform(0.5, 1.5))
+        self.books[symbol] = {
+            "bids": [[round(best_bid - i * tick, 10), size()] for i in range(self.depth)],
+            "asks": [[round(best_ask + i * tick, 10), size()] for i in range(self.depth)],
+        }
+
+    def _lots(self, amount):
+        # 체결/호가 수량은 항상 수량 단위의 배수
+        return round(math.floor(amount / self.amount_step + 1e-9) * self.amount_step, 10)
+
+    def _ensure_feed(self):
+        if self._feed is None or self._feed.done():
+            self._tick_event = asyncio.Event()
+            self._feed = asyncio.get_running_loop().create_task(self._run_feed())
+
+    async def _run_feed(self):
+        while True:
+            await asyncio.sleep(self.feed_interval)
+            for symbol in self.mids:
+                self.mids[symbol] *= math.exp(self.random.gauss(0.0, self.volatility))
+                self._rebuild(symbol)
+            self._match_resting()
+            event, self._tick_event = self._tick_event, asyncio.Event()
+            event.set()
+
+    async def _wait_tick(self):
+        self._ensure_feed()
+        await self._tick_event.wait()
+
+    async def _delay(self):
+        self.stats["requests"] += 1
+        delay = max(0.0, self.random.gauss(self.latency, self.latency_jitter))
+        await asyncio.sleep(delay)
+
+    # ---- 매칭 엔진 ----
+
+    def _fill(self, order, price, amount):
+        order["filled"] = round(order["filled"] + amount, 10)
+        order["remaining"] = round(order["amount"] - order["filled"], 10)
+        order["cost"] += price * amount
+        order["average"] = order["cost"] / order["filled"]
+        order["lastTradeTimestamp"] = int(time.time() * 1000)
+        trade = {"id": str(next(self._trade_ids)), "order": order["id"], "symbol": order["symbol"],
+                 "side": order["side"], "type": order["type"], "price": price, "amount": amount,
+                 "cost": price * amount, "timestamp": order["lastTradeTimestamp"]}
+        order["trades"].append(trade)
+        self.stats["trades"] += 1
+        self._trade_stream.push(trade)
+
+    def _sweep(self, order, limit_price=None, max_ratio=1.0):
+        levels = self.books[order["symbol"]]["asks" if order["side"] == "buy" else "bids"]
+        budget = self._lots(order["remaining"] * max_ratio)
+        for level in levels:
+            if budget <= 1e-12:
+                break
+            price, size = level
+            if limit_price is not None and \
+                    (price > limit_price if order["side"] == "buy" else price < limit_price):
+                break
+            amount = min(size, budget)
+            if amount <= 0:
+                continue
+            level[1] = round(size - amount, 10)
+            budget = round(budget - amount, 10)
+            self._fill(order, price, amount)
+
+    def _match_resting(self):
+        for order_id, order in list(self._resting.items()):
+            ratio = 1.0 if self.partial_fill >= 1 else self.random.uniform(0.0, self.partial_fill)
+            before = order["filled"]
+            self._sweep(order, order["price"], ratio)
+            if order["remaining"] <= 1e-12:
+                order["status"] = "closed"
+                del self._resting[order_id]
+            if order["filled"] != before:
+                self._order_stream.push(dict(order))
+
+    def _new_order(self, symbol, type, side, amount, price=None, params=None):
+        if symbol not in self.markets:
+            raise SimulatedReject(f"{self.id} 미지원 심볼: {symbol}")
+        if side not in ("buy", "sell") or type not in ("limit", "market"):
+            raise SimulatedReject(f"{self.id} 잘못된 주문: {type} {side}")
+        if type == "limit" and price is None:
+            raise SimulatedReject(f"{self.id} 지정가 주문에 가격이 없습니다.")
+        if amount is None or amount <= 0:
+            raise SimulatedReject(f"{self.id} 주문 수량이 0 이하입니다.")
+        if self.random.random() < self.reject_rate:
+            self.stats["rejects"] += 1
+            raise SimulatedReject(f"{self.id} 주문 거절 (시뮬레이션)")
+
+        self.stats["orders"] += 1
+        now = int(time.time() * 1000)
+        order = {"id": str(next(self._ids)), "clientOrderId": (params or {}).get("clientOrderId"),
+                 "timestamp": now, "datetime": None, "lastTradeTimestamp": None,
+                 "symbol": symbol, "type": type, "side": side, "price": price, "amount": amount,
+                 "filled": 0.0, "remaining": amount, "cost": 0.0, "average": None,
+                 "status": "open", "trades": [], "fee": None, "info": {}}
+        self.orders[order["id"]] = order
+
+        self._sweep(order, price if type == "limit" else None)
+        if order["remaining"] <= 1e-12:
+            order["status"] = "closed"
+        elif type == "market":
+            # 호가 잔량 부족 시 시장가 잔여분은 취소
+            order["status"] = "canceled"
+        else:
+            self._resting[order["id"]] = order
+        self._order_stream.push(dict(order))
+        return dict(order)
+
+    # ---- ccxt 호환 REST ----
+
+    async def load_markets(self, reload=False, params=None):
+        return self.markets
+
+    def amount_to_precision(self, symbol, amount):
+        step = self.amount_step
+        return str(round(math.floor(amount / step + 1e-9) * step, 10))
+
+    def price_to_precision(self, symbol, price):
+        tick = self.ticks[symbol]
+        return str(round(round(price / tick) * tick, 10))
+
+    async def create_order(self, symbol, type, side, amount, price=None, params=None):
+        await self._delay()
+        self._ensure_feed()
+        return self._new_order(symbol, type, side, amount, price, params)
+
+    async def create_limit_buy_order(self, symbol, amount, price, params=None):
+        return await self.create_order(symbol, "limit", "buy", amount, price, params)
+
+    async def create_limit_sell_order(self, symbol, amount, price, params=None):
+        return await self.create_order(symbol, "limit", "sell", amount, price, params)
+
+    async def create_market_buy_order(self, symbol, amount, params=None):
+        return await self.create_order(symbol, "market", "buy", amount, None, params)
+
+    async def create_market_sell_order(self, symbol, amount, params=None):
+        return await self.create_order(symbol, "market", "sell", amount, None, params)
+
+    async def create_orders(self, orders, params=None):
+        if not self.has["createOrders"]:
+            raise SimulatedReject(f"{self.id} create_orders 미지원")
+        await self._delay()
+        self._ensure_feed()
+        results = []
+        for o in orders:
+            try:
+                results.append(self._new_order(o["symbol"], o["type"], o["side"], o["amount"],
+                                               o.get("price"), o.get("params")))
+            except SimulatedReject as e:
+                results.append({"id": None, "status": "rejected", "info": {"error": str(e)}})
+        return results
+
+    def _cancel(self, order_id):
+        order = self.orders.get(order_id)
+        if order is None:
+            raise SimulatedReject(f"{self.id} 주문 없음: {order_id}")
+        if order_id in self._resting:
+            del self._resting[order_id]
+            order["status"] = "canceled"
+            self._order_stream.push(dict(order))
+        return dict(order)
+
+    async def cancel_order(self, id, symbol=None, params=None):
+        await self._delay()
+        return self._cancel(id)
+
+    async def cancel_orders(self, ids, symbol=None, params=None):
+        if not self.has["cancelOrders"]:
+            raise SimulatedReject(f"{self.id} cancel_orders 미지원")
+        await self._delay()
+        results = []
+        for order_id in ids:
+            try:
+                results.append(self._cancel(order_id))
+            except SimulatedReject as e:
+                results.append({"id": order_id, "status": "rejected", "info": {"error": str(e)}})
+        return results
+
+    async def fetch_order(self, id, symbol=None, params=None):
+        await self._delay()
+        if id not in self.orders:
+            raise SimulatedReject(f"{self.id} 주문 없음: {id}")
+        return dict(self.orders[id])
+
+    async def fetch_open_orders(self, symbol=None, since=None, limit=None, params=None):
+        await self._delay()
+        return [dict(o) for o in self._resting.values() if symbol is None or o["symbol"] == symbol]
+
+    async def fetch_closed_orders(self, symbol=None, since=None, limit=None, params=None):
+        await self._delay()
+        return [dict(o) for o in self.orders.values()
+                if o["status"] != "open" and (symbol is None or o["symbol"] == symbol)]
+
+    def _ticker(self, symbol):
+        book = self.books[symbol]
+        return {"symbol": symbol, "bid": book["bids"][0][0], "ask": book["asks"][0][0],
+                "bidVolume": book["bids"][0][1], "askVolume": book["asks"][0][1],
+                "last": self.mids[symbol], "timestamp": int(time.time() * 1000)}
+
+    def _order_book(self, symbol, limit=None):
+        book = self.books[symbol]
+        return {"symbol": symbol, "bids": [list(l) for l in book["bids"][:limit]],
+                "asks": [list(l) for l in book["asks"][:limit]],
+                "nonce": None, "timestamp": int(time.time() * 1000)}
+
+    async def fetch_ticker(self, symbol, params=None):
+        await self._delay()
+        return self._ticker(symbol)
+
+    async def fetch_order_book(self, symbol, limit=None, params=None):
+        await self._delay()
+        return self._order_book(symbol, limit)
+
+    # ---- ccxt.pro 호환 웹소켓 ----
+
+    async def watch_ticker(self, symbol, params=None):
+        await self._wait_tick()
+        return self._ticker(symbol)
+
+    async def watch_tickers(self, symbols=None, params=None):
+        await self._wait_tick()
+        return {symbol: self._ticker(symbol) for symbol in (symbols or self.mids)}
+
+    async def watch_order_book(self, symbol, limit=None, params=None):
+        await self._wait_tick()
+        return self._order_book(symbol, limit)
+
+    async def watch_orders(self, symbol=None, since=None, limit=None, params=None):
+        self._ensure_feed()
+        return [o for o in await self._order_stream.next() if symbol is None or o["symbol"] == symbol]
+
+    async def watch_my_trades(self, symbol=None, since=None, limit=None, params=None):
+        self._ensure_feed()
+        return [t for t in await self._trade_stream.next() if symbol is None or t["symbol"] == symbol]
+
+    async def close(self):
+        if self._feed is not None:
+            self._feed.cancel()
+            self._feed = None
+
+
+def simulated_factory(**options):
+    """
+    UniversalOrderManager/ClientPool의 exchange_factory로 쓰는 시뮬레이터 팩토리
+    :param options: 거래소 이름별 옵션 {"bybit": {...}} 또는 공통 옵션
+    :return: 거래소 이름 -> 거래소 클래스 함수
+    """
+    def factory(name):
+        kwargs = dict(options.get(name, {})) if name in options else dict(options)
+        return lambda config=None: SimulatedExchange(config, name=name, **kwargs)
+    return factory
+
+
+if __name__ == "__main__":
+    import argparse
+    from execution import UniversalOrderManager
+
+    parser = argparse.ArgumentParser(description="TWAP 오프라인 벤치마크 (시뮬레이션 거래소)")
+    parser.add_argument("--symbol", type=str, default="DOGE/USDT")
+    parser.add_argument("--amount", type=float, default=500)
+    parser.add_argument("--duration", type=float, default=0.5, help="실행 시간(분)")
+    parser.add_argument("--interval", type=float, default=1.0, help="슬라이스 간격(초)")
+    parser.add_argument("--latency", type=float, default=0.02, help="REST 평균 지연(초)")
+    parser.add_argument("--reject-rate", type=float, default=0.0)
+    parser.add_argument("--hedge-mode", type=str, default="concurrent")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    factory = simulated_factory(prices={args.symbol: 0.1}, latency=args.latency,
+                                reject_rate=args.reject_rate, seed=args.seed)
+    manager = UniversalOrderManager("sim_primary", "key", "secret",
+                                    secondary_exchange_name="sim_secondary",
+                                    secondary_api_key="key", secondary_api_secret="secret",
+                                    exchange_factory=factory)
+    primary_config = {"symbol": args.symbol, "market_type": "spot", "side": "buy"}
+    secondary_config = {"symbol": args.symbol, "market_type": "futures", "side": "sell"}
+
+    async def main():
+        started = time.perf_counter()
+        schedule = await manager.execute_twap(primary_config, secondary_config, args.amount,
+                                              args.duration, args.interval, hedge_mode=args.hedge_mode)
+        elapsed = time.perf_counter() - started
+        for exchange in (manager.primary_exchange, manager.secondary_exchange):
+            print(f"[벤치마크] {exchange.id}: {exchange.stats}")
+            await exchange.close()
+        for tracker in manager.trackers.values():
+            print(f"[벤치마크] {tracker.name} 주문 추적: {len(tracker.orders)}건, "
+                  f"미완료 {len(tracker.active())}건, 재연결 {tracker.reconnects}회")
+            tracker.stop()
+        for cache in manager.order_books.values():
+            cache.stop()
+        print(f"[벤치마크] {len(schedule.slices)}개 슬라이스, {elapsed:.2f}s, "
+              f"{len(schedule.slices) / elapsed:.2f} slices/s")
+
+    asyncio.run(main())
@@ -0,0 +1,152 @@
+import asyncio
+import math
+import random
+import time
+
+POLICIES = ("catch_up", "skip")
+
+
+class Slice:
+    __slots__ = ("index", "amount", "scheduled", "sent", "skipped", "ok")
+
+    def __init__(self, index, amount, scheduled):
+        self.index = index
+        self.amount = amount
+        self.scheduled = scheduled  # 예정 전송 시각 (monotonic)
+        self.sent = None  # 실제 전송 시각 (monotonic)
+        self.skipped = 0  # 이 슬라이스에 합쳐진 건너뛴 슬라이스 수
+        self.ok = None  # 주문/헤지 성공 여부 (실행 측에서 기록)
+
+    def mark_sent(self):
+        self.sent = time.monotonic()
+
+    @property
+    def lateness(self):
+        return None if self.sent is None else self.sent - self.scheduled
+
+    def __repr__(self):
+        return f"Slice({self.index}, amount={self.amount}, lateness={self.lateness})"
+
+
+def allocate(total_amount, num_slices, amount_step=None):
+    """
+    총 수량을 슬라이스별로 나머지 없이 배분
+    :param total_amount: 총 수량
+    :param num_slices: 슬라이스 수
+    :param amount_step: 최소 수량 단위 (선택사항, 지정 시 단위 배수로 배분)
+    :return: 슬라이스별 수량 리스트 (합계 == total_amount, 단위 수가 슬라이스 수보다 적으면 슬라이스 수를 줄임)
+    """
+    if amount_step:
+        exact = total_amount / amount_step
+        units = int(round(exact))
+        if abs(exact - units) > 1e-6:
+            raise ValueError(f"총 수량 {total_amount}이 수량 단위 {amount_step}의 배수가 아닙니다 "
+                             f"(나머지 {total_amount - units * amount_step:.10g})")
+        if units <= 0:
+            raise ValueError(f"총 수량 {total_amount}이 수량 단위 {amount_step}보다 작습니다.")
+        # 빈 슬라이스가 주문으로 나가지 않도록 슬라이스당 최소 1단위
+        num_slices = min(num_slices, units)
+        base, extra = divmod(units, num_slices)
+        # 나머지 단위는 앞쪽 슬라이스부터 1단위씩 배분
+        return [(base + (1 if i < extra else 0)) * amount_step for i in range(num_slices)]
+
+    base = total_amount / num_slices
+    amounts = [base] * (num_slices - 1)
+    amounts.append(total_amount - base * (num_slices - 1))  # 부동소수 오차는 마지막 슬라이스가 흡수
+    return amounts
+
+
+class SliceScheduler:
+    def __init__(self, total_amount, duration_seconds, interval_seconds, jitter=0.0, policy="catch_up", amount_step=None):
+        """
+        monotonic 기준 마감 시각으로 TWAP 슬라이스를 배치 (처리 시간이 누적되어 밀리지 않음)
+        :param total_amount: 총 수량
+        :param duration_seconds: 전체 실행 시간(초)
+        :param interval_seconds: 슬라이스 간격(초)
+        :param jitter: 간격 대비 무작위 흔들림 비율 (0 ~ 0.5)
+        :param policy: 슬라이스 지연 시 처리 방식 ("catch_up": 밀린 슬라이스 연속 전송, "skip": 지난 슬라이스를 현재 슬라이스에 합침)
+        :param amount_step: 최소 수량 단위 (선택사항)
+        """
+        if policy not in POLICIES:
+            raise ValueError(f"policy는 {POLICIES} 중 하나여야 합니다.")
+        if interval_seconds <= 0:
+            raise ValueError("interval_seconds는 0보다 커야 합니다.")
+
+        self.interval_seconds = interval_seconds
+        self.jitter = min(max(jitter, 0.0), 0.5)
+        self.policy = policy
+        self.num_slices = max(1, math.ceil(duration_seconds / interval_seconds - 1e-9))
+        self.amounts = allocate(total_amount, self.num_slices, amount_step)
+        if len(self.amounts) < self.num_slices:
+            # 수량 단위가 부족해 슬라이스가 줄어든 경우 전체 실행 시간에 맞춰 간격을 늘림
+            self.num_slices = len(self.amounts)
+            self.interval_seconds = duration_seconds / self.num_slices
+
+        self.start = None
+        self.slices = []  # 실행된 슬라이스 기록
+
+    def _deadline(self, index):
+        offset = index * self.interval_seconds
+        if self.jitter and index > 0:
+            offset += random.uniform(-self.jitter, self.jitter) * self.interval_seconds
+        return self.start + offset
+
+    def time_to_next(self, index):
+        """
+        다음 슬라이스 예정 시각까지 남은 시간(초)
+        :param index: 현재 슬라이스 번호
+        """
+        if self.start is None or index + 1 >= self.num_slices:
+            return self.interval_seconds
+        return max(0.0, self.start + (index + 1) * self.interval_seconds - time.monotonic())
+
+    async def __aiter__(self):
+        self.start = time.monotonic()
+        index = 0
+        while index < self.num_slices:
+            deadline = self._deadline(index)
+            wait = deadline - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+
+            amount = self.amounts[index]
+            skipped = 0
+            if self.policy == "skip":
+                # 다음 슬라이스 마감까지 지났으면 지난 슬라이스 수량을 합쳐 한 번에 전송
+                now = time.monotonic()
+                while index + 1 < self.num_slices and self.start + (index + 1) * self.interval_seconds <= now:
+                    index += 1
+                    skipped += 1
+                    amount += self.amounts[index]
+
+            current = Slice(index, amount, deadline)
+            current.skipped = skipped
+            self.slices.append(current)
+            yield current
+            if current.sent is None:
+                current.mark_sent()
+            index += 1
+
+    def report(self):
+        """
+        슬라이스별 예정/실제 전송 시각 기록
+        """
+        return [{"index": s.index,
+                 "amount": s.amount,
+                 "scheduled": s.scheduled - self.start,
+                 "sent": None if s.sent is None else s.sent - self.start,
+                 "lateness": s.lateness,
+                 "skipped": s.skipped,
+                 "ok": s.ok}
+                for s in self.slices]
+
+    def summary(self):
+        late = [s.lateness for s in self.slices if s.lateness is not None]
+        if not late:
+            return {}
+        return {"slices": len(self.slices),
+                "amount": sum(s.amount for s in self.slices),
+                "lateness_avg": sum(late) / len(late),
+                "lateness_max": max(late),
+                "skipped": sum(s.skipped for s in self.slices),
+                "failed": sum(1 for s in self.slices if s.ok is False)}
@@ -0,0 +1,60 @@
+import asyncio
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from order_tracker import OrderTracker
+from paired import Leg, PairedExecutor
+from simulator import SimulatedExchange
+
+SYMBOL = "DOGE/USDT"
+
+
+class HedgeOnFillTest(unittest.TestCase):
+    def run_hedge(self, amount, timeout, seed):
+        async def main():
+            primary = SimulatedExchange(name="primary", prices={SYMBOL: 0.1}, latency=0.01, feed_interval=0.02,
+                                        volatility=0.0, level_size=10.0, partial_fill=1.0, seed=seed)
+            secondary = SimulatedExchange(name="secondary", prices={SYMBOL: 0.1}, latency=0.01,
+                                          feed_interval=0.02, level_size=1000.0, seed=seed + 100)
+            tracker = OrderTracker(primary)
+            executor = PairedExecutor({id(primary): tracker})
+            # 매도 2호가까지 걸리는 지정가: 생성 즉시 일부 체결 후 피드마다 부분 체결
+            price = primary.books[SYMBOL]["asks"][1][0]
+            try:
+                result = await executor.hedge_on_fill(Leg(primary, SYMBOL, "buy", amount, price),
+                                                      Leg(secondary, SYMBOL, "sell", amount, order_type="market"),
+                                                      timeout=timeout)
+            finally:
+                tracker.stop()
+                await primary.close()
+                await secondary.close()
+            return primary, secondary, result
+
+        return asyncio.run(main())
+
+    def assert_fully_hedged(self, primary, secondary, result):
+        primary_filled = sum(o["filled"] for o in primary.orders.values())
+        secondary_filled = sum(o["filled"] for o in secondary.orders.values())
+        self.assertGreater(primary_filled, 0)
+        self.assertAlmostEqual(primary_filled, secondary_filled, places=9)
+        self.assertAlmostEqual(result.hedged, primary_filled, places=9)
+        self.assertTrue(result.ok)
+        self.assertEqual(primary._resting, {})
+
+    def test_hedges_every_fill(self):
+        for seed in range(1, 5):
+            with self.subTest(seed=seed):
+                self.assert_fully_hedged(*self.run_hedge(amount=100.0, timeout=5.0, seed=seed))
+
+    def test_timeout_cancels_and_hedges_final_fill(self):
+        primary, secondary, result = self.run_hedge(amount=10000.0, timeout=0.2, seed=7)
+        self.assertLess(result.filled, 10000.0)
+        self.assert_fully_hedged(primary, secondary, result)
+        self.assertTrue(all(o["status"] in ("closed", "canceled") for o in primary.orders.values()))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import asyncio
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from order_book import L2Book, OrderBookCache
+from simulator import SimulatedExchange
+
+SYMBOL = "DOGE/USDT"
+
+
+class L2BookTest(unittest.TestCase):
+    def test_load_orders_levels_best_first(self):
+        book = L2Book(SYMBOL)
+        book.load(bids=[[0.098, 5.0], [0.099, 2.0], [0.097, 0.0]],
+                  asks=[[0.102, 4.0], [0.101, 1.0]], nonce=7)
+
+        self.assertEqual((book.best_bid, book.best_ask), (0.099, 0.101))
+        self.assertEqual(book.to_dict()["bids"], [[0.099, 2.0], [0.098, 5.0]])
+        self.assertEqual(book.to_dict(depth=1)["asks"], [[0.101, 1.0]])
+        self.assertEqual(book.size_at("buy", 0.098), 5.0)
+        self.assertEqual(book.size_at("sell", 0.103), 0.0)
+        self.assertEqual(book.depth_to("buy", 0.098), 7.0)
+        self.assertEqual(book.depth_to("sell", 0.102), 5.0)
+        self.assertFalse(book.is_stale(1.0))
+
+    def test_empty_side_is_stale(self):
+        book = L2Book(SYMBOL)
+        self.assertTrue(book.is_stale(1.0))
+        book.load(bids=[[0.099, 1.0]], asks=[])
+        self.assertTrue(book.is_stale(1.0))
+
+
+class CountingExchange(SimulatedExchange):
+    rest_calls = 0
+
+    async def fetch_order_book(self, symbol, limit=None, params=None):
+        self.rest_calls += 1
+        return await super().fetch_order_book(symbol, limit, params)
+
+
+class OrderBookCacheTest(unittest.TestCase):
+    def run_cache(self, max_age):
+        async def main():
+            exchange = CountingExchange(name="sim", prices={SYMBOL: 0.1}, latency=0.01,
+                                        feed_interval=0.02, volatility=0.0, seed=1)
+            cache = OrderBookCache(exchange, depth=5)
+            try:
+                top = await cache.top(SYMBOL, max_age=max_age, timeout=1.0)
+            finally:
+                cache.stop()
+                await exchange.close()
+            return exchange, cache, top
+
+        return asyncio.run(main())
+
+    def test_top_reads_feed_without_rest(self):
+        exchange, cache, top = self.run_cache(max_age=2.0)
+        book = exchange.books[SYMBOL]
+        self.assertEqual(top, (book["bids"][0][0], book["asks"][0][0]))
+        self.assertEqual(len(cache.book(SYMBOL).bids), 5)
+        self.assertEqual(exchange.rest_calls, 0)
+
+    def test_stale_book_falls_back_to_rest(self):
+        exchange, cache, top = self.run_cache(max_age=-1.0)
+        self.assertEqual(exchange.rest_calls, 1)
+        self.assertEqual(top, (cache.book(SYMBOL).best_bid, cache.book(SYMBOL).best_ask))
+
+
+if __name__ == "__main__":
+    unittest.main()
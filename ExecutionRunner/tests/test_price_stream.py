@@ -0,0 +1,38 @@
+import asyncio
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from execution import UniversalOrderManager
+from simulator import SimulatedExchange
+
+SYMBOL = "DOGE/USDT"
+
+
+class PriceStreamTest(unittest.TestCase):
+    def test_primary_only_manager_keeps_both_price_keys(self):
+        async def main():
+            exchange = SimulatedExchange(name="sim", prices={SYMBOL: 0.1}, latency=0.01,
+                                         feed_interval=0.02, volatility=0.0, seed=1)
+            manager = UniversalOrderManager.from_exchanges(exchange)
+            stream = asyncio.get_running_loop().create_task(
+                manager.price_stream.run({"primary": [SYMBOL]}))
+            try:
+                quote = await manager.price_stream.wait_changed("primary", SYMBOL, timeout=1.0)
+            finally:
+                stream.cancel()
+                await asyncio.gather(stream, return_exceptions=True)
+                await exchange.close()
+            return manager, quote
+
+        manager, quote = asyncio.run(main())
+        self.assertEqual(set(manager.prices), {"primary", "secondary"})
+        self.assertEqual(manager.prices["secondary"], {})
+        self.assertIsNotNone(quote)
+        self.assertEqual(manager.prices["primary"][SYMBOL], quote.last)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,208 @@
+import os
+import json
+import time
+import struct
+import logging
+import datetime
+import tempfile
+import numpy as np
+import pandas as pd
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"AWSNAP01"
+# NOTE: magic, version, created_at, meta_offset, meta_len, data_offset
+HEADER = struct.Struct("<8sQdQQQ")
+HEADER_SIZE = 64
+ALIGN = 64
+
+
+def default_path(name: str = "alphawave_snapshot.bin") -> str:
+    base = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    return os.path.join(base, name)
+
+
+def _align(offset: int) -> int:
+    return (offset + ALIGN - 1) // ALIGN * ALIGN
+
+
+def _encode_column(series: pd.Series) -> tuple[str, np.ndarray]:
+    if pd.api.types.is_bool_dtype(series):
+        return "bool", series.to_numpy(dtype=bool)
+    if pd.api.types.is_numeric_dtype(series):
+        return "float", series.to_numpy(dtype=np.float64)
+    if pd.api.types.is_datetime64_any_dtype(series):
+        ts = pd.to_datetime(series, utc=True)
+        return "datetime", ts.to_numpy(dtype="datetime64[ns]").view(np.int64)
+
+    values = series.dropna()
+    if not values.empty and values.map(lambda v: isinstance(v, (bool, np.bool_))).all():
+        return "bool", series.fillna(False).to_numpy(dtype=bool)
+    if not values.empty and values.map(lambda v: isinstance(v, datetime.datetime)).any():
+        ts = pd.to_datetime(series, errors="coerce", utc=True)
+        return "datetime", ts.to_numpy(dtype="datetime64[ns]").view(np.int64)
+
+    numeric = pd.to_numeric(series, errors="coerce")
+    if numeric.notna().sum() == values.size and not values.empty:
+        return "float", numeric.to_numpy(dtype=np.float64)
+
+    encoded = series.map(lambda v: b"" if v is None or (isinstance(v, float) and np.isnan(v))
+                         else str(v).encode("utf-8"))
+    width = max(1, int(encoded.map(len).max())) if len(encoded) else 1
+    return "str", encoded.to_numpy(dtype=f"S{width}")
+
+
+class SnapshotWriter:
+    def __init__(self, path: str = None):
+        self.path = path or default_path()
+
+    def _next_version(self) -> int:
+        try:
+            with open(self.path, "rb") as f:
+                magic, version, *_ = HEADER.unpack(f.read(HEADER.size))
+            return version + 1 if magic == MAGIC else 1
+        except (OSError, struct.error):
+            return 1
+
+    def write(self,
+              data_map: dict[str, pd.DataFrame],
+              extra: dict = None) -> int:
+        frames = {exch_name: df for exch_name, df in data_map.items()
+                  if isinstance(df, pd.DataFrame) and not df.empty}
+        frame = pd.concat(frames, names=["exchange"], axis=0) \
+            .reset_index(level="exchange").reset_index(drop=True) \
+            if frames else pd.DataFrame()
+
+        offset = HEADER_SIZE
+        blocks = []
+        columns = []
+        for name in frame.columns:
+            kind, values = _encode_column(frame[name])
+            values = np.ascontiguousarray(values)
+            offset = _align(offset)
+            columns.append({"name": name, "kind": kind, "dtype": values.dtype.str,
+                            "offset": offset, "nbytes": values.nbytes})
+            blocks.append((offset, values))
+            offset += values.nbytes
+
+        version = self._next_version()
+        created_at = time.time()
+        meta = json.dumps({"rows": len(frame),
+                           "columns": columns,
+                           "extra": extra or {}},
+                          default=str).encode("utf-8")
+        meta_offset = _align(offset)
+
+        # NOTE: Write aside and rename, attached readers keep mapping the old inode
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix=".snapshot-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(HEADER.pack(MAGIC, version, created_at,
+                                    meta_offset, len(meta), HEADER_SIZE))
+                for block_offset, values in blocks:
+                    f.seek(block_offset)
+                    f.write(values.tobytes())
+                f.seek(meta_offset)
+                f.write(meta)
+            os.replace(tmp, self.path)
+        except Exception:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+
+        logger.info(
+            f"Published snapshot v{version} ({len(frame)} rows) to {self.path}")
+        return version
+
+
+class SnapshotReader:
+    def __init__(self, path: str = None):
+        self.path = path or default_path()
+        self._mm: Optional[np.memmap] = None
+        self._identity: Optional[tuple] = None
+        self.version: Optional[int] = None
+        self.created_at: Optional[float] = None
+        self.meta: dict = {}
+        self.columns: dict[str, np.ndarray] = {}
+
+    def _stat_identity(self) -> tuple:
+        st = os.stat(self.path)
+        return st.st_ino, st.st_mtime_ns, st.st_size
+
+    def changed(self) -> bool:
+        try:
+            return self._stat_identity() != self._identity
+        except FileNotFoundError:
+            return False
+
+    def attach(self) -> "SnapshotReader":
+        identity = self._stat_identity()
+        mm = np.memmap(self.path, dtype=np.uint8, mode="r")
+        magic, version, created_at, meta_offset, meta_len, _ = HEADER.unpack(
+            mm[:HEADER.size].tobytes())
+        if magic != MAGIC:
+            raise ValueError(f"{self.path} is not a snapshot file")
+
+        meta = json.loads(mm[meta_offset:meta_offset + meta_len].tobytes())
+        rows = meta["rows"]
+        # NOTE: Column arrays are read-only views on the mapping, nothing is copied
+        columns = {
+            col["name"]: np.frombuffer(mm, dtype=np.dtype(col["dtype"]),
+                                       count=rows, offset=col["offset"])
+            for col in meta["columns"]
+        }
+
+        self._mm = mm
+        self._identity = identity
+        self.version = version
+        self.created_at = created_at
+        self.meta = meta
+        self.columns = columns
+        return self
+
+    def refresh(self) -> bool:
+        if self._mm is None or self.changed():
+            self.attach()
+            return True
+        return False
+
+    @property
+    def age(self) -> Optional[float]:
+        return time.time() - self.created_at if self.created_at else None
+
+    @property
+    def extra(self) -> dict:
+        return self.meta.get("extra", {})
+
+    def frame(self, tz: str = "Asia/Seoul") -> pd.DataFrame:
+        data = {}
+        for col in self.meta.get("columns", []):
+            values = self.columns[col["name"]]
+            if col["kind"] == "str":
+                data[col["name"]] = np.char.decode(values, "utf-8")
+            elif col["kind"] == "datetime":
+                data[col["name"]] = pd.to_datetime(values.view("datetime64[ns]"), utc=True) \
+                    .tz_convert(tz)
+            else:
+                data[col["name"]] = values
+        return pd.DataFrame(data)
+
+    def data_map(self, tz: str = "Asia/Seoul") -> dict[str, pd.DataFrame]:
+        frame = self.frame(tz=tz)
+        if frame.empty:
+            return {}
+
+        # NOTE: Unknown funding times were exported as NaT, restore the marker the fetchers use
+        for col in self.meta.get("columns", []):
+            if col["kind"] == "datetime":
+                values = frame[col["name"]]
+                frame[col["name"]] = values.astype(object).where(values.notna(), "Unknown")
+
+        res = {}
+        for exch_name, df in frame.groupby("exchange", sort=False):
+            df = df.drop(columns=["exchange"]).set_index("ticker", drop=False)
+            df.index.name = "ticker"
+            res[exch_name] = df
+        return res
@@ -1,14 +1,14 @@
 import logging
-import requests
 import multiprocessing
 import pandas as pd
 from tqdm import tqdm
-from typing import NamedTuple, Callable, Any, Optional
+from typing import NamedTuple, Callable, Any, Optional, Iterable
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from exchange import ExchangeManager
-from fetcher import DataFilter
+from fetcher import DataFilter, BULK_THRESHOLD
 from tools import Tools
+from planner import EndpointPlanner, INTERVAL_KEYS
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -17,37 +17,37 @@ logger = logging.getLogger(__name__)
 class ExceptionRegister(NamedTuple):
     name: str
     func: Callable[[str, Any], tuple[str, dict]]
+    # NOTE: None lets the EndpointPlanner pick the exchanges that need this endpoint
     target_exchanges: list[str] | None = None
     target_filter: Optional[str] = None
 
 
 class ExceptionFilter(DataFilter):
-    def __init__(self, exch_mgr: ExchangeManager):
-        super().__init__(exch_mgr)
+    def __init__(self,
+                 exch_mgr: ExchangeManager,
+                 tickers: Iterable[str] = None,
+                 bulk_threshold: int = BULK_THRESHOLD):
+        super().__init__(exch_mgr, tickers, bulk_threshold)
 
         self.exception_methods = [
             ExceptionRegister(
                 "fetchBidsAsks",
                 self._load_exception_fetchBidsAsks,
-                target_exchanges=["binance"],
                 target_filter='BidAskFilter'
             ),
             ExceptionRegister(
                 "fetchFundingIntervals",
                 self._load_exception_fetchFundingIntervals,
-                target_exchanges=["binance"],
                 target_filter='FundingRatesFilter'
             ),
             ExceptionRegister(
                 "fetchTradingFees",
                 self._load_exception_fetchTradingFees,
-                target_exchanges=["bitget"],
                 target_filter='FundingRatesFilter'
             ),
             ExceptionRegister(
                 "fetchFundingTime",
                 self._load_exception_fetchFundingTime,
-                target_exchanges=["bitget"],
                 target_filter='FundingRatesFilter'
             ),
         ]
@@ -55,8 +55,12 @@ class ExceptionFilter(DataFilter):
     def _load_exception_fetchBidsAsks(self, exch_name: str, exch) -> tuple[str, dict]:
         logger.info(f"Fetching Bids and Asks for {exch_name}")
         params = {'type': 'swap'}
-        df = pd.DataFrame(Tools.safe_execute(
-            exch.fetchBidsAsks, params=params))
+        symbols = self._resolve(exch)
+        if symbols is not None and not symbols:
+            return exch_name, {}
+        df = self._frame(Tools.safe_execute(
+            exch.fetchBidsAsks, symbols if self._targeted(symbols) else None,
+            params=params), symbols)
         return exch_name, {
             'bid': df.loc['bid'],
             'ask': df.loc['ask'],
@@ -67,31 +71,45 @@ class ExceptionFilter(DataFilter):
     def _load_exception_fetchFundingIntervals(self, exch_name: str, exch) -> tuple[str, dict]:
         logger.info(f"Fetching Funding Intervals for {exch_name}")
         params = {'type': 'swap'}
-        df = pd.DataFrame(Tools.safe_execute(
-            exch.fetchFundingIntervals, params=params))
+        symbols = self._resolve(exch)
+        if symbols is not None and not symbols:
+            return exch_name, {}
+        df = self._frame(Tools.safe_execute(
+            exch.fetchFundingIntervals, symbols if self._targeted(symbols) else None,
+            params=params), symbols)
         return exch_name, {'interval': df.loc['interval'].apply(Tools.convert_interval_to_float)}
 
     def _load_exception_fetchTradingFees(self, exch_name: str, exch) -> tuple[str, dict]:
         logger.info(f"Fetching Trading Fees for {exch_name}")
         params = {'type': 'swap'}
-        df = pd.DataFrame(Tools.safe_execute(
-            exch.fetchTradingFees, params=params))
+        symbols = self._resolve(exch)
+        if symbols is not None and not symbols:
+            return exch_name, {}
+        df = self._frame(Tools.safe_execute(
+            exch.fetchTradingFees, params=params), symbols)
         return exch_name, {
-            'interval': df.loc['info'].apply(lambda x: Tools.convert_interval_to_float(x['fundInterval']))
+            'interval': df.loc['info'].apply(lambda x: Tools.convert_interval_to_float(
+                next((x[key] for key in INTERVAL_KEYS if key in x), None)))
         }
 
     def _load_exception_fetchFundingTime(self, exch_name: str, exch) -> tuple[str, dict]:
         logger.info(f"Fetching Funding Time for {exch_name}")
         url = "https://api.bitget.com/api/v2/mix/market/funding-time"
         params = {'type': 'swap'}
-        df = pd.DataFrame(Tools.safe_execute(
-            exch.loadMarkets, params=params))
+        symbols = self._resolve(exch)
+        df = self._frame(Tools.safe_execute(
+            exch.loadMarkets, params=params), symbols)
+        if df.empty:
+            return exch_name, {}
         df = df.loc[:, df.loc['linear'] == True]
 
         symbols = df.loc['id']
         product_types = df.loc['settle'] + '-futures'
         maps = {v: k for k, v in symbols.items()}
 
+        # NOTE: Deferred so that importing the filters does not pull in requests
+        import requests
+
         def _fetch_funding_time(symbol: str, product_type: str):
             try:
                 response = requests.get(
@@ -116,7 +134,7 @@ class ExceptionFilter(DataFilter):
                 future_map[future] = map_symbol
             for fut in as_completed(future_map):
                 map_symbol = future_map[fut]
-                funding_time[map_symbol] = future.result()
+                funding_time[map_symbol] = fut.result()
 
         res = pd.Series(funding_time)
         return exch_name, {"fundingTimestamp": res}
@@ -129,12 +147,19 @@ class ExceptionFilter(DataFilter):
         snapshot: dict[str, dict] = {exch_name: {}
                                      for exch_name in self._exchanges}
 
+        planner = EndpointPlanner.shared()
         with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            items = list(self._exchanges.items())
+            plans = {exch_name: plan for (exch_name, _), plan in
+                     zip(items, executor.map(lambda item: planner.plan(*item), items))}
             future_map = {}
 
             for method in self.exception_methods:
                 if method.target_exchanges is None:
-                    target_exchanges = self._exchanges.keys()
+                    target_exchanges = [
+                        exch_name for exch_name, plan in plans.items()
+                        if method.name in plan.supplements
+                    ]
                 else:
                     target_exchanges = [
                         exch for exch in method.target_exchanges
@@ -1,9 +1,11 @@
-import ccxt
 import logging
+import importlib
+import threading
 import multiprocessing
-from typing import Dict, Any
+from typing import Dict, Any, Iterator, Optional
 from enum import Enum, unique
 from dataclasses import dataclass
+from collections.abc import Mapping
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from exceptionExch import ExceptionExchange
@@ -20,6 +22,9 @@ class Exchanges(Enum):
     BYBIT = "bybit"
     BITGET = "bitget"
     GATEIO = "gateio"
+    OKX = "okx"
+    MEXC = "mexc"
+    KUCOINFUTURES = "kucoinfutures"
 
 
 @unique
@@ -54,45 +59,104 @@ class CoinRegister:
         return f"<CoinRegister size={len(self._configs)}>"
 
 
-class ExchangeManager:
-    def __init__(self, registry: CoinRegister = None) -> None:
-        if registry is None:
-            registry = default_registry()
-        self._registry = registry
-        self._exchanges = {}
-        self._initialize_exchanges()
+class LazyExchanges(Mapping):
+    def __init__(self, registry: CoinRegister) -> None:
+        self._configs = {conf.exchange.value: conf
+                         for conf in registry.get_all_configs()}
+        self._instances: dict[str, ExceptionExchange] = {}
+        self._failed: set[str] = set()
+        self._locks = {exch_name: threading.Lock() for exch_name in self._configs}
 
-    def _initialize_exchanges(self) -> None:
-        def initialize_exchange(conf: CoinConfig):
-            exch_name = conf.exchange.value
-            try:
-                exchange_class = getattr(ccxt, exch_name)
-                exchange = exchange_class()
+    @staticmethod
+    def _construct(conf: CoinConfig) -> ExceptionExchange:
+        # NOTE: ccxt is only imported once an exchange is actually needed
+        ccxt = importlib.import_module("ccxt")
+        exchange_class = getattr(ccxt, conf.exchange.value)
+        exchange = exchange_class()
+
+        params = conf.get_params()
+        exchange.options.update(params)
+        return ExceptionExchange(exchange=exchange)
+
+    def _load(self, exch_name: str) -> Optional[ExceptionExchange]:
+        exchange = self._instances.get(exch_name)
+        if exchange is not None or exch_name in self._failed:
+            return exchange
 
-                params = conf.get_params()
-                exchange.options.update(params)
-                exchange = ExceptionExchange(exchange=exchange)
+        with self._locks[exch_name]:
+            if exch_name in self._instances or exch_name in self._failed:
+                return self._instances.get(exch_name)
+
+            conf = self._configs[exch_name]
+            try:
+                exchange = self._construct(conf)
                 logger.info(
-                    f"[ExchangeManager] Initialized exchange: {exch_name} with params: {params}")
-                return exch_name, exchange
+                    f"[ExchangeManager] Initialized exchange: {exch_name} with params: {conf.get_params()}")
+                self._instances[exch_name] = exchange
+                return exchange
             except Exception as e:
                 logger.error(
                     f"[ExchangeManager] Error initializing {exch_name}: {str(e)}")
+                self._failed.add(exch_name)
                 return None
 
-        futures = []
-        max_workers = min(multiprocessing.cpu_count(), len(self._registry))
+    def load_all(self) -> None:
+        missing = [exch_name for exch_name in self._configs
+                   if exch_name not in self._instances and exch_name not in self._failed]
+        if not missing:
+            return
+
+        max_workers = min(multiprocessing.cpu_count(), len(missing))
         with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            for conf in self._registry.get_all_configs():
-                futures.append(executor.submit(initialize_exchange, conf))
+            futures = [executor.submit(self._load, exch_name)
+                       for exch_name in missing]
             for f in as_completed(futures):
-                result = f.result()
-                if result is not None:
-                    exch_name, exchange = result
-                    self._exchanges[exch_name] = exchange
+                f.result()
+
+    @property
+    def loaded(self) -> list[str]:
+        return list(self._instances)
+
+    def __getitem__(self, exch_name: str) -> ExceptionExchange:
+        if exch_name not in self._configs:
+            raise KeyError(exch_name)
+        exchange = self._load(exch_name)
+        if exchange is None:
+            raise KeyError(exch_name)
+        return exchange
+
+    def __contains__(self, exch_name: object) -> bool:
+        return exch_name in self._configs and exch_name not in self._failed
+
+    def __iter__(self) -> Iterator[str]:
+        return (exch_name for exch_name in self._configs
+                if exch_name not in self._failed)
+
+    def __len__(self) -> int:
+        return len(self._configs) - len(self._failed)
+
+    def items(self):
+        # NOTE: Walking every exchange constructs the missing ones in parallel first
+        self.load_all()
+        return [(exch_name, self._instances[exch_name])
+                for exch_name in self._configs if exch_name in self._instances]
+
+    def values(self):
+        return [exchange for _, exchange in self.items()]
+
+    def __repr__(self) -> str:
+        return f"<LazyExchanges registered={len(self._configs)} loaded={len(self._instances)}>"
+
+
+class ExchangeManager:
+    def __init__(self, registry: CoinRegister = None) -> None:
+        if registry is None:
+            registry = default_registry()
+        self._registry = registry
+        self._exchanges = LazyExchanges(registry)
 
     @property
-    def exchanges(self):
+    def exchanges(self) -> LazyExchanges:
         return self._exchanges
 
     @property
@@ -2,18 +2,30 @@ import multiprocessing
 import pandas as pd
 from tqdm import tqdm
 from abc import ABC, abstractmethod
-from typing import List, Tuple, Any
+from typing import List, Tuple, Any, Iterable, Optional
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from tools import Tools
 from exchange import ExchangeManager
+from planner import EndpointPlanner, FUNDING_FIELDS, TICKER_FIELDS
+
+# NOTE: Above this many symbols per exchange one bulk call beats per-symbol round trips
+BULK_THRESHOLD = 8
+POINT_WORKERS = 8
 
 
 class DataFilter(ABC):
-    def __init__(self, exch_mgr: ExchangeManager):
+    def __init__(self,
+                 exch_mgr: ExchangeManager,
+                 tickers: Iterable[str] = None,
+                 bulk_threshold: int = BULK_THRESHOLD):
         self._exchanges = exch_mgr.exchanges
         self._configs = exch_mgr.configs
 
+        self._tickers = frozenset(t.upper() for t in tickers) \
+            if tickers is not None else None
+        self._bulk_threshold = bulk_threshold
+
         self._max_workers = min(
             multiprocessing.cpu_count(), len(self._exchanges))
 
@@ -21,14 +33,81 @@ class DataFilter(ABC):
     def max_workers(self) -> int:
         return self._max_workers
 
+    @staticmethod
+    def _swap_symbols(exch) -> list[str]:
+        # NOTE: ccxt caches markets on the instance, only the first call hits the exchange
+        markets = Tools.safe_execute(exch.loadMarkets) or {}
+        return [symbol for symbol, market in markets.items()
+                if market.get('swap')]
+
+    def _resolve(self, exch) -> Optional[list[str]]:
+        if self._tickers is None:
+            return None
+        return [symbol for symbol in self._swap_symbols(exch)
+                if Tools.canonical_ticker(symbol) in self._tickers]
+
+    def _targeted(self, symbols: Optional[list[str]]) -> bool:
+        return symbols is not None and len(symbols) <= self._bulk_threshold
+
+    @staticmethod
+    def _fetch_each(func, symbols: list[str], params: dict = None) -> dict[str, dict]:
+        res = {}
+        if not symbols:
+            return res
+
+        with ThreadPoolExecutor(max_workers=min(len(symbols), POINT_WORKERS)) as executor:
+            future_map = {
+                executor.submit(Tools.safe_execute, func, symbol,
+                                params=params, skip=True): symbol
+                for symbol in symbols
+            }
+            for fut in as_completed(future_map):
+                data = fut.result()
+                if data:
+                    res[future_map[fut]] = data
+        return res
+
+    def _fetch_symbols(self,
+                       exch,
+                       single: str,
+                       bulk: str,
+                       symbols: list[str],
+                       params: dict = None) -> dict[str, dict]:
+        if not symbols:
+            return {}
+        if exch.has.get(single):
+            return self._fetch_each(getattr(exch, single), symbols, params=params)
+        return Tools.safe_execute(getattr(exch, bulk), symbols, params=params)
+
+    def _fetch_all(self,
+                   exch,
+                   single: str,
+                   bulk: str,
+                   params: dict = None) -> dict[str, dict]:
+        if EndpointPlanner.bulk_or_single(exch, bulk, single) == single:
+            # NOTE: No bulk endpoint on this venue, one request per swap market
+            return self._fetch_each(getattr(exch, single), self._swap_symbols(exch),
+                                    params=params)
+        return Tools.safe_execute(getattr(exch, bulk), params=params)
+
+    @staticmethod
+    def _frame(data: dict, symbols: Optional[list[str]]) -> pd.DataFrame:
+        df = pd.DataFrame(data)
+        if symbols is not None and not df.empty:
+            df = df.loc[:, df.columns.isin(symbols)]
+        return df
+
     @abstractmethod
     def apply(self) -> dict[str, dict]:
         pass
 
 
 class FundingRatesFilter(DataFilter):
-    def __init__(self, exch_mgr: ExchangeManager):
-        super().__init__(exch_mgr)
+    def __init__(self,
+                 exch_mgr: ExchangeManager,
+                 tickers: Iterable[str] = None,
+                 bulk_threshold: int = BULK_THRESHOLD):
+        super().__init__(exch_mgr, tickers, bulk_threshold)
 
     def apply(self) -> dict[str, dict]:
         if not self._exchanges:
@@ -37,8 +116,17 @@ class FundingRatesFilter(DataFilter):
         def _load_datas(exch_name: str,
                         exch) -> pd.DataFrame:
             params = {'type': 'swap'}
-            df = pd.DataFrame(Tools.safe_execute(exch.fetchFundingRates,
-                                                 params=params))
+            symbols = self._resolve(exch)
+            if self._targeted(symbols):
+                data = self._fetch_symbols(exch, 'fetchFundingRate', 'fetchFundingRates',
+                                           symbols, params=params)
+            else:
+                data = self._fetch_all(exch, 'fetchFundingRate', 'fetchFundingRates',
+                                       params=params)
+            EndpointPlanner.shared().observe(exch_name, data, FUNDING_FIELDS)
+            df = self._frame(data, symbols)
+            if df.empty:
+                return exch_name, {}
 
             res = {
                 'funding_rate': df.loc['fundingRate'],
@@ -66,8 +154,11 @@ class FundingRatesFilter(DataFilter):
 
 
 class LoadMarketsFilter(DataFilter):
-    def __init__(self, exch_mgr: ExchangeManager):
-        super().__init__(exch_mgr)
+    def __init__(self,
+                 exch_mgr: ExchangeManager,
+                 tickers: Iterable[str] = None,
+                 bulk_threshold: int = BULK_THRESHOLD):
+        super().__init__(exch_mgr, tickers, bulk_threshold)
 
     def apply(self) -> dict[str, dict]:
         if not self._exchanges:
@@ -75,7 +166,10 @@ class LoadMarketsFilter(DataFilter):
 
         def _load_datas(exch_name: str,
                         exch) -> pd.DataFrame:
-            temp = pd.DataFrame(exch.loadMarkets())
+            symbols = self._resolve(exch)
+            temp = self._frame(exch.loadMarkets(), symbols)
+            if temp.empty:
+                return exch_name, {}
             df = temp.loc[:, temp.loc['swap']]
 
             res = {
@@ -109,8 +203,11 @@ class LoadMarketsFilter(DataFilter):
 
 
 class BidAskFilter(DataFilter):
-    def __init__(self, exch_mgr: ExchangeManager):
-        super().__init__(exch_mgr)
+    def __init__(self,
+                 exch_mgr: ExchangeManager,
+                 tickers: Iterable[str] = None,
+                 bulk_threshold: int = BULK_THRESHOLD):
+        super().__init__(exch_mgr, tickers, bulk_threshold)
 
     def apply(self) -> dict[str, dict]:
         if not self._exchanges:
@@ -119,8 +216,17 @@ class BidAskFilter(DataFilter):
         def _load_datas(exch_name: str,
                         exch) -> pd.DataFrame:
             params = {'type': 'swap'}
-            df = pd.DataFrame(Tools.safe_execute(exch.fetchTickers,
-                                                 params=params))
+            symbols = self._resolve(exch)
+            if self._targeted(symbols):
+                data = self._fetch_symbols(exch, 'fetchTicker', 'fetchTickers',
+                                           symbols, params=params)
+            else:
+                data = self._fetch_all(exch, 'fetchTicker', 'fetchTickers',
+                                       params=params)
+            EndpointPlanner.shared().observe(exch_name, data, TICKER_FIELDS)
+            df = self._frame(data, symbols)
+            if df.empty:
+                return exch_name, {}
 
             res = {
                 'bid': df.loc['bid'],
@@ -0,0 +1,171 @@
+import logging
+import numpy as np
+import pandas as pd
+
+from table import TableViewer
+
+logger = logging.getLogger(__name__)
+
+DIFF_COLUMNS = ['symbol',
+                'funding_rate', 'interval',
+                'bid', 'ask',
+                'taker', 'maker',
+                'fundingTimestamp']
+
+
+class IncrementalPairTable:
+    def __init__(self,
+                 interval_equals: bool = True,
+                 pos_exists: bool = True,
+                 fr_mgmt: bool = True,
+                 verify: bool = False):
+        self.interval_equals = interval_equals
+        self.pos_exists = pos_exists
+        self.fr_mgmt = fr_mgmt
+        self.verify = verify
+
+        self._signatures: pd.DataFrame = None
+        self._ranked: pd.DataFrame = pd.DataFrame()
+        self._keys: np.ndarray = np.empty(0, dtype=object)
+        self.changed_tickers: set[str] = set()
+
+    @property
+    def pairs(self) -> pd.DataFrame:
+        return self._ranked
+
+    @staticmethod
+    def _ticker_signatures(infos: pd.DataFrame) -> pd.DataFrame:
+        if infos.empty:
+            return pd.DataFrame(columns=['hash', 'count'])
+
+        # NOTE: Order-independent per-ticker signature, sum of row hashes wraps in uint64
+        hashes = pd.util.hash_pandas_object(
+            infos[DIFF_COLUMNS], index=True).to_numpy(dtype=np.uint64)
+        codes, uniques = pd.factorize(
+            infos.index.get_level_values('ticker'))
+
+        order = np.argsort(codes, kind='stable')
+        sorted_codes = codes[order]
+        starts = np.flatnonzero(
+            np.r_[True, sorted_codes[1:] != sorted_codes[:-1]])
+
+        return pd.DataFrame({
+            'hash': np.add.reduceat(hashes[order], starts),
+            'count': np.diff(np.r_[starts, len(order)])
+        }, index=pd.Index(uniques[sorted_codes[starts]], name='ticker'))
+
+    @staticmethod
+    def _diff_signatures(prev: pd.DataFrame | None,
+                         curr: pd.DataFrame) -> set[str]:
+        if prev is None:
+            return set(curr.index)
+
+        common = prev.index.intersection(curr.index)
+        before = prev.loc[common]
+        after = curr.loc[common]
+        moved = (before['hash'].to_numpy() != after['hash'].to_numpy()) | \
+            (before['count'].to_numpy() != after['count'].to_numpy())
+
+        changed = set(common[moved])
+        changed |= set(prev.index.difference(curr.index))
+        changed |= set(curr.index.difference(prev.index))
+        return changed
+
+    @staticmethod
+    def _sort_keys(pairs: pd.DataFrame) -> np.ndarray:
+        if pairs.empty:
+            return np.empty(0, dtype=object)
+
+        # NOTE: NaN ER ranks last, (exchange, symbol) makes every key unique
+        er = pairs['ER'].to_numpy(dtype=float)
+        er = np.where(np.isnan(er), np.inf, -er)
+        keys = list(zip(er,
+                        pairs['ticker'].astype(str),
+                        pairs['exch1'].astype(str),
+                        pairs['symbol1'].astype(str),
+                        pairs['exch2'].astype(str),
+                        pairs['symbol2'].astype(str),
+                        pairs['tm'].astype(str)))
+        return pd.Series(keys, dtype=object).to_numpy()
+
+    def _compute(self, viewer: TableViewer, infos: pd.DataFrame) -> pd.DataFrame:
+        pairs = viewer._build_pairs(infos.reset_index(),
+                                    interval_equals=self.interval_equals,
+                                    pos_exists=self.pos_exists,
+                                    fr_mgmt=self.fr_mgmt)
+        if pairs.empty:
+            return pairs
+
+        pairs['ER'] = -pairs['diff'] + pairs['pi']
+        keys = self._sort_keys(pairs)
+        return pairs.iloc[np.argsort(keys, kind='stable')].reset_index(drop=True)
+
+    def _patch(self, fresh: pd.DataFrame, changed: set[str]):
+        if self._ranked.empty:
+            self._ranked = fresh
+            self._keys = self._sort_keys(fresh)
+            return
+
+        keep = ~self._ranked['ticker'].isin(changed).to_numpy()
+        kept = self._ranked[keep]
+        kept_keys = self._keys[keep]
+
+        if fresh.empty:
+            self._ranked = kept.reset_index(drop=True)
+            self._keys = kept_keys
+            return
+
+        # NOTE: Both sides are sorted, merge by inserting fresh rows at their ranks
+        fresh_keys = self._sort_keys(fresh)
+        positions = np.searchsorted(kept_keys, fresh_keys, side='left')
+        order = np.insert(np.arange(len(kept)),
+                          positions,
+                          np.arange(len(kept), len(kept) + len(fresh)))
+
+        merged = pd.concat([kept, fresh], ignore_index=True)
+        self._ranked = merged.iloc[order].reset_index(drop=True)
+        self._keys = np.concatenate([kept_keys, fresh_keys])[order]
+
+    def _verify(self, viewer: TableViewer, infos: pd.DataFrame):
+        full = self._compute(viewer, infos)
+        if full.empty and self._ranked.empty:
+            return
+        try:
+            pd.testing.assert_frame_equal(self._ranked.reset_index(drop=True),
+                                          full.reset_index(drop=True),
+                                          check_dtype=False)
+        except AssertionError as e:
+            raise RuntimeError(
+                f"Incremental pair table diverged from full rebuild: {e}")
+        logger.info(f"Verified incremental pair table ({len(full)} rows)")
+
+    def update(self, viewer: TableViewer) -> pd.DataFrame:
+        infos = viewer.get_info_table
+        signatures = self._ticker_signatures(infos)
+        changed = self._diff_signatures(self._signatures, signatures)
+
+        targets = infos[infos.index.get_level_values('ticker').isin(changed)]
+        fresh = self._compute(viewer, targets)
+        self._patch(fresh, changed)
+
+        self._signatures = signatures
+        self.changed_tickers = changed
+        logger.info(
+            f"Recomputed {len(changed)}/{len(signatures)} tickers, {len(fresh)} pair rows")
+
+        if self.verify:
+            self._verify(viewer, infos)
+        return self._ranked
+
+    def table(self,
+              viewer: TableViewer,
+              k: int | None = None) -> pd.DataFrame:
+        if self._ranked.empty:
+            return self._ranked
+        return viewer._rank_table(self._ranked.drop(columns=['ER']), k=k)
+
+    def reset(self):
+        self._signatures = None
+        self._ranked = pd.DataFrame()
+        self._keys = np.empty(0, dtype=object)
+        self.changed_tickers = set()
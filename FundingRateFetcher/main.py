@@ -1,9 +1,11 @@
+import os
 import argparse
+import datetime
 import logging
 
-from exchange import ExchangeManager
-from pipeline import PipelineMerger
+from tools import Tools
 from table import TableViewer
+from columnar import SnapshotReader, default_path
 
 logging.basicConfig(level=logging.INFO,
                     format="%(asctime)s - %(levelname)s - %(message)s")
@@ -11,18 +13,57 @@ logging.basicConfig(level=logging.INFO,
 """
 Run this script in the terminal to get the funding rate table, info table, or ticker finder result.
 
+By default the tables are answered from the last persisted snapshot, without importing ccxt
+or touching any exchange. Use --refresh to fetch live data, which also persists a new snapshot.
+
 Usage examples:
 - Display the info table:
     python main.py --info
 - Display the funding table:
     python main.py --fund
+- Display the pair table and the ranked table:
+    python main.py --pair --table
 - Display the ticker finder result for a given ticker (e.g., BTC):
     python main.py --ticker BTC
+- Fetch live data first:
+    python main.py --refresh --table
+- Fetch live data for a single ticker only (per-symbol endpoints, nothing persisted):
+    python main.py --refresh --ticker BTC
 
 Use the `run` function in an interactive environment to get the TableViewer object.
 """
 
 
+def run(**kwargs) -> TableViewer:
+    from exchange import ExchangeManager
+    from pipeline import PipelineMerger
+
+    exch_mgr = ExchangeManager()
+    pipeline = PipelineMerger.load_pipeline(
+        exch_mgr=exch_mgr, get_fr=True, get_lm=True, get_ba=True,
+        tickers=kwargs.get("tickers")
+    )
+    viewer = TableViewer(
+        exch_mgr=exch_mgr,
+        pipeline=pipeline,
+        data_map=pipeline.data_map,
+        base_exch=kwargs.get("exch_name", "hyperliquid"),
+        timezone=kwargs.get("tz", "Asia/Seoul")
+    )
+
+    snapshot_path = kwargs.get("snapshot_path")
+    if snapshot_path is not None:
+        viewer.export_snapshot(snapshot_path)
+    return viewer
+
+
+def load(path: str = None, **kwargs) -> TableViewer:
+    reader = SnapshotReader(path).attach()
+    return TableViewer.from_snapshot(reader,
+                                     base_exch=kwargs.get("exch_name", "hyperliquid"),
+                                     timezone=kwargs.get("tz", "Asia/Seoul"))
+
+
 def run_terminal():
     parser = argparse.ArgumentParser(
         description="Funding Rate Fetcher"
@@ -31,29 +72,44 @@ def run_terminal():
                         help="Display the info table")
     parser.add_argument("--fund", action="store_true",
                         help="Display the funding table")
+    parser.add_argument("--pair", action="store_true",
+                        help="Display the pair table")
+    parser.add_argument("--table", action="store_true",
+                        help="Display the ranked table")
     parser.add_argument("--ticker", type=str, default=None,
                         help="Display ticker finder result for a given ticker (e.g., BTC)")
     parser.add_argument("--exch", type=str, default="hyperliquid",
                         help="Base exchange name (default: hyperliquid)")
     parser.add_argument("--tz", type=str, default="Asia/Seoul",
                         help="Timezone (default: Asia/Seoul)")
+    parser.add_argument("--snapshot", type=str, default=default_path(),
+                        help=f"Snapshot file (default: {default_path()})")
+    parser.add_argument("--refresh", action="store_true",
+                        help="Fetch live data and persist a new snapshot")
     args = parser.parse_args()
 
-    exch_mgr = ExchangeManager()
-    pipeline = PipelineMerger.load_pipeline(
-        exch_mgr=exch_mgr, get_fr=True, get_lm=True, get_ba=True
-    )
-    viewer = TableViewer(
-        exch_mgr=exch_mgr,
-        pipeline=pipeline,
-        data_map=pipeline.data_map,
-        base_exch=args.exch,
-        timezone=args.tz
-    )
+    if not args.refresh and os.path.exists(args.snapshot):
+        reader = SnapshotReader(args.snapshot).attach()
+        created_at = datetime.datetime.fromtimestamp(reader.created_at)
+        print(f"=== Snapshot v{reader.version} from {created_at:%Y-%m-%d %H:%M:%S} "
+              f"(age {reader.age:.0f}s) ===")
+        viewer = TableViewer.from_snapshot(reader,
+                                           base_exch=args.exch,
+                                           timezone=args.tz)
+    elif args.refresh and args.ticker and \
+            not (args.info or args.fund or args.pair or args.table):
+        # NOTE: A partial universe must not replace the persisted snapshot
+        viewer = run(exch_name=args.exch, tz=args.tz,
+                     tickers=[args.ticker])
+    else:
+        if not args.refresh:
+            print(f"=== No snapshot at {args.snapshot}, fetching live data ===")
+        viewer = run(exch_name=args.exch, tz=args.tz,
+                     snapshot_path=args.snapshot)
 
     if args.info:
         print("=== Info Table ===")
-        print(viewer.get_info_table())
+        print(viewer.get_info_table)
     if args.fund:
         print("=== Funding Table ===")
         print(viewer.get_funding_table(hours_ahead=8,
@@ -68,34 +124,8 @@ def run_terminal():
         print(viewer.get_table)
     if args.ticker:
         print(f"=== Ticker Finder for {args.ticker} ===")
-        print(pipeline.ticker_finder(args.ticker))
-
-
-def run(**kwargs) -> TableViewer:
-    exch_mgr = ExchangeManager()
-    pipeline = PipelineMerger.load_pipeline(
-        exch_mgr=exch_mgr, get_fr=True, get_lm=True, get_ba=True
-    )
-    return TableViewer(
-        exch_mgr=exch_mgr,
-        pipeline=pipeline,
-        data_map=pipeline.data_map,
-        base_exch=kwargs.get("exch_name", "hyperliquid"),
-        timezone=kwargs.get("tz", "Asia/Seoul")
-    )
+        print(Tools.find_ticker(viewer.data_map, args.ticker))
 
 
 if __name__ == "__main__":
-    # run_terminal()
-
-    viewer = run()
-    print("=== Info Table ===")
-    print(viewer.get_info_table)
-    print("=== Funding Table ===")
-    print(viewer.get_funding_table(hours_ahead=8, tolerance_minutes=30))
-    print("=== Pair Table ===")
-    print(viewer.get_pair_table(interval_equals=True,
-                                pos_exists=True,
-                                fr_mgmt=True))
-    print("=== Table ===")
-    print(viewer.get_table)
+    run_terminal()
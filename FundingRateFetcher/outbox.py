@@ -0,0 +1,185 @@
+import time
+import asyncio
+import logging
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from telegram.error import BadRequest, RetryAfter
+
+logger = logging.getLogger(__name__)
+
+MAX_MESSAGE_LENGTH = 4096
+
+
+@dataclass
+class OutboundMessage:
+    chat_id: int
+    text: str
+    parse_mode: Optional[str] = None
+    reply_markup: Any = None
+    slot: Optional[str] = None
+
+    def can_merge(self, other: "OutboundMessage") -> bool:
+        return self.slot is None and other.slot is None \
+            and self.reply_markup is None and other.reply_markup is None \
+            and self.parse_mode == other.parse_mode \
+            and len(self.text) + len(other.text) + 1 <= MAX_MESSAGE_LENGTH
+
+    @property
+    def fingerprint(self) -> tuple:
+        # NOTE: Only what the user sees. Callback data carries the snapshot id and
+        # changes every refresh, RenderCache keeps the ids of an unchanged table resolvable
+        layout = None
+        if self.reply_markup is not None:
+            layout = tuple(tuple(button.text for button in row)
+                           for row in self.reply_markup.inline_keyboard)
+        return self.text, self.parse_mode, layout
+
+
+@dataclass
+class ChatQueue:
+    pending: deque = field(default_factory=deque)
+    slots: dict[str, OutboundMessage] = field(default_factory=dict)
+    # NOTE: slot -> (message_id, fingerprint) of the message currently shown
+    shown: dict[str, tuple[int, tuple]] = field(default_factory=dict)
+    wakeup: asyncio.Event = field(default_factory=asyncio.Event)
+    last_sent: float = 0.0
+    worker: Optional[asyncio.Task] = None
+
+
+class Outbox:
+    def __init__(self,
+                 bot,
+                 private_interval: float = 1.0,
+                 group_interval: float = 3.0):
+        self.bot = bot
+        self.private_interval = private_interval
+        self.group_interval = group_interval
+        self._chats: dict[int, ChatQueue] = {}
+        self.stats = {'sent': 0, 'edited': 0, 'skipped': 0, 'merged': 0}
+
+    def _interval(self, chat_id: int) -> float:
+        # NOTE: Group chat ids are negative and allow ~20 messages per minute
+        return self.group_interval if chat_id < 0 else self.private_interval
+
+    def _queue(self, chat_id: int) -> ChatQueue:
+        queue = self._chats.get(chat_id)
+        if queue is None:
+            queue = self._chats[chat_id] = ChatQueue()
+        if queue.worker is None or queue.worker.done():
+            queue.worker = asyncio.get_running_loop().create_task(
+                self._work(chat_id, queue))
+        return queue
+
+    def send(self,
+             chat_id: int,
+             text: str,
+             parse_mode: str = None,
+             reply_markup: Any = None,
+             slot: str = None):
+        # NOTE: Config ids may be strings, "-100" and -100 must share one queue
+        chat_id = int(chat_id)
+        msg = OutboundMessage(chat_id=chat_id,
+                              text=text,
+                              parse_mode=parse_mode,
+                              reply_markup=reply_markup,
+                              slot=slot)
+        queue = self._queue(chat_id)
+
+        if slot is not None:
+            # NOTE: Only the latest content of a slot is worth delivering
+            if slot in queue.slots:
+                self.stats['merged'] += 1
+            else:
+                queue.pending.append(slot)
+            queue.slots[slot] = msg
+        elif queue.pending and isinstance(queue.pending[-1], OutboundMessage) \
+                and queue.pending[-1].can_merge(msg):
+            last = queue.pending[-1]
+            queue.pending[-1] = OutboundMessage(chat_id=chat_id,
+                                                text=f"{last.text}\n{msg.text}",
+                                                parse_mode=last.parse_mode)
+            self.stats['merged'] += 1
+        else:
+            queue.pending.append(msg)
+        queue.wakeup.set()
+
+    async def _deliver(self, msg: OutboundMessage, queue: ChatQueue) -> bool:
+        shown = queue.shown.get(msg.slot) if msg.slot is not None else None
+        if shown is not None and shown[1] == msg.fingerprint:
+            self.stats['skipped'] += 1
+            return False
+
+        if shown is not None:
+            try:
+                await self.bot.edit_message_text(chat_id=msg.chat_id,
+                                                 message_id=shown[0],
+                                                 text=msg.text,
+                                                 parse_mode=msg.parse_mode,
+                                                 reply_markup=msg.reply_markup)
+                queue.shown[msg.slot] = (shown[0], msg.fingerprint)
+                self.stats['edited'] += 1
+                return True
+            except BadRequest as e:
+                if "not modified" in str(e).lower():
+                    queue.shown[msg.slot] = (shown[0], msg.fingerprint)
+                    self.stats['skipped'] += 1
+                    return False
+                logger.warning(
+                    f"Edit failed for chat={msg.chat_id} slot={msg.slot}: {e}. Sending new message.")
+
+        sent = await self.bot.send_message(chat_id=msg.chat_id,
+                                           text=msg.text,
+                                           parse_mode=msg.parse_mode,
+                                           reply_markup=msg.reply_markup)
+        if msg.slot is not None:
+            queue.shown[msg.slot] = (sent.message_id, msg.fingerprint)
+        self.stats['sent'] += 1
+        return True
+
+    async def _work(self, chat_id: int, queue: ChatQueue):
+        interval = self._interval(chat_id)
+        while True:
+            if not queue.pending:
+                queue.wakeup.clear()
+                await queue.wakeup.wait()
+                continue
+
+            wait = queue.last_sent + interval - time.monotonic()
+            if wait > 0:
+                # NOTE: Messages arriving while we wait get coalesced into the queue
+                await asyncio.sleep(wait)
+
+            item = queue.pending.popleft()
+            msg = queue.slots.pop(item, None) if isinstance(item, str) else item
+            if msg is None:
+                continue
+            try:
+                if await self._deliver(msg, queue):
+                    queue.last_sent = time.monotonic()
+            except RetryAfter as e:
+                retry_after = getattr(e, 'retry_after', 1)
+                if hasattr(retry_after, 'total_seconds'):
+                    retry_after = retry_after.total_seconds()
+                logger.warning(
+                    f"Flood control for chat={chat_id}, retrying in {retry_after}s")
+                if not isinstance(item, str):
+                    queue.pending.appendleft(item)
+                elif item not in queue.slots:
+                    queue.slots[item] = msg
+                    queue.pending.appendleft(item)
+                await asyncio.sleep(float(retry_after))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Failed to deliver message to chat={chat_id}: {e}")
+                queue.last_sent = time.monotonic()
+
+    async def close(self):
+        for queue in self._chats.values():
+            if queue.worker is not None:
+                queue.worker.cancel()
+        await asyncio.gather(*(q.worker for q in self._chats.values()
+                               if q.worker is not None),
+                             return_exceptions=True)
@@ -4,12 +4,14 @@ import pandas as pd
 import multiprocessing
 import logging
 from tqdm import tqdm
+from typing import Iterable
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from tools import Tools
 from exchange import ExchangeManager
-from fetcher import FundingRatesFilter, LoadMarketsFilter, BidAskFilter, SnapShotFetcher
+from fetcher import FundingRatesFilter, LoadMarketsFilter, BidAskFilter, SnapShotFetcher, BULK_THRESHOLD
 from exception import ExceptionFilter
+from columnar import SnapshotWriter
 
 logging.basicConfig(level=logging.INFO,
                     format="%(asctime)s - %(filename)s - %(levelname)s - %(message)s")
@@ -21,7 +23,9 @@ class PipelineManager:
                  get_fr: bool = True,
                  get_lm: bool = True,
                  get_ba: bool = True,
-                 get_ex: bool = True):
+                 get_ex: bool = True,
+                 tickers: Iterable[str] = None,
+                 bulk_threshold: int = BULK_THRESHOLD):
         self.exch_mgr = exch_mgr
         self._exchanges = self.exch_mgr.exchanges
         self._configs = self.exch_mgr.configs
@@ -33,6 +37,10 @@ class PipelineManager:
         self.get_ba = get_ba
         self.get_ex = get_ex
 
+        # NOTE: None fetches the whole universe, otherwise only these canonical tickers
+        self.tickers = list(tickers) if tickers is not None else None
+        self.bulk_threshold = bulk_threshold
+
         self.pipeline: dict[str, dict[str, dict]] = None
         self.history: pd.DataFrame = None
 
@@ -45,7 +53,10 @@ class PipelineManager:
         ]
         for enabled, fcls in filters:
             if enabled:
-                self.fetcher.add_filter(fcls(self.exch_mgr), enabled=True)
+                self.fetcher.add_filter(fcls(self.exch_mgr,
+                                             tickers=self.tickers,
+                                             bulk_threshold=self.bulk_threshold),
+                                        enabled=True)
 
         self.pipeline = self.fetcher.run()
         self.history = self.fetcher.history
@@ -93,8 +104,11 @@ class PipelineMerger(PipelineManager):
                  get_fr: bool = True,
                  get_lm: bool = True,
                  get_ba: bool = True,
-                 get_ex: bool = True):
-        super().__init__(exch_mgr, get_fr, get_lm, get_ba, get_ex)
+                 get_ex: bool = True,
+                 tickers: Iterable[str] = None,
+                 bulk_threshold: int = BULK_THRESHOLD):
+        super().__init__(exch_mgr, get_fr, get_lm, get_ba, get_ex,
+                         tickers, bulk_threshold)
         self._max_workers = min(
             multiprocessing.cpu_count(), len(self._exchanges))
         self.data_map = None
@@ -105,12 +119,34 @@ class PipelineMerger(PipelineManager):
                       get_fr: bool = True,
                       get_lm: bool = True,
                       get_ba: bool = True,
-                      get_ex: bool = True):
-        inst = cls(exch_mgr, get_fr, get_lm, get_ba, get_ex)
+                      get_ex: bool = True,
+                      export_path: str = None,
+                      tickers: Iterable[str] = None,
+                      bulk_threshold: int = BULK_THRESHOLD):
+        inst = cls(exch_mgr, get_fr, get_lm, get_ba, get_ex,
+                   tickers, bulk_threshold)
         inst.run()
         inst.data_map = inst.multi_exchange_merger()
+        if export_path is not None:
+            inst.export(path=export_path)
         return inst
 
+    @classmethod
+    def point_query(cls,
+                    exch_mgr: ExchangeManager,
+                    tickers: Iterable[str],
+                    bulk_threshold: int = BULK_THRESHOLD):
+        return cls.load_pipeline(exch_mgr=exch_mgr,
+                                 tickers=tickers,
+                                 bulk_threshold=bulk_threshold)
+
+    def export(self, path: str = None, extra: dict = None) -> int:
+        try:
+            return SnapshotWriter(path).write(self.data_map or {}, extra=extra)
+        except Exception as e:
+            logging.error(f"Failed to export snapshot to {path}: {e}")
+            return -1
+
     def _exchange_merger(self,
                          exch_name: str) -> pd.DataFrame:
         if not self.pipeline:
@@ -176,14 +212,4 @@ class PipelineMerger(PipelineManager):
 
     def ticker_finder(self,
                       ticker: str) -> pd.DataFrame:
-        datas = {}
-        for exch_name, df in self.data_map.items():
-            if ticker in df.index:
-                data = df.loc[[ticker]]
-                datas[exch_name] = data
-
-        if not datas:
-            return pd.DataFrame()
-
-        res = pd.concat(datas, names=['exchange', 'ticker'])
-        return res
+        return Tools.find_ticker(self.data_map, ticker)
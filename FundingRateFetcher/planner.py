@@ -0,0 +1,161 @@
+import logging
+import threading
+from typing import Optional
+from dataclasses import dataclass
+
+from tools import Tools
+
+logger = logging.getLogger(__name__)
+
+FUNDING_FIELDS = ('interval', 'fundingTimestamp')
+TICKER_FIELDS = ('bid', 'ask')
+# NOTE: Share of symbols a bulk response must fill before a supplementary endpoint is skipped
+COVERAGE = 0.5
+INTERVAL_KEYS = ('fundInterval', 'fundingInterval', 'funding_interval')
+# NOTE: Venue REST endpoints ccxt does not expose, keyed by the ExceptionFilter method name
+CUSTOM_ENDPOINTS = {
+    'fetchFundingTime': {'bitget'},
+}
+
+
+@dataclass(frozen=True)
+class EndpointPlan:
+    exchange: str
+    funding_rates: str
+    tickers: str
+    bid_ask: Optional[str] = None
+    interval: Optional[str] = None
+    funding_time: Optional[str] = None
+
+    @property
+    def supplements(self) -> list[str]:
+        return [method for method in (self.bid_ask, self.interval, self.funding_time)
+                if method is not None]
+
+
+class EndpointPlanner:
+    _shared = None
+
+    def __init__(self, coverage: float = COVERAGE):
+        self.coverage = coverage
+
+        self._plans: dict[str, EndpointPlan] = {}
+        self._observed: dict[str, dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def shared(cls) -> "EndpointPlanner":
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+
+    @staticmethod
+    def bulk_or_single(exch, bulk: str, single: str) -> str:
+        has = getattr(exch, 'has', None) or {}
+        if has.get(bulk) or not has.get(single):
+            return bulk
+        return single
+
+    def observe(self, exch_name: str, data: dict | None, fields: tuple[str, ...]):
+        if not isinstance(data, dict):
+            return
+
+        entries = [entry for entry in data.values() if isinstance(entry, dict)]
+        if not entries:
+            return
+
+        observed = {
+            field: sum(entry.get(field) is not None for entry in entries) / len(entries)
+            for field in fields
+        }
+        with self._lock:
+            self._observed.setdefault(exch_name, {}).update(observed)
+
+    def _missing(self, exch_name: str, fields: tuple[str, ...]) -> bool:
+        with self._lock:
+            observed = self._observed.get(exch_name, {})
+            return any(field not in observed for field in fields)
+
+    def _covered(self, exch_name: str, field: str) -> bool:
+        with self._lock:
+            return self._observed.get(exch_name, {}).get(field, 0.0) >= self.coverage
+
+    def _probe(self, exch_name: str, exch, endpoint: str, fields: tuple[str, ...]):
+        logger.info(f"[EndpointPlanner] Probing {endpoint} for {exch_name}")
+        params = {'type': 'swap'}
+        if endpoint in ('fetchFundingRate', 'fetchTicker'):
+            markets = Tools.safe_execute(exch.loadMarkets, skip=True) or {}
+            symbol = next((s for s, m in markets.items() if m.get('swap')), None)
+            if symbol is None:
+                return
+            data = Tools.safe_execute(getattr(exch, endpoint), symbol,
+                                      params=params, skip=True)
+            data = {symbol: data} if data else None
+        else:
+            data = Tools.safe_execute(getattr(exch, endpoint),
+                                      params=params, skip=True)
+        self.observe(exch_name, data, fields)
+
+    @staticmethod
+    def _fees_carry_interval(exch) -> bool:
+        fees = Tools.safe_execute(exch.fetchTradingFees,
+                                  params={'type': 'swap'}, skip=True)
+        if not isinstance(fees, dict):
+            return False
+        for fee in fees.values():
+            info = fee.get('info') if isinstance(fee, dict) else None
+            if isinstance(info, dict):
+                return any(key in info for key in INTERVAL_KEYS)
+        return False
+
+    def plan(self, exch_name: str, exch) -> EndpointPlan:
+        with self._lock:
+            plan = self._plans.get(exch_name)
+        if plan is not None:
+            return plan
+
+        has = getattr(exch, 'has', None) or {}
+        funding_rates = self.bulk_or_single(exch, 'fetchFundingRates', 'fetchFundingRate')
+        tickers = self.bulk_or_single(exch, 'fetchTickers', 'fetchTicker')
+
+        # NOTE: The filters observe their own responses, probing only covers a skipped filter
+        for endpoint, fields in ((funding_rates, FUNDING_FIELDS),
+                                 (tickers, TICKER_FIELDS)):
+            if self._missing(exch_name, fields):
+                self._probe(exch_name, exch, endpoint, fields)
+
+        bid_ask = None
+        if not self._covered(exch_name, 'bid') and has.get('fetchBidsAsks'):
+            bid_ask = 'fetchBidsAsks'
+
+        interval = None
+        if not self._covered(exch_name, 'interval'):
+            if has.get('fetchFundingIntervals'):
+                interval = 'fetchFundingIntervals'
+            elif has.get('fetchTradingFees') and self._fees_carry_interval(exch):
+                interval = 'fetchTradingFees'
+
+        funding_time = None
+        if not self._covered(exch_name, 'fundingTimestamp') \
+                and exch_name in CUSTOM_ENDPOINTS['fetchFundingTime']:
+            funding_time = 'fetchFundingTime'
+
+        plan = EndpointPlan(exchange=exch_name,
+                            funding_rates=funding_rates,
+                            tickers=tickers,
+                            bid_ask=bid_ask,
+                            interval=interval,
+                            funding_time=funding_time)
+        logger.info(f"[EndpointPlanner] {plan}")
+        with self._lock:
+            self._plans[exch_name] = plan
+        return plan
+
+    def invalidate(self, exch_name: str = None):
+        with self._lock:
+            if exch_name is None:
+                self._plans.clear()
+                self._observed.clear()
+            else:
+                self._plans.pop(exch_name, None)
+                self._observed.pop(exch_name, None)
@@ -0,0 +1,131 @@
+import logging
+import numpy as np
+import pandas as pd
+from itertools import permutations
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HORIZONS = (8, 24, 72, 168)
+
+
+class FundingProjection:
+    def __init__(self,
+                 slots: pd.DatetimeIndex,
+                 tickers: pd.Index,
+                 venues: pd.MultiIndex,
+                 cube: np.ndarray):
+        self.slots = slots
+        self.tickers = tickers
+        self.venues = venues
+        self.cube = cube
+
+        self.listed = ~np.isnan(cube).all(axis=0)
+        self.cumulative = np.nancumsum(cube, axis=0)
+
+    @classmethod
+    def build(cls,
+              data_map: dict[str, pd.DataFrame],
+              slots: list[pd.Timestamp],
+              tz,
+              tolerance_minutes: int = 5,
+              base_exch: str = None) -> "FundingProjection":
+        slots = pd.DatetimeIndex(slots, name='time')
+        frames = {exch_name: df for exch_name, df in data_map.items()
+                  if isinstance(df, pd.DataFrame) and not df.empty}
+        if not frames or slots.empty:
+            return cls(slots, pd.Index([], name='ticker'),
+                       pd.MultiIndex.from_tuples([], names=['exchange', 'settle']),
+                       np.empty((len(slots), 0, 0)))
+
+        df = pd.concat(frames, names=['exchange'], axis=0)
+        df = df.reset_index(level='exchange').reset_index(drop=True)
+        if base_exch is not None and base_exch in frames:
+            df = df[df['ticker'].isin(frames[base_exch]['ticker'])]
+
+        ts = pd.to_datetime(df['fundingTimestamp'], errors='coerce', utc=True)
+        rate = pd.to_numeric(df['funding_rate'], errors='coerce').to_numpy(dtype=float)
+        interval = pd.to_numeric(df['interval'], errors='coerce').to_numpy(dtype=float)
+
+        # NOTE: Snap each next funding time to its hourly slot, as get_funding_table does
+        offset = ((ts - slots[0].tz_convert('UTC')) /
+                  pd.Timedelta(hours=1)).to_numpy(dtype=float)
+        first = np.clip(np.round(offset), 0, len(slots) - 1)
+        valid = ~np.isnan(offset) & ~np.isnan(rate) & \
+            (np.abs(offset - first) * 60 <= tolerance_minutes)
+        first = np.nan_to_num(first).astype(int)
+
+        # NOTE: Repeat every interval hours, non-integer intervals only pay on the first slot
+        whole = (interval > 0) & (interval == np.round(interval))
+        step = np.where(whole, np.nan_to_num(interval), len(slots)).astype(int)
+        since = np.arange(len(slots))[:, None] - first[None, :]
+        paid = (since >= 0) & (since % step[None, :] == 0) & valid[None, :]
+
+        tickers, t_codes = np.unique(df['ticker'].to_numpy(dtype=str), return_inverse=True)
+        venue_keys = list(zip(df['exchange'], df['settle'].astype(str)))
+        venues = pd.MultiIndex.from_tuples(sorted(set(venue_keys)),
+                                           names=['exchange', 'settle'])
+        v_codes = venues.get_indexer(venue_keys)
+
+        cube = np.full((len(slots), len(tickers), len(venues)), np.nan)
+        rows = np.flatnonzero(valid)
+        # NOTE: One rate per (ticker, venue) cell. Keep the latest funding time
+        # rather than whichever duplicate the scatter happens to write last
+        rows = rows[np.lexsort((offset[rows], v_codes[rows], t_codes[rows]))]
+        cell = t_codes[rows] * len(venues) + v_codes[rows]
+        latest = np.ones(len(rows), dtype=bool)
+        latest[:-1] = cell[1:] != cell[:-1]
+        if not latest.all():
+            logger.warning(
+                f"Dropped {int((~latest).sum())} duplicate (ticker, venue) funding rows")
+        rows = rows[latest]
+        cube[:, t_codes[rows], v_codes[rows]] = np.where(
+            paid[:, rows], rate[rows][None, :], 0.0)
+
+        logger.info(
+            f"Built funding projection {cube.shape} from {len(rows)}/{len(df)} rows")
+        return cls(slots.tz_convert(tz),
+                   pd.Index(tickers, name='ticker'),
+                   venues,
+                   cube)
+
+    def _slot_count(self, hours: int) -> int:
+        return max(0, min(int(hours), len(self.slots)))
+
+    def window(self, hours: int) -> np.ndarray:
+        return self.cube[:self._slot_count(hours)]
+
+    def horizon(self, hours: int) -> pd.DataFrame:
+        n = self._slot_count(hours)
+        if n == 0 or self.cube.size == 0:
+            return pd.DataFrame(index=self.tickers, columns=self.venues, dtype=float)
+        total = np.where(self.listed, self.cumulative[n - 1], np.nan)
+        return pd.DataFrame(total, index=self.tickers, columns=self.venues)
+
+    def pair_table(self,
+                   horizons: tuple[int, ...] = DEFAULT_HORIZONS) -> pd.DataFrame:
+        if self.cube.size == 0 or len(self.venues) < 2:
+            return pd.DataFrame()
+
+        totals = np.stack([np.where(self.listed,
+                                    self.cumulative[max(self._slot_count(h), 1) - 1],
+                                    np.nan)
+                           for h in horizons])
+
+        v1, v2 = map(np.array, zip(*permutations(range(len(self.venues)), 2)))
+        diff = totals[:, :, v1] - totals[:, :, v2]
+        both = self.listed[:, v1] & self.listed[:, v2]
+        t_idx, p_idx = np.nonzero(both)
+        if len(t_idx) == 0:
+            return pd.DataFrame()
+
+        leg1 = self.venues[v1[p_idx]]
+        leg2 = self.venues[v2[p_idx]]
+        index = pd.MultiIndex.from_arrays(
+            [self.tickers[t_idx],
+             leg1.get_level_values('exchange'), leg1.get_level_values('settle'),
+             leg2.get_level_values('exchange'), leg2.get_level_values('settle')],
+            names=['ticker', 'exch1', 'settle1', 'exch2', 'settle2'])
+
+        return pd.DataFrame(diff[:, t_idx, p_idx].T,
+                            index=index,
+                            columns=[f"{h}h" for h in horizons])
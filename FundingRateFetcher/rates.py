@@ -0,0 +1,145 @@
+import time
+import logging
+import threading
+import multiprocessing
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from tools import Tools
+
+logger = logging.getLogger(__name__)
+
+
+class ConvertRateService:
+    _shared = None
+
+    def __init__(self,
+                 symbol: str = 'USDC/USDT',
+                 ttl: float = 60.0,
+                 unsupported_ttl: float = 3600.0,
+                 derive: bool = True):
+        self.symbol = symbol
+        self.ttl = ttl
+        self.unsupported_ttl = unsupported_ttl
+        self.derive = derive
+
+        self._rates: dict[str, tuple[float, dict]] = {}
+        self._unsupported: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def shared(cls) -> "ConvertRateService":
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+
+    def _cached(self, exch_name: str, now: float) -> dict | None:
+        with self._lock:
+            entry = self._rates.get(exch_name)
+            if entry is not None and now - entry[0] < self.ttl:
+                return entry[1]
+
+            marked = self._unsupported.get(exch_name)
+            if marked is not None and now - marked < self.unsupported_ttl:
+                return {}
+        return None
+
+    def _store(self, exch_name: str, rates: dict, now: float):
+        with self._lock:
+            if rates:
+                self._rates[exch_name] = (now, rates)
+                self._unsupported.pop(exch_name, None)
+            else:
+                self._unsupported[exch_name] = now
+                self._rates.pop(exch_name, None)
+
+    def _derive(self, tickers: dict | None) -> dict:
+        if not tickers:
+            return {}
+
+        bids = tickers.get('bid')
+        asks = tickers.get('ask')
+        if bids is None or asks is None:
+            return {}
+
+        candidates = [s for s in bids.index
+                      if s == self.symbol or str(s).startswith(f"{self.symbol}:")]
+        for symbol in candidates:
+            bid = bids.get(symbol)
+            ask = asks.get(symbol)
+            if pd.notna(bid) and pd.notna(ask):
+                return {'symbol': symbol, 'bid': bid, 'ask': ask}
+        return {}
+
+    def _is_listed(self, exch) -> bool | None:
+        markets = getattr(exch, 'markets', None)
+        if not markets:
+            return None
+        return self.symbol in markets
+
+    def _fetch(self, exch_name: str, exch) -> tuple[str, dict | None]:
+        listed = self._is_listed(exch)
+        if listed is False:
+            logger.info(f"{self.symbol} is not listed on {exch_name}")
+            return exch_name, {}
+
+        ticker = Tools.safe_execute(exch.fetchTicker,
+                                    symbol=self.symbol,
+                                    skip=True)
+        if ticker is None:
+            # NOTE: A listed pair failing is transient; only unknown listings are negative cached
+            return exch_name, None if listed else {}
+        return exch_name, {
+            'symbol': ticker['symbol'],
+            'bid': ticker['bid'],
+            'ask': ticker['ask']
+        }
+
+    def get_rates(self,
+                  exchanges: dict,
+                  tickers: dict[str, dict] = None) -> dict[str, dict]:
+        now = time.monotonic()
+        tickers = tickers or {}
+
+        snapshot = {}
+        pending = {}
+        for exch_name in exchanges:
+            if self.derive:
+                derived = self._derive(tickers.get(exch_name))
+                if derived:
+                    self._store(exch_name, derived, now)
+                    snapshot[exch_name] = derived
+                    continue
+
+            cached = self._cached(exch_name, now)
+            if cached is not None:
+                snapshot[exch_name] = cached
+                continue
+
+            pending[exch_name] = exchanges[exch_name]
+
+        if not pending:
+            return snapshot
+
+        max_workers = min(multiprocessing.cpu_count(), len(pending))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(self._fetch, exch_name, exch)
+                       for exch_name, exch in pending.items()]
+
+            for f in as_completed(futures):
+                exch_name, result_dict = f.result()
+                if result_dict is None:
+                    snapshot[exch_name] = {}
+                    continue
+                self._store(exch_name, result_dict, time.monotonic())
+                snapshot[exch_name] = result_dict
+        return snapshot
+
+    def invalidate(self, exch_name: str = None):
+        with self._lock:
+            if exch_name is None:
+                self._rates.clear()
+                self._unsupported.clear()
+            else:
+                self._rates.pop(exch_name, None)
+                self._unsupported.pop(exch_name, None)
@@ -0,0 +1,151 @@
+import time
+import asyncio
+import logging
+import datetime
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Optional
+
+from signals import OpportunitySet, SignalBus
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    snapshot_id: int
+    viewer: Any
+    created_at: datetime.datetime
+    duration: float
+
+    @property
+    def age(self) -> float:
+        return (datetime.datetime.now() - self.created_at).total_seconds()
+
+
+class RefreshCoordinator:
+    def __init__(self,
+                 build: Callable[[], Any],
+                 store: dict,
+                 key: str = "snapshot",
+                 bus: SignalBus = None,
+                 signal_k: int | None = None):
+        self._build = build
+        self._store = store
+        self._key = key
+        self._bus = bus
+        self._signal_k = signal_k
+
+        self._inflight: Optional[asyncio.Future] = None
+        self._task: Optional[asyncio.Task] = None
+        # NOTE: Seed ids from startup epoch ms so ids from a previous boot
+        # (e.g. in old Telegram buttons) never resolve to a new snapshot
+        self._seq = int(time.time() * 1000)
+        self.last_duration: Optional[float] = None
+
+    @property
+    def snapshot(self) -> Optional[Snapshot]:
+        return self._store.get(self._key)
+
+    @property
+    def refreshing(self) -> bool:
+        return self._inflight is not None and not self._inflight.done()
+
+    def _build_snapshot(self, snapshot_id: int) -> tuple[Any, Optional[OpportunitySet]]:
+        viewer = self._build()
+        if self._bus is None:
+            return viewer, None
+        try:
+            # NOTE: Ranked in the same worker thread, the ranking is cached on the
+            # viewer so the bot's table render reuses it instead of a second pass
+            return viewer, OpportunitySet.from_viewer(viewer, snapshot_id, self._signal_k)
+        except Exception as e:
+            logger.error(f"Signal build error: {e}")
+            return viewer, None
+
+    async def _run_refresh(self) -> Snapshot:
+        logger.info(
+            "Updating data (ExchangeManager -> PipelineMerger -> TableViewer) ...")
+        # NOTE: One refresh in flight at a time, a failed build only skips an id
+        self._seq += 1
+        snapshot_id = self._seq
+        start = time.perf_counter()
+        viewer, signal = await asyncio.to_thread(self._build_snapshot, snapshot_id)
+        duration = time.perf_counter() - start
+
+        snapshot = Snapshot(snapshot_id=snapshot_id,
+                            viewer=viewer,
+                            created_at=datetime.datetime.now(),
+                            duration=duration)
+        # NOTE: Single assignment, readers see either the old or the new snapshot
+        self._store[self._key] = snapshot
+        self.last_duration = duration
+        logger.info(
+            f"Update done: snapshot={snapshot.snapshot_id} duration={duration:.2f}s")
+
+        if signal is not None:
+            try:
+                self._bus.publish(signal)
+            except Exception as e:
+                logger.error(f"Signal publish error: {e}")
+        return snapshot
+
+    async def refresh(self) -> Snapshot:
+        if not self.refreshing:
+            self._inflight = asyncio.ensure_future(self._run_refresh())
+        # NOTE: Shield so a cancelled waiter does not cancel the shared refresh
+        return await asyncio.shield(self._inflight)
+
+    async def current(self) -> Snapshot:
+        snapshot = self.snapshot
+        if snapshot is None:
+            snapshot = await self.refresh()
+        return snapshot
+
+    async def _loop(self,
+                    interval: float,
+                    on_snapshot: Callable[[Snapshot], Awaitable[None]] | None,
+                    first_delay: float):
+        if self.snapshot is None:
+            try:
+                await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # NOTE: A failed startup fetch must not kill the loop, retry on schedule
+                logger.error(f"Initial refresh error: {e}")
+        await asyncio.sleep(first_delay)
+
+        while True:
+            started = time.monotonic()
+            try:
+                snapshot = await self.refresh()
+                if on_snapshot is not None:
+                    await on_snapshot(snapshot)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Refresh loop error: {e}")
+
+            elapsed = time.monotonic() - started
+            if elapsed > interval:
+                logger.warning(
+                    f"Refresh cycle took {elapsed:.2f}s, longer than interval {interval}s")
+            await asyncio.sleep(max(0.0, interval - elapsed))
+
+    def start(self,
+              interval: float = 60,
+              on_snapshot: Callable[[Snapshot], Awaitable[None]] | None = None,
+              first_delay: float = 0.0) -> asyncio.Task:
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(
+                self._loop(interval, on_snapshot, first_delay))
+        return self._task
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
@@ -0,0 +1,117 @@
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from refresh import Snapshot
+
+logger = logging.getLogger(__name__)
+
+DETAIL_PREFIX = "DETAIL"
+
+
+def escape_md(text: str) -> str:
+    text = text.replace("\\", "\\\\")
+    text = text.replace("`", "\\`")
+    text = text.replace("_", "\\_")
+    return text
+
+
+def code_block(text: str) -> str:
+    return f"```\n{escape_md(text)}\n```"
+
+
+def detail_data(snapshot_id: int, row_idx: int) -> str:
+    return f"{DETAIL_PREFIX}|{snapshot_id}|{row_idx}"
+
+
+def parse_detail_data(data: str) -> tuple[int, int] | None:
+    parts = data.split("|")
+    if len(parts) != 3 or parts[0] != DETAIL_PREFIX:
+        return None
+    try:
+        return int(parts[1]), int(parts[2])
+    except ValueError:
+        return None
+
+
+@dataclass(frozen=True)
+class RenderedSnapshot:
+    snapshot_id: int
+    table: str
+    buttons: tuple[tuple[str, str], ...]
+    details: tuple[str, ...]
+
+    @property
+    def empty(self) -> bool:
+        return not self.details
+
+    @property
+    def visible(self) -> tuple:
+        return self.table, tuple(label for label, _ in self.buttons)
+
+    def detail(self, row_idx: int) -> str | None:
+        if 0 <= row_idx < len(self.details):
+            return self.details[row_idx]
+        return None
+
+
+def render_snapshot(snapshot: Snapshot, k: int = 10) -> RenderedSnapshot:
+    df = snapshot.viewer.top_opportunities(k=k)
+    if df.empty:
+        return RenderedSnapshot(snapshot_id=snapshot.snapshot_id,
+                                table="=== Table is empty ===",
+                                buttons=(),
+                                details=())
+
+    df = df.reset_index(drop=False)
+    df_msg = df[["ticker", "exch1", "exch2", "ER"]].copy()
+    df_msg["ER"] = df_msg["ER"].round(4)
+    table = code_block(df_msg.to_markdown(tablefmt="pipe", index=False))
+
+    buttons = []
+    details = []
+    for idx, row in enumerate(df.itertuples(index=False)):
+        buttons.append((f"{row.ticker} / {row.exch1} / {row.exch2}",
+                        detail_data(snapshot.snapshot_id, idx)))
+        detail_str = df.iloc[[idx]].to_markdown(tablefmt="pipe", index=False)
+        details.append(code_block(detail_str))
+
+    return RenderedSnapshot(snapshot_id=snapshot.snapshot_id,
+                            table=table,
+                            buttons=tuple(buttons),
+                            details=tuple(details))
+
+
+class RenderCache:
+    def __init__(self, k: int = 10, max_snapshots: int = 30):
+        self.k = k
+        self.max_snapshots = max_snapshots
+        self._rendered: OrderedDict[int, RenderedSnapshot] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, snapshot_id: int) -> RenderedSnapshot | None:
+        with self._lock:
+            return self._rendered.get(snapshot_id)
+
+    def render(self, snapshot: Snapshot) -> RenderedSnapshot:
+        rendered = self.get(snapshot.snapshot_id)
+        if rendered is not None:
+            return rendered
+
+        rendered = render_snapshot(snapshot, k=self.k)
+        with self._lock:
+            if self._rendered:
+                # NOTE: The outbox does not re-send an unchanged table, so the id it
+                # shows (the oldest one with this content) is pointed at the newest rows
+                last = next(reversed(self._rendered.values()))
+                if last.visible == rendered.visible:
+                    shown = next(i for i, r in self._rendered.items() if r is last)
+                    self._rendered[shown] = rendered
+                    self._rendered.move_to_end(shown)
+            self._rendered[snapshot.snapshot_id] = rendered
+            while len(self._rendered) > self.max_snapshots:
+                self._rendered.popitem(last=False)
+        logger.info(
+            f"Rendered snapshot {snapshot.snapshot_id} ({len(rendered.details)} rows)")
+        return rendered
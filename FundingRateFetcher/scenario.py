@@ -0,0 +1,156 @@
+import logging
+import numpy as np
+import pandas as pd
+from typing import NamedTuple
+
+from table import TableViewer
+
+logger = logging.getLogger(__name__)
+
+
+class FeeScenario(NamedTuple):
+    name: str
+    fees: dict[str, dict[str, float]] | None = None
+
+
+class ScenarioEvaluator:
+    def __init__(self, viewer: TableViewer):
+        self.viewer = viewer
+
+    def _depth_map(self) -> pd.DataFrame:
+        frames = {exch_name: df for exch_name, df in self.viewer.data_map.items()
+                  if isinstance(df, pd.DataFrame) and not df.empty}
+        if not frames:
+            return pd.DataFrame(columns=['min_order_value', 'bid_depth', 'ask_depth'])
+
+        df = pd.concat(frames, names=['exchange'], axis=0)
+        df = df.reset_index(level='exchange').set_index(['exchange', 'symbol'])
+
+        # NOTE: bid/ask were divided by the numerical prefix (1000PEPE -> PEPE), volumes were not
+        prefix = pd.to_numeric(df['ticker_prev'].str.extract(
+            r'^(\d+)[A-Za-z]+$')[0], errors='coerce')
+        factor = prefix.where(prefix >= 10, 1).fillna(1).to_numpy()
+
+        def _col(name: str) -> np.ndarray:
+            if name not in df.columns:
+                return np.full(len(df), np.nan)
+            return pd.to_numeric(df[name], errors='coerce').to_numpy(dtype=float)
+
+        return pd.DataFrame({
+            'min_order_value': _col('min_order_value'),
+            'bid_depth': _col('bid') * factor * _col('bid_volume'),
+            'ask_depth': _col('ask') * factor * _col('ask_volume')
+        }, index=df.index)
+
+    def _lookup(self, depth: pd.DataFrame, exch: pd.Series,
+                symbol: pd.Series, col: str) -> np.ndarray:
+        keys = pd.MultiIndex.from_arrays([exch, symbol])
+        return depth[col].reindex(keys).to_numpy(dtype=float)
+
+    def evaluate(self,
+                 scenarios: list[FeeScenario],
+                 notionals: list[float],
+                 pairs: pd.DataFrame = None) -> pd.DataFrame:
+        if pairs is None:
+            pairs = self.viewer.get_pair_table(interval_equals=True,
+                                               pos_exists=True,
+                                               fr_mgmt=True)
+        if pairs.empty:
+            return pd.DataFrame()
+        if not scenarios:
+            scenarios = [FeeScenario('public')]
+
+        notionals = np.asarray(notionals, dtype=float)
+        long1 = (pairs['pos1'] == 'L').to_numpy()
+
+        def _legs(col: str) -> tuple[np.ndarray, np.ndarray]:
+            v1 = pd.to_numeric(pairs[f'{col}1'], errors='coerce').to_numpy(dtype=float)
+            v2 = pd.to_numeric(pairs[f'{col}2'], errors='coerce').to_numpy(dtype=float)
+            return np.where(long1, v1, v2), np.where(long1, v2, v1)
+
+        l_bid, s_bid = _legs('bid')
+        l_ask, s_ask = _legs('ask')
+        l_maker, s_maker = _legs('maker')
+        l_taker, s_taker = _legs('taker')
+
+        l_exch = np.where(long1, pairs['exch1'], pairs['exch2'])
+        s_exch = np.where(long1, pairs['exch2'], pairs['exch1'])
+        l_symbol = np.where(long1, pairs['symbol1'], pairs['symbol2'])
+        s_symbol = np.where(long1, pairs['symbol2'], pairs['symbol1'])
+
+        codes, uniques = pd.factorize(np.concatenate([l_exch, s_exch]))
+        exchanges = pd.Index(uniques)
+        l_code, s_code = codes[:len(pairs)], codes[len(pairs):]
+
+        # NOTE: (scenario x exchange) override tables, NaN keeps the public fee
+        maker_tab = np.full((len(scenarios), len(exchanges)), np.nan)
+        taker_tab = np.full((len(scenarios), len(exchanges)), np.nan)
+        for i, scenario in enumerate(scenarios):
+            for exch_name, fee in (scenario.fees or {}).items():
+                if exch_name not in exchanges:
+                    continue
+                j = exchanges.get_loc(exch_name)
+                maker_tab[i, j] = fee.get('maker', np.nan)
+                taker_tab[i, j] = fee.get('taker', np.nan)
+
+        def _fees(tab: np.ndarray, code: np.ndarray, base: np.ndarray) -> np.ndarray:
+            over = tab[:, code]
+            return np.where(np.isnan(over), base[None, :], over)
+
+        lm, lt = _fees(maker_tab, l_code, l_maker), _fees(taker_tab, l_code, l_taker)
+        sm, st = _fees(maker_tab, s_code, s_maker), _fees(taker_tab, s_code, s_taker)
+
+        # NOTE: Same legs as TableViewer._calc_pi, evaluated on (scenario x pair)
+        lmst = (pairs['tm'] == 'LmSt').to_numpy()[None, :]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            eff_l = np.where(lmst, l_bid * (1 - lm), l_ask * (1 + lt))
+            eff_s = np.where(lmst, s_bid * (1 - st), s_ask * (1 + sm))
+            pi = (eff_s - eff_l) / eff_l
+        er = -pd.to_numeric(pairs['diff']).to_numpy(dtype=float)[None, :] + pi
+
+        # NOTE: Taker leg consumes top of book, LmSt sells the short bid, LtSm lifts the long ask
+        depth = self._depth_map()
+        taker_depth = np.where(lmst[0],
+                               self._lookup(depth, s_exch, s_symbol, 'bid_depth'),
+                               self._lookup(depth, l_exch, l_symbol, 'ask_depth'))
+        min_order = np.fmax(self._lookup(depth, l_exch, l_symbol, 'min_order_value'),
+                            self._lookup(depth, s_exch, s_symbol, 'min_order_value'))
+        min_order = np.nan_to_num(min_order, nan=0.0)
+
+        feasible = (notionals[:, None] >= min_order[None, :]) & \
+            ~(notionals[:, None] > taker_depth[None, :])
+        pnl = er[:, None, :] * notionals[None, :, None]
+
+        n_s, n_n, n_p = len(scenarios), len(notionals), len(pairs)
+        blocks = {
+            'ER': np.broadcast_to(er[:, None, :], (n_s, n_n, n_p)),
+            'PnL': pnl,
+            'feasible': np.broadcast_to(feasible[None, :, :], (n_s, n_n, n_p))
+        }
+        columns = pd.MultiIndex.from_product(
+            [[s.name for s in scenarios], notionals], names=['scenario', 'notional'])
+        index = pd.MultiIndex.from_frame(
+            pairs[['ticker', 'exch1', 'exch2', 'symbol1', 'symbol2', 'tm']])
+
+        res = pd.concat({
+            field: pd.DataFrame(block.reshape(n_s * n_n, n_p).T,
+                                index=index, columns=columns)
+            for field, block in blocks.items()
+        }, axis=1, names=['field'])
+        return res
+
+    def rank(self,
+             scenarios: list[FeeScenario],
+             notionals: list[float],
+             scenario: str,
+             notional: float,
+             k: int | None = None) -> pd.DataFrame:
+        res = self.evaluate(scenarios, notionals)
+        if res.empty:
+            return res
+
+        er = res[('ER', scenario, notional)]
+        feasible = res[('feasible', scenario, notional)].astype(bool)
+        pnl = res[('PnL', scenario, notional)].where(feasible)
+        order = TableViewer._top_k_positions(pnl.to_numpy(), k)
+        return pd.DataFrame({'ER': er, 'PnL': pnl, 'feasible': feasible}).iloc[order]
@@ -18,6 +18,12 @@ from tools import Tools
 from exchange import ExchangeManager
 from pipeline import PipelineMerger
 from table import TableViewer
+from refresh import RefreshCoordinator, Snapshot
+from render import RenderCache, RenderedSnapshot, parse_detail_data
+from incremental import IncrementalPairTable
+from subscription import SubscriptionEngine, SubKind
+from outbox import Outbox
+from signals import SignalBus
 
 logging.basicConfig(
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
@@ -27,6 +33,9 @@ logging.basicConfig(
 config = Tools.load_config("config.json")
 alphawave_bot = config.get("alphawave_bot_token")
 alphawave_group_chat_id = config.get("alphawave_group_chat_id")
+alphawave_push_table = config.get("alphawave_push_table", False)
+
+TABLE_SIZE = 10
 
 
 def create_viewer(**kwargs) -> TableViewer:
@@ -34,46 +43,56 @@ def create_viewer(**kwargs) -> TableViewer:
     pipeline = PipelineMerger.load_pipeline(
         exch_mgr=exch_mgr, get_fr=True, get_lm=True, get_ba=True
     )
-    return TableViewer(
+    viewer = TableViewer(
         exch_mgr=exch_mgr,
         pipeline=pipeline,
         data_map=pipeline.data_map,
         base_exch=kwargs.get("exch_name", "hyperliquid"),
         timezone=kwargs.get("tz", "Asia/Seoul")
     )
+    viewer.export_snapshot()
+    return viewer
 
 
-def escape_md(text: str) -> str:
-    text = text.replace("\\", "\\\\")
-    text = text.replace("`", "\\`")
-    text = text.replace("_", "\\_")
-    return text
+def get_refresher(context: ContextTypes.DEFAULT_TYPE) -> RefreshCoordinator:
+    return context.application.bot_data["refresher"]
 
 
-async def do_update(context: ContextTypes.DEFAULT_TYPE):
-    logging.info(
-        "Updating data (ExchangeManager -> PipelineMerger -> TableViewer) ...")
-    viewer = await asyncio.to_thread(create_viewer)
-    context.application.bot_data["viewer"] = viewer
-    logging.info("Update done.")
+def get_outbox(context: ContextTypes.DEFAULT_TYPE) -> Outbox:
+    return context.application.bot_data["outbox"]
 
 
-async def job_update(context: ContextTypes.DEFAULT_TYPE):
-    await do_update(context)
-    next_run = datetime.datetime.now() + datetime.timedelta(minutes=1)
-    msg = f"Updating: estimated: {next_run.strftime('%Y-%m-%d %H:%M:%S')}"
-    await context.bot.send_message(
+async def get_rendered(bot_data: dict, snapshot: Snapshot) -> RenderedSnapshot:
+    renders: RenderCache = bot_data["renders"]
+    rendered = renders.get(snapshot.snapshot_id)
+    if rendered is None:
+        rendered = await asyncio.to_thread(renders.render, snapshot)
+    return rendered
+
+
+async def cmd_update(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    snapshot = await get_refresher(context).refresh()
+    get_outbox(context).send(
         chat_id=alphawave_group_chat_id,
-        text=msg
+        text=f"Data has been updated manually ({snapshot.duration:.1f}s)."
     )
-    logging.info(msg)
 
 
-async def cmd_update(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    await do_update(context)
-    await context.bot.send_message(
+async def cmd_status(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    refresher = get_refresher(context)
+    snapshot = refresher.snapshot
+    if snapshot is None:
+        text = "No snapshot yet."
+    else:
+        text = (
+            f"Snapshot #{snapshot.snapshot_id}\n"
+            f"Age: {snapshot.age:.0f}s\n"
+            f"Last refresh: {refresher.last_duration:.1f}s\n"
+            f"Refreshing: {'yes' if refresher.refreshing else 'no'}"
+        )
+    get_outbox(context).send(
         chat_id=alphawave_group_chat_id,
-        text="Data has been updated manually."
+        text=text
     )
 
 
@@ -82,10 +101,12 @@ async def cmd_start(update: Update, context: ContextTypes.DEFAULT_TYPE):
         "Hello! Available commands:\n"
         "/table - Show table (ticker/exch1/exch2/ER) with details on click\n"
         "/update - Manually re-load data\n"
+        "/status - Show snapshot age and last refresh duration\n"
+        "/subscribe - Get alerts on ER, funding diff or top-K changes\n"
         "/help - Show usage instructions\n\n"
         "Data automatically updates every 1 minute."
     )
-    await context.bot.send_message(
+    get_outbox(context).send(
         chat_id=alphawave_group_chat_id,
         text=message_text
     )
@@ -96,142 +117,203 @@ async def cmd_help(update: Update, context: ContextTypes.DEFAULT_TYPE):
         "Command Reference:\n"
         "/table - Retrieves simplified table. Click ticker/exch1/exch2 for details.\n"
         "/update - Forces an immediate data update\n"
+        "/status - Shows snapshot age and last refresh duration\n"
+        "/subscribe er <ticker> <level> [exch ...] - Alert when ER rises above level\n"
+        "/subscribe diff <ticker> <exch1> <exch2> <level> - Alert when funding diff crosses level\n"
+        "/subscribe top <k> - Alert when a new pair enters the top k\n"
+        "/unsubscribe <id> - Removes a subscription\n"
+        "/subscriptions - Lists your subscriptions\n"
         "/help - Displays help message\n\n"
         "Data automatically updates every 1 minute."
     )
-    await context.bot.send_message(
+    get_outbox(context).send(
         chat_id=alphawave_group_chat_id,
         text=help_text
     )
 
 
+def parse_subscription(args: list[str]) -> dict:
+    if not args:
+        raise ValueError("Missing subscription type")
+
+    kind = SubKind(args[0].lower())
+    if kind == SubKind.TOP_K:
+        return {'kind': kind, 'level': int(args[1])}
+    if kind == SubKind.ER_ABOVE:
+        return {'kind': kind, 'ticker': args[1], 'level': float(args[2]),
+                'exchanges': tuple(args[3:])}
+    return {'kind': kind, 'ticker': args[1], 'level': float(args[4]),
+            'exchanges': (args[2], args[3])}
+
+
+async def cmd_subscribe(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    engine: SubscriptionEngine = context.bot_data["subs"]
+    chat_id = update.effective_chat.id
+    try:
+        sub = engine.add(chat_id=chat_id, **parse_subscription(context.args))
+        text = f"Subscribed: {sub.describe()}"
+    except (ValueError, IndexError) as e:
+        text = f"Invalid subscription: {e}. See /help."
+
+    get_outbox(context).send(chat_id=chat_id, text=text)
+
+
+async def cmd_unsubscribe(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    engine: SubscriptionEngine = context.bot_data["subs"]
+    chat_id = update.effective_chat.id
+    try:
+        sub_id = int(context.args[0])
+    except (ValueError, IndexError):
+        get_outbox(context).send(chat_id=chat_id,
+                                 text="Usage: /unsubscribe <id>")
+        return
+
+    removed = engine.remove(sub_id, chat_id=chat_id)
+    text = f"Removed #{sub_id}" if removed else f"No subscription #{sub_id}"
+    get_outbox(context).send(chat_id=chat_id, text=text)
+
+
+async def cmd_subscriptions(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    engine: SubscriptionEngine = context.bot_data["subs"]
+    chat_id = update.effective_chat.id
+    subs = engine.subscriptions(chat_id=chat_id)
+    text = "\n".join(sub.describe() for sub in subs) if subs \
+        else "No subscriptions."
+    get_outbox(context).send(chat_id=chat_id, text=text)
+
+
 async def cmd_table(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    await send_table(context)
+    snapshot = await get_refresher(context).current()
+    await send_table(get_outbox(context), context.bot_data, snapshot)
 
 
 async def detail_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
     query = update.callback_query
     await query.answer()
 
-    data = query.data
-    if not data.startswith("DETAIL|"):
+    parsed = parse_detail_data(query.data)
+    if parsed is None:
         return
 
-    row_idx_str = data.split("|")[1]
-    try:
-        row_idx = int(row_idx_str)
-    except ValueError:
-        await context.bot.send_message(
+    snapshot_id, row_idx = parsed
+    renders: RenderCache = context.bot_data["renders"]
+    rendered = renders.get(snapshot_id)
+    if rendered is None:
+        get_outbox(context).send(
             chat_id=alphawave_group_chat_id,
-            text=f"Invalid row index: {row_idx_str}"
+            text=f"Table #{snapshot_id} has expired. Use /table for the latest one."
         )
         return
 
-    viewer: TableViewer = context.bot_data.get("viewer")
-    if not viewer:
-        await do_update(context)
-        viewer = context.bot_data["viewer"]
-
-    df = viewer.get_table
-    df.reset_index(drop=True, inplace=True)
-
-    if row_idx < 0 or row_idx >= len(df):
-        await context.bot.send_message(
+    msg_detail = rendered.detail(row_idx)
+    if msg_detail is None:
+        get_outbox(context).send(
             chat_id=alphawave_group_chat_id,
             text=f"Row index out of range: {row_idx}"
         )
         return
 
-    row_df = df.iloc[[row_idx]].copy()
-    detail_str = row_df.to_markdown(tablefmt="pipe", index=False)
-    detail = escape_md(detail_str)
-    msg_detail = f"```\n{detail}\n```"
-
-    await context.bot.send_message(
+    get_outbox(context).send(
         chat_id=alphawave_group_chat_id,
         text=msg_detail,
         parse_mode="Markdown"
     )
 
 
-async def send_table(context: ContextTypes.DEFAULT_TYPE):
-    viewer: TableViewer = context.bot_data.get("viewer")
-    if not viewer:
-        await do_update(context)
-        viewer = context.bot_data["viewer"]
-
-    df = viewer.get_table
-    if df.empty:
-        await context.bot.send_message(
+async def send_table(outbox: Outbox, bot_data: dict, snapshot: Snapshot,
+                     slot: str = None):
+    rendered = await get_rendered(bot_data, snapshot)
+    if rendered.empty:
+        outbox.send(
             chat_id=alphawave_group_chat_id,
-            text="=== Table is empty ==="
+            text=rendered.table,
+            slot=slot
         )
         return
 
-    df.reset_index(drop=False, inplace=True)
-    df_msg = df.head(10).copy()
-    cols = ["ticker", "exch1", "exch2", "ER"]
-    df_msg = df_msg[cols]
-
-    if "ER" in df_msg.columns:
-        df_msg["ER"] = df_msg["ER"].round(4)
-
-    table_str = df_msg.to_markdown(tablefmt="pipe", index=False)
-    table = escape_md(table_str)
-    msg = f"```\n{table}\n```"
-
-    buttons = []
-    for idx, row in df_msg.iterrows():
-        ticker = str(row.get("ticker", ""))
-        exch1 = str(row.get("exch1", ""))
-        exch2 = str(row.get("exch2", ""))
-        button = f"{ticker} / {exch1} / {exch2}"
-        callback_data = f"DETAIL|{idx}"
-        buttons.append([
-            InlineKeyboardButton(
-                text=button,
-                callback_data=callback_data
-            )
-        ])
-    reply_markup = InlineKeyboardMarkup(buttons)
-
-    await context.bot.send_message(
+    reply_markup = InlineKeyboardMarkup([
+        [InlineKeyboardButton(text=label, callback_data=data)]
+        for label, data in rendered.buttons
+    ])
+
+    outbox.send(
         chat_id=alphawave_group_chat_id,
-        text=msg,
+        text=rendered.table,
         parse_mode="Markdown",
-        reply_markup=reply_markup
+        reply_markup=reply_markup,
+        slot=slot
     )
 
 
-async def job_table(context: ContextTypes.DEFAULT_TYPE):
-    await do_update(context)
-    await send_table(context)
-    next_run = datetime.datetime.now() + datetime.timedelta(minutes=1)
-    logging.info(
-        f"Updating: estimated: {next_run.strftime('%Y-%m-%d %H:%M:%S')}")
+async def publish_snapshot(app, snapshot: Snapshot):
+    pair_table: IncrementalPairTable = app.bot_data["pairs"]
+    engine: SubscriptionEngine = app.bot_data["subs"]
+    outbox: Outbox = app.bot_data["outbox"]
 
+    pairs = await asyncio.to_thread(pair_table.update, snapshot.viewer)
+    alerts = engine.evaluate(pairs=pairs,
+                             changed=pair_table.changed_tickers,
+                             snapshot_id=snapshot.snapshot_id)
+    for alert in alerts:
+        outbox.send(chat_id=alert.chat_id, text=alert.text)
 
-def main():
-    app = ApplicationBuilder().token(alphawave_bot).build()
+    if not alphawave_push_table:
+        return
 
-    viewer = create_viewer()
-    app.bot_data["viewer"] = viewer
+    await send_table(outbox, app.bot_data, snapshot, slot="table")
+    next_run = datetime.datetime.now() + datetime.timedelta(minutes=1)
+    msg = f"Updating: estimated: {next_run.strftime('%Y-%m-%d %H:%M:%S')}"
+    outbox.send(
+        chat_id=alphawave_group_chat_id,
+        text=msg,
+        slot="status"
+    )
+    logging.info(msg)
 
-    app.add_handler(CommandHandler("start", cmd_start))
-    app.add_handler(CommandHandler("help", cmd_help))
-    app.add_handler(CommandHandler("update", cmd_update))
-    app.add_handler(CommandHandler("table", cmd_table))
-    app.add_handler(CallbackQueryHandler(detail_callback))
 
-    job_queue = app.job_queue
+async def post_init(app):
+    app.bot_data["outbox"] = Outbox(app.bot)
 
     now = datetime.datetime.now()
     next_minute = now.replace(second=0, microsecond=0) + \
         datetime.timedelta(minutes=1)
     first_delay = (next_minute - now).total_seconds()
 
-    job_queue.run_repeating(job_update, interval=60, first=first_delay)
-    job_queue.run_repeating(job_table, interval=60, first=first_delay)
+    refresher: RefreshCoordinator = app.bot_data["refresher"]
+    refresher.start(interval=60,
+                    on_snapshot=lambda snapshot: publish_snapshot(app, snapshot),
+                    first_delay=first_delay)
+
+
+async def post_shutdown(app):
+    await app.bot_data["refresher"].stop()
+    await app.bot_data["outbox"].close()
+
+
+def main():
+    app = ApplicationBuilder().token(alphawave_bot) \
+        .post_init(post_init) \
+        .post_shutdown(post_shutdown) \
+        .build()
+
+    # NOTE: In-process execution subscribers take this same instance from bot_data
+    app.bot_data["signals"] = SignalBus()
+    app.bot_data["refresher"] = RefreshCoordinator(build=create_viewer,
+                                                   store=app.bot_data,
+                                                   bus=app.bot_data["signals"])
+    app.bot_data["renders"] = RenderCache(k=TABLE_SIZE)
+    app.bot_data["pairs"] = IncrementalPairTable()
+    app.bot_data["subs"] = SubscriptionEngine()
+
+    app.add_handler(CommandHandler("start", cmd_start))
+    app.add_handler(CommandHandler("help", cmd_help))
+    app.add_handler(CommandHandler("update", cmd_update))
+    app.add_handler(CommandHandler("status", cmd_status))
+    app.add_handler(CommandHandler("table", cmd_table))
+    app.add_handler(CommandHandler("subscribe", cmd_subscribe))
+    app.add_handler(CommandHandler("unsubscribe", cmd_unsubscribe))
+    app.add_handler(CommandHandler("subscriptions", cmd_subscriptions))
+    app.add_handler(CallbackQueryHandler(detail_callback))
 
     app.run_polling()
 
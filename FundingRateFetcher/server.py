@@ -0,0 +1,328 @@
+import gzip
+import json
+import time
+import hashlib
+import logging
+import argparse
+import datetime
+import threading
+import pandas as pd
+from collections import OrderedDict
+from typing import Callable, Optional
+from urllib.parse import urlparse, parse_qs
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from table import TableViewer, OpportunityFilter
+from refresh import Snapshot
+
+logging.basicConfig(level=logging.INFO,
+                    format="%(asctime)s - %(filename)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+"""
+Local HTTP/JSON service sharing one refreshing pipeline across consumers.
+
+Usage examples:
+- Start the service:
+    python server.py --port 8765 --interval 60
+- Query it:
+    curl localhost:8765/top?k=10&exchanges=binance,bybit
+    curl localhost:8765/funding?hours=8&tolerance=30
+    curl localhost:8765/pairs?snapshot=12
+"""
+
+
+class SnapshotStore:
+    def __init__(self,
+                 build: Callable[[], TableViewer],
+                 interval: float = 60,
+                 keep: int = 10):
+        self._build = build
+        self.interval = interval
+        self.keep = keep
+
+        self._snapshots: OrderedDict[int, Snapshot] = OrderedDict()
+        # NOTE: Seeded from startup epoch ms so ETags from a previous run never match
+        self._seq = int(time.time() * 1000)
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.last_duration: Optional[float] = None
+
+    @property
+    def latest(self) -> Optional[Snapshot]:
+        with self._lock:
+            if not self._snapshots:
+                return None
+            return next(reversed(self._snapshots.values()))
+
+    def get(self, snapshot_id: int) -> Optional[Snapshot]:
+        with self._lock:
+            return self._snapshots.get(snapshot_id)
+
+    def refresh(self) -> Snapshot:
+        seq = self._seq
+        with self._refresh_lock:
+            # NOTE: Callers that queued behind a running refresh reuse its result
+            if self._seq != seq and self.latest is not None:
+                return self.latest
+
+            start = time.perf_counter()
+            viewer = self._build()
+            duration = time.perf_counter() - start
+
+            with self._lock:
+                self._seq += 1
+                snapshot = Snapshot(snapshot_id=self._seq,
+                                    viewer=viewer,
+                                    created_at=datetime.datetime.now(),
+                                    duration=duration)
+                self._snapshots[snapshot.snapshot_id] = snapshot
+                while len(self._snapshots) > self.keep:
+                    self._snapshots.popitem(last=False)
+            self.last_duration = duration
+            logger.info(
+                f"Snapshot {snapshot.snapshot_id} ready in {duration:.2f}s")
+            return snapshot
+
+    def _loop(self):
+        while not self._stop.is_set():
+            started = time.monotonic()
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.error(f"Refresh failed: {e}")
+            self._stop.wait(max(0.0, self.interval - (time.monotonic() - started)))
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+
+def _split(values: list[str] | None) -> list[str] | None:
+    if not values:
+        return None
+    return [v for value in values for v in value.split(",") if v]
+
+
+def _first(query: dict, name: str, cast, default):
+    values = query.get(name)
+    return cast(values[0]) if values else default
+
+
+def query_info(viewer: TableViewer, query: dict) -> pd.DataFrame:
+    return viewer.get_info_table.reset_index()
+
+
+def query_funding(viewer: TableViewer, query: dict) -> pd.DataFrame:
+    table = viewer.get_funding_table(
+        hours_ahead=_first(query, "hours", int, 8),
+        tolerance_minutes=_first(query, "tolerance", int, 5))
+    if table.empty:
+        return pd.DataFrame()
+    return table.melt(ignore_index=False, value_name="funding_rate") \
+        .dropna(subset=["funding_rate"]).reset_index()
+
+
+def query_pairs(viewer: TableViewer, query: dict) -> pd.DataFrame:
+    return viewer.get_pair_table(
+        interval_equals=_first(query, "interval_equals", lambda v: v != "0", True),
+        pos_exists=_first(query, "pos_exists", lambda v: v != "0", True),
+        fr_mgmt=_first(query, "fr_mgmt", lambda v: v != "0", True))
+
+
+def query_top(viewer: TableViewer, query: dict) -> pd.DataFrame:
+    filters = OpportunityFilter(
+        min_quote_volume=_first(query, "min_qv", float, None),
+        exchanges=_split(query.get("exchanges")),
+        settle=_split(query.get("settle")),
+        tickers=_split(query.get("tickers")))
+    return viewer.top_opportunities(k=_first(query, "k", int, 10),
+                                    filters=filters).reset_index()
+
+
+def query_projection(viewer: TableViewer, query: dict) -> pd.DataFrame:
+    horizons = tuple(int(h) for h in _split(query.get("horizons")) or (8, 24, 72, 168))
+    projection = viewer.get_funding_projection(max_hours=max(horizons))
+    return projection.pair_table(horizons=horizons).reset_index()
+
+
+ROUTES = {
+    "/info": query_info,
+    "/funding": query_funding,
+    "/pairs": query_pairs,
+    "/top": query_top,
+    "/projection": query_projection,
+}
+
+
+class ResponseCache:
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple, tuple[str, bytes, bytes]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> Optional[tuple[str, bytes, bytes]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: tuple, entry: tuple[str, bytes, bytes]):
+        with self._lock:
+            self._entries[key] = entry
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+class QueryHandler(BaseHTTPRequestHandler):
+    store: SnapshotStore = None
+    cache: ResponseCache = None
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+    def _send(self, status: int, body: bytes = b"", headers: dict = None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    def _error(self, status: int, message: str):
+        body = json.dumps({"error": message}).encode()
+        self._send(status, body, {"Content-Type": "application/json"})
+
+    @staticmethod
+    def _etag(snapshot: Snapshot, route: str, query: dict) -> str:
+        tag = hashlib.md5(f"{route}?{sorted(query.items())}".encode()).hexdigest()[:12]
+        return f'"{snapshot.snapshot_id}-{tag}"'
+
+    @staticmethod
+    def _not_modified(etag: str, if_none_match: str | None) -> bool:
+        # NOTE: If-None-Match is "*" or a comma-separated list of (possibly weak) tags
+        if not if_none_match:
+            return False
+        for tag in if_none_match.split(","):
+            tag = tag.strip()
+            if tag == "*" or tag.removeprefix("W/") == etag:
+                return True
+        return False
+
+    def _render(self, snapshot: Snapshot, route: str, query: dict) -> tuple[str, bytes, bytes]:
+        df = ROUTES[route](snapshot.viewer, query)
+        data = df.to_json(orient="records", date_format="iso", default_handler=str) \
+            if not df.empty else "[]"
+        body = (f'{{"snapshot":{snapshot.snapshot_id},'
+                f'"created_at":"{snapshot.created_at.isoformat()}",'
+                f'"rows":{len(df)},"data":{data}}}').encode()
+        return self._etag(snapshot, route, query), body, gzip.compress(body)
+
+    def do_GET(self):
+        try:
+            self._get()
+        except Exception as e:
+            # NOTE: Always answer, a dropped connection hides the failure from clients
+            logger.exception(f"Query failed: {self.path}")
+            self._error(500, f"Internal error: {e}")
+
+    def _get(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+
+        if url.path == "/status":
+            latest = self.store.latest
+            body = json.dumps({
+                "snapshot": latest.snapshot_id if latest else None,
+                "age": latest.age if latest else None,
+                "last_duration": self.store.last_duration,
+            }).encode()
+            return self._send(200, body, {"Content-Type": "application/json"})
+
+        if url.path not in ROUTES:
+            return self._error(404, f"Unknown route: {url.path}")
+
+        requested = query.pop("snapshot", None)
+        if requested:
+            try:
+                snapshot = self.store.get(int(requested[0]))
+            except ValueError:
+                return self._error(400, f"Invalid snapshot id: {requested[0]}")
+            if snapshot is None:
+                return self._error(410, f"Snapshot {requested[0]} is no longer retained")
+        else:
+            snapshot = self.store.latest or self.store.refresh()
+
+        # NOTE: ETag depends only on the snapshot and query, so 304 skips rendering
+        etag = self._etag(snapshot, url.path, query)
+        headers = {"ETag": etag,
+                   "Cache-Control": "no-cache",
+                   "X-Snapshot-Id": str(snapshot.snapshot_id)}
+        if self._not_modified(etag, self.headers.get("If-None-Match")):
+            return self._send(304, headers=headers)
+
+        key = (snapshot.snapshot_id, url.path, tuple(sorted(
+            (name, tuple(values)) for name, values in query.items())))
+        entry = self.cache.get(key)
+        if entry is None:
+            try:
+                entry = self._render(snapshot, url.path, query)
+            except (ValueError, TypeError) as e:
+                return self._error(400, str(e))
+            self.cache.put(key, entry)
+        _, body, gz = entry
+
+        headers["Content-Type"] = "application/json"
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            headers["Content-Encoding"] = "gzip"
+            body = gz
+        self._send(200, body, headers)
+
+
+def serve(host: str = "127.0.0.1",
+          port: int = 8765,
+          interval: float = 60,
+          base_exch: str = "hyperliquid",
+          timezone: str = "Asia/Seoul"):
+    store = SnapshotStore(
+        build=lambda: TableViewer.default_viewer(base_exch=base_exch,
+                                                 timezone=timezone),
+        interval=interval)
+    handler = type("BoundQueryHandler", (QueryHandler,),
+                   {"store": store, "cache": ResponseCache()})
+
+    store.start()
+    httpd = ThreadingHTTPServer((host, port), handler)
+    logger.info(f"Serving on http://{host}:{port}")
+    try:
+        httpd.serve_forever()
+    finally:
+        store.stop()
+        httpd.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Funding Rate Query Service")
+    parser.add_argument("--host", type=str, default="127.0.0.1",
+                        help="Bind address (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8765,
+                        help="Port (default: 8765)")
+    parser.add_argument("--interval", type=float, default=60,
+                        help="Refresh interval in seconds (default: 60)")
+    parser.add_argument("--exch", type=str, default="hyperliquid",
+                        help="Base exchange name (default: hyperliquid)")
+    parser.add_argument("--tz", type=str, default="Asia/Seoul",
+                        help="Timezone (default: Asia/Seoul)")
+    args = parser.parse_args()
+
+    serve(host=args.host, port=args.port, interval=args.interval,
+          base_exch=args.exch, timezone=args.tz)
@@ -0,0 +1,225 @@
+import time
+import asyncio
+import logging
+import datetime
+import threading
+from dataclasses import dataclass
+from typing import Any, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Opportunity:
+    ticker: str
+    exch1: str
+    exch2: str
+    symbol1: str
+    symbol2: str
+    pos1: str
+    pos2: str
+    tm: str
+    diff: float
+    er: float
+    bid1: Optional[float] = None
+    ask1: Optional[float] = None
+    bid2: Optional[float] = None
+    ask2: Optional[float] = None
+    funding_time: Any = None
+
+    @property
+    def long_exch(self) -> str:
+        return self.exch1 if self.pos1 == 'L' else self.exch2
+
+    @property
+    def short_exch(self) -> str:
+        return self.exch2 if self.pos1 == 'L' else self.exch1
+
+
+def _float(value) -> Optional[float]:
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    # NOTE: NaN != NaN, quotes missing in the table become None
+    return value if value == value else None
+
+
+@dataclass(frozen=True)
+class OpportunitySet:
+    snapshot_id: int
+    created_at: datetime.datetime
+    opportunities: tuple[Opportunity, ...]
+    # NOTE: time.perf_counter_ns at publish, subscribers measure reaction time from it
+    published_ns: int = 0
+
+    @classmethod
+    def from_viewer(cls,
+                    viewer,
+                    snapshot_id: int,
+                    k: int | None = None) -> "OpportunitySet":
+        pairs = viewer.ranked_pairs(k=k)
+        opportunities = tuple(
+            Opportunity(ticker=row['ticker'],
+                        exch1=row['exch1'],
+                        exch2=row['exch2'],
+                        symbol1=row['symbol1'],
+                        symbol2=row['symbol2'],
+                        pos1=row['pos1'],
+                        pos2=row['pos2'],
+                        tm=row['tm'],
+                        diff=float(row['diff']),
+                        er=float(row['ER']),
+                        bid1=_float(row.get('bid1')),
+                        ask1=_float(row.get('ask1')),
+                        bid2=_float(row.get('bid2')),
+                        ask2=_float(row.get('ask2')),
+                        funding_time=row.get('time1'))
+            for row in pairs.to_dict('records'))
+        return cls(snapshot_id=snapshot_id,
+                   created_at=datetime.datetime.now(),
+                   opportunities=opportunities)
+
+    def __len__(self) -> int:
+        return len(self.opportunities)
+
+
+class SignalFilter(NamedTuple):
+    tickers: list[str] | None = None
+    exchanges: list[str] | None = None
+    min_er: float | None = None
+    k: int | None = None
+
+    def apply(self, opportunities: tuple[Opportunity, ...]) -> tuple[Opportunity, ...]:
+        tickers = {t.upper() for t in self.tickers} if self.tickers else None
+        exchanges = {e.lower() for e in self.exchanges} if self.exchanges else None
+
+        res = []
+        # NOTE: Input is ranked by ER, so k keeps the best matches
+        for opp in opportunities:
+            if self.k is not None and len(res) >= self.k:
+                break
+            if tickers is not None and opp.ticker not in tickers:
+                continue
+            if exchanges is not None and \
+                    (opp.exch1 not in exchanges or opp.exch2 not in exchanges):
+                continue
+            if self.min_er is not None and not opp.er >= self.min_er:
+                continue
+            res.append(opp)
+        return tuple(res)
+
+
+class SignalSubscription:
+    def __init__(self,
+                 bus: "SignalBus",
+                 filters: SignalFilter = None):
+        self.bus = bus
+        self.filters = filters
+        self.loop = asyncio.get_running_loop()
+
+        self.received = 0
+        self.dropped = 0
+        self.skipped = 0
+        self.closed = False
+        self._latest: Optional[OpportunitySet] = None
+        self._event = asyncio.Event()
+
+    def _deliver(self, signal: OpportunitySet):
+        # NOTE: Runs on the subscriber loop, only the newest unread set is kept
+        if self._latest is not None:
+            self.dropped += 1
+        self._latest = signal
+        self.received += 1
+        self._event.set()
+
+    def _close(self):
+        self.closed = True
+        self._event.set()
+
+    def offer(self, signal: OpportunitySet):
+        if self.filters is not None:
+            signal = OpportunitySet(snapshot_id=signal.snapshot_id,
+                                    created_at=signal.created_at,
+                                    opportunities=self.filters.apply(
+                                        signal.opportunities),
+                                    published_ns=signal.published_ns)
+        if not signal.opportunities:
+            # NOTE: Nothing matched, subscribers only wake up for something to act on
+            self.skipped += 1
+            return
+        try:
+            self.loop.call_soon_threadsafe(self._deliver, signal)
+        except RuntimeError:
+            # NOTE: Subscriber loop already closed
+            self.bus.unsubscribe(self)
+
+    async def get(self, timeout: float = None) -> Optional[OpportunitySet]:
+        if self._latest is None and not self.closed:
+            self._event.clear()
+            try:
+                await asyncio.wait_for(self._event.wait(), timeout)
+            except asyncio.TimeoutError:
+                return None
+        signal, self._latest = self._latest, None
+        return signal
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> OpportunitySet:
+        signal = await self.get()
+        if signal is None:
+            raise StopAsyncIteration
+        return signal
+
+    def close(self):
+        self.bus.unsubscribe(self)
+
+
+class SignalBus:
+    # NOTE: No process-wide singleton, the fetcher and ExecutionRunner may import
+    # this module under different names. Construct one bus and pass it to both sides
+    def __init__(self):
+        self._subs: list[SignalSubscription] = []
+        self._lock = threading.Lock()
+        self.latest: Optional[OpportunitySet] = None
+        self.published = 0
+
+    def subscribe(self,
+                  filters: SignalFilter = None,
+                  replay: bool = True) -> SignalSubscription:
+        # NOTE: Must be called from the subscriber's event loop
+        sub = SignalSubscription(self, filters)
+        with self._lock:
+            self._subs.append(sub)
+            latest = self.latest
+        if replay and latest is not None:
+            sub.offer(latest)
+        return sub
+
+    def unsubscribe(self, sub: SignalSubscription):
+        with self._lock:
+            if sub in self._subs:
+                self._subs.remove(sub)
+        try:
+            sub.loop.call_soon_threadsafe(sub._close)
+        except RuntimeError:
+            pass
+
+    def publish(self, signal: OpportunitySet) -> int:
+        signal = OpportunitySet(snapshot_id=signal.snapshot_id,
+                                created_at=signal.created_at,
+                                opportunities=signal.opportunities,
+                                published_ns=time.perf_counter_ns())
+        with self._lock:
+            self.latest = signal
+            self.published += 1
+            subs = list(self._subs)
+        # NOTE: Thread-safe, each subscriber is woken on its own loop
+        for sub in subs:
+            sub.offer(signal)
+        logger.info(
+            f"Published snapshot={signal.snapshot_id} "
+            f"opportunities={len(signal)} subscribers={len(subs)}")
+        return len(subs)
@@ -0,0 +1,209 @@
+import logging
+import itertools
+import numpy as np
+import pandas as pd
+from enum import Enum, unique
+from dataclasses import dataclass, field
+from typing import NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@unique
+class SubKind(Enum):
+    ER_ABOVE = "er"
+    DIFF_CROSS = "diff"
+    TOP_K = "top"
+
+
+@dataclass(frozen=True)
+class Subscription:
+    sub_id: int
+    chat_id: int
+    kind: SubKind
+    level: float
+    ticker: Optional[str] = None
+    exchanges: tuple[str, ...] = field(default_factory=tuple)
+
+    def describe(self) -> str:
+        if self.kind == SubKind.ER_ABOVE:
+            venues = f" on {'/'.join(self.exchanges)}" if self.exchanges else ""
+            return f"#{self.sub_id} ER of {self.ticker}{venues} above {self.level}"
+        if self.kind == SubKind.DIFF_CROSS:
+            return f"#{self.sub_id} diff of {self.ticker} {'/'.join(self.exchanges)} crossing {self.level}"
+        return f"#{self.sub_id} new pair entering top {int(self.level)}"
+
+
+class Alert(NamedTuple):
+    chat_id: int
+    sub: Subscription
+    text: str
+
+
+class SubscriptionEngine:
+    def __init__(self):
+        self._seq = itertools.count(1)
+        self._subs: dict[int, Subscription] = {}
+        # NOTE: ticker -> exchange key -> sub ids, exchange key is () when not pinned
+        self._by_ticker: dict[str, dict[tuple, set[int]]] = {}
+        self._by_k: dict[int, set[int]] = {}
+
+        self._last: dict[int, float] = {}
+        self._top_sets: dict[int, set[tuple]] = {}
+        self._pending: set[str] = set()
+
+    def add(self,
+            chat_id: int,
+            kind: SubKind,
+            level: float,
+            ticker: str = None,
+            exchanges: tuple[str, ...] = ()) -> Subscription:
+        if kind != SubKind.TOP_K and not ticker:
+            raise ValueError(f"{kind.value} subscription needs a ticker")
+        if kind == SubKind.DIFF_CROSS and len(exchanges) != 2:
+            raise ValueError("diff subscription needs exactly two exchanges")
+
+        sub = Subscription(sub_id=next(self._seq),
+                           chat_id=chat_id,
+                           kind=kind,
+                           level=level,
+                           ticker=ticker.upper() if ticker else None,
+                           exchanges=tuple(sorted(e.lower() for e in exchanges)))
+        self._subs[sub.sub_id] = sub
+
+        if sub.kind == SubKind.TOP_K:
+            self._by_k.setdefault(int(sub.level), set()).add(sub.sub_id)
+        else:
+            self._by_ticker.setdefault(sub.ticker, {}) \
+                .setdefault(sub.exchanges, set()).add(sub.sub_id)
+            # NOTE: Evaluate on the next snapshot even if the ticker does not change
+            self._pending.add(sub.ticker)
+        return sub
+
+    def remove(self, sub_id: int, chat_id: int = None) -> bool:
+        sub = self._subs.get(sub_id)
+        if sub is None or (chat_id is not None and sub.chat_id != chat_id):
+            return False
+
+        del self._subs[sub_id]
+        self._last.pop(sub_id, None)
+        if sub.kind == SubKind.TOP_K:
+            ids = self._by_k.get(int(sub.level), set())
+            ids.discard(sub_id)
+            if not ids:
+                self._by_k.pop(int(sub.level), None)
+                self._top_sets.pop(int(sub.level), None)
+        else:
+            by_exch = self._by_ticker.get(sub.ticker, {})
+            by_exch.get(sub.exchanges, set()).discard(sub_id)
+            if not by_exch.get(sub.exchanges):
+                by_exch.pop(sub.exchanges, None)
+            if not by_exch:
+                self._by_ticker.pop(sub.ticker, None)
+        return True
+
+    def subscriptions(self, chat_id: int = None) -> list[Subscription]:
+        return [sub for sub in self._subs.values()
+                if chat_id is None or sub.chat_id == chat_id]
+
+    def __len__(self) -> int:
+        return len(self._subs)
+
+    @staticmethod
+    def _ticker_values(rows: pd.DataFrame, sub: Subscription) -> float:
+        if rows.empty:
+            return np.nan
+
+        if sub.kind == SubKind.ER_ABOVE:
+            if sub.exchanges:
+                mask = rows['exch1'].isin(sub.exchanges) | \
+                    rows['exch2'].isin(sub.exchanges)
+                rows = rows[mask]
+            return rows['ER'].max() if not rows.empty else np.nan
+
+        e1, e2 = sub.exchanges
+        mask = ((rows['exch1'] == e1) & (rows['exch2'] == e2)) | \
+            ((rows['exch1'] == e2) & (rows['exch2'] == e1))
+        # NOTE: Pair table keeps diff < 0, the spread shown in get_table is -diff
+        spread = -rows.loc[mask, 'diff']
+        return spread.max() if not spread.empty else np.nan
+
+    @staticmethod
+    def _triggered(sub: Subscription, prev: float, curr: float) -> bool:
+        if np.isnan(curr):
+            return False
+        if sub.kind == SubKind.ER_ABOVE:
+            return curr > sub.level and not (prev > sub.level)
+        if np.isnan(prev):
+            return False
+        return (prev < sub.level <= curr) or (prev > sub.level >= curr)
+
+    def _evaluate_tickers(self,
+                          pairs: pd.DataFrame,
+                          tickers: set[str],
+                          snapshot_id: int) -> list[Alert]:
+        if not tickers:
+            return []
+
+        alerts = []
+        rows_by_ticker = dict(tuple(pairs[pairs['ticker'].isin(tickers)]
+                                    .groupby('ticker'))) if not pairs.empty else {}
+        empty = pairs.iloc[0:0]
+
+        for ticker in tickers:
+            rows = rows_by_ticker.get(ticker, empty)
+            for sub_ids in self._by_ticker[ticker].values():
+                for sub_id in sub_ids:
+                    sub = self._subs[sub_id]
+                    curr = self._ticker_values(rows, sub)
+                    prev = self._last.get(sub_id, np.nan)
+                    self._last[sub_id] = curr
+
+                    if self._triggered(sub, prev, curr):
+                        alerts.append(Alert(
+                            chat_id=sub.chat_id,
+                            sub=sub,
+                            text=f"[#{snapshot_id}] {sub.describe()}: now {curr:.6f}"))
+        return alerts
+
+    def _evaluate_top(self,
+                      pairs: pd.DataFrame,
+                      snapshot_id: int) -> list[Alert]:
+        alerts = []
+        for k, sub_ids in self._by_k.items():
+            head = pairs.head(k)
+            current = set(zip(head['ticker'], head['exch1'], head['exch2'])) \
+                if not head.empty else set()
+
+            previous = self._top_sets.get(k)
+            self._top_sets[k] = current
+            if previous is None:
+                continue
+
+            entered = sorted(current - previous)
+            if not entered:
+                continue
+
+            listing = ", ".join(f"{t} {e1}/{e2}" for t, e1, e2 in entered)
+            for sub_id in sub_ids:
+                sub = self._subs[sub_id]
+                alerts.append(Alert(
+                    chat_id=sub.chat_id,
+                    sub=sub,
+                    text=f"[#{snapshot_id}] {sub.describe()}: {listing}"))
+        return alerts
+
+    def evaluate(self,
+                 pairs: pd.DataFrame,
+                 changed: set[str],
+                 snapshot_id: int) -> list[Alert]:
+        # NOTE: Only subscriptions indexed on changed tickers are touched
+        tickers = (set(changed) | self._pending) & self._by_ticker.keys()
+        self._pending.clear()
+
+        alerts = self._evaluate_tickers(pairs, tickers, snapshot_id)
+        alerts.extend(self._evaluate_top(pairs, snapshot_id))
+        if alerts:
+            logger.info(
+                f"Snapshot {snapshot_id}: {len(alerts)} alerts from {len(tickers)} tickers")
+        return alerts
@@ -3,36 +3,54 @@ import logging
 import warnings
 import numpy as np
 import pandas as pd
+from typing import NamedTuple, TYPE_CHECKING
 from itertools import permutations
 from functools import cached_property
-from concurrent.futures import ThreadPoolExecutor, as_completed
 
-from tools import Tools
-from exchange import ExchangeManager
-from pipeline import PipelineMerger
+from rates import ConvertRateService
+from projection import FundingProjection
+
+if TYPE_CHECKING:
+    from exchange import ExchangeManager
+    from pipeline import PipelineMerger
 
 warnings.filterwarnings("ignore", category=FutureWarning)
 logger = logging.getLogger(__name__)
 
 
+class OpportunityFilter(NamedTuple):
+    min_quote_volume: float | None = None
+    exchanges: list[str] | None = None
+    settle: list[str] | None = None
+    tickers: list[str] | None = None
+
+
 class TableViewer:
     def __init__(self,
-                 exch_mgr: ExchangeManager,
-                 pipeline: PipelineMerger,
+                 exch_mgr: "ExchangeManager",
+                 pipeline: "PipelineMerger",
                  data_map: dict[str, pd.DataFrame],
                  base_exch: str = 'hyperliquid',
-                 timezone: str = 'Asia/Seoul'):
+                 timezone: str = 'Asia/Seoul',
+                 rate_service: ConvertRateService = None,
+                 convert_rates: dict[str, dict] = None):
         self.exch_mgr = exch_mgr
         self.pipeline = pipeline
         self.data_map = data_map
         self.base_exch = base_exch
         self.tz = pytz.timezone(timezone)
+        self.rate_service = rate_service or ConvertRateService.shared()
+        self.convert_rates = convert_rates
+        self._projections: dict[tuple, FundingProjection] = {}
 
     @classmethod
     def default_viewer(cls,
-                       exch_mgr: ExchangeManager = None,
+                       exch_mgr: "ExchangeManager" = None,
                        base_exch: str = 'hyperliquid',
                        timezone: str = 'Asia/Seoul'):
+        from exchange import ExchangeManager
+        from pipeline import PipelineMerger
+
         if exch_mgr is None:
             exch_mgr = ExchangeManager()
         pipeline = PipelineMerger.load_pipeline(
@@ -43,35 +61,45 @@ class TableViewer:
                    base_exch=base_exch,
                    timezone=timezone)
 
-    def _get_convert_rates(self) -> pd.DataFrame:
-        def _load_datas(exch_name: str,
-                        exch):
-            df = Tools.safe_execute(exch.fetchTicker,
-                                    symbol='USDC/USDT',
-                                    skip=True)
-            if df is None:
-                res = {}
-            else:
-                res = {
-                    'symbol': df['symbol'],
-                    'bid': df['bid'],
-                    'ask': df['ask']
-                }
-            return exch_name, res
-
-        snapshot = {}
-        with ThreadPoolExecutor(max_workers=self.pipeline._max_workers) as executor:
-            futures = []
-            for exch_name, exchange in self.exch_mgr.exchanges.items():
-                fut = executor.submit(_load_datas,
-                                      exch_name,
-                                      exchange)
-                futures.append(fut)
-
-            for f in as_completed(futures):
-                exch_name, result_dict = f.result()
-                snapshot[exch_name] = result_dict
-        return snapshot
+    @classmethod
+    def from_snapshot(cls,
+                      reader,
+                      base_exch: str = 'hyperliquid',
+                      timezone: str = 'Asia/Seoul'):
+        return cls(exch_mgr=None,
+                   pipeline=None,
+                   data_map=reader.data_map(tz=timezone),
+                   base_exch=base_exch,
+                   timezone=timezone,
+                   convert_rates=reader.extra.get('convert_rates', {}))
+
+    def export_snapshot(self, path: str = None) -> int:
+        if self.pipeline is None:
+            logger.warning("Viewer has no pipeline to export")
+            return -1
+
+        # NOTE: fetchTicker may return bid/ask None, stored as NaN
+        convert_rates = {
+            exch_name: {'symbol': rates['symbol'],
+                        'bid': np.nan if rates.get('bid') is None else float(rates['bid']),
+                        'ask': np.nan if rates.get('ask') is None else float(rates['ask'])}
+            for exch_name, rates in self._get_convert_rates().items()
+            if rates
+        }
+        return self.pipeline.export(path=path,
+                                    extra={'convert_rates': convert_rates})
+
+    def _get_convert_rates(self) -> dict[str, dict]:
+        if self.convert_rates is not None:
+            return self.convert_rates
+        if self.exch_mgr is None:
+            return {}
+
+        tickers = None
+        if self.pipeline is not None and self.pipeline.pipeline:
+            tickers = self.pipeline.pipeline.get('BidAskFilter')
+        return self.rate_service.get_rates(exchanges=self.exch_mgr.exchanges,
+                                           tickers=tickers)
 
     @cached_property
     def get_info_table(self) -> pd.DataFrame:
@@ -197,164 +225,269 @@ class TableViewer:
             table = table.loc[:, table.columns.get_level_values(0).isin(valid)]
         return table
 
-    def get_pair_table(self,
-                       interval_equals: bool = True,
-                       pos_exists: bool = True,
-                       fr_mgmt: bool = True) -> pd.DataFrame:
-        infos = self.get_info_table.reset_index()
-        if infos.empty:
-            return pd.DataFrame()
+    @staticmethod
+    def _get_pair(row1: dict, row2: dict, ticker: str,
+                  interval_equals: bool, pos_exists: bool) -> dict | None:
+        if interval_equals and row1.get('interval') != row2.get('interval'):
+            return None
+        if not row1.get('interval') or not row2.get('interval'):
+            return None
+
+        try:
+            # NOTE: Scale funding rate to 8 hours
+            fr1 = row1['funding_rate'] * (8 / row1['interval'])
+            fr2 = row2['funding_rate'] * (8 / row2['interval'])
+        except Exception:
+            return None
+
+        diff = np.round(fr1 - fr2, 6)
+
+        if diff > 0:
+            pos1, pos2 = 'S', 'L'
+        elif diff < 0:
+            pos1, pos2 = 'L', 'S'
+        else:
+            pos1, pos2 = None, None
+
+        if pos_exists and (pos1 is None or pos2 is None):
+            return None
+
+        return {
+            'ticker': ticker,
+            'exch1': row1.get('exchange'),
+            'exch2': row2.get('exchange'),
+            'symbol1': row1.get('symbol'),
+            'symbol2': row2.get('symbol'),
+            'time1': row1.get('fundingTimestamp'),
+            'time2': row2.get('fundingTimestamp'),
+            'fr1': row1.get('funding_rate'),
+            'fr2': row2.get('funding_rate'),
+            'interval1': row1.get('interval'),
+            'interval2': row2.get('interval'),
+            'bid1': row1.get('bid'),
+            'bid2': row2.get('bid'),
+            'ask1': row1.get('ask'),
+            'ask2': row2.get('ask'),
+            'maker1': row1.get('maker'),
+            'maker2': row2.get('maker'),
+            'taker1': row1.get('taker'),
+            'taker2': row2.get('taker'),
+            'diff': diff,
+            'pos1': pos1,
+            'pos2': pos2,
+        }
+
+    @staticmethod
+    def _calc_pi(long_leg: dict, short_leg: dict, tm: str):
+        if tm == 'LmSt':
+            # NOTE: Long maker, Short taker (LmSt)
+            eff_l = long_leg['bid'] * (1 - long_leg['maker'])
+            eff_s = short_leg['bid'] * (1 - short_leg['taker'])
+        else:
+            # NOTE: Long taker, Short maker (LtSm)
+            eff_l = long_leg['ask'] * (1 + long_leg['taker'])
+            eff_s = short_leg['ask'] * (1 + short_leg['maker'])
+        return (eff_s - eff_l) / eff_l
 
-        def get_pair(row1: dict, row2: dict, ticker: str) -> dict | None:
-            if interval_equals and row1.get('interval') != row2.get('interval'):
-                return None
-            if not row1.get('interval') or not row2.get('interval'):
-                return None
+    @classmethod
+    def _get_pis(cls, pair: dict) -> list[dict]:
+        leg1 = {'bid': pair['bid1'], 'ask': pair['ask1'],
+                'maker': pair['maker1'], 'taker': pair['taker1']}
+        leg2 = {'bid': pair['bid2'], 'ask': pair['ask2'],
+                'maker': pair['maker2'], 'taker': pair['taker2']}
+
+        if pair['pos1'] == 'L':
+            long_leg, short_leg = leg1, leg2
+        elif pair['pos2'] == 'L':
+            long_leg, short_leg = leg2, leg1
+        else:
+            return []
 
+        pis = []
+        for tm in ('LmSt', 'LtSm'):
             try:
-                # NOTE: Scale funding rate to 8 hours
-                fr1 = row1['funding_rate'] * (8 / row1['interval'])
-                fr2 = row2['funding_rate'] * (8 / row2['interval'])
+                pi = cls._calc_pi(long_leg, short_leg, tm)
             except Exception:
-                return None
-
-            diff = fr1 - fr2
-
-            if diff > 0:
-                pos1, pos2 = 'S', 'L'
-            elif diff < 0:
-                pos1, pos2 = 'L', 'S'
-            else:
-                pos1, pos2 = None, None
-
-            if pos_exists and (pos1 is None or pos2 is None):
-                return None
-
-            return {
-                'ticker': ticker,
-                'exch1': row1.get('exchange'),
-                'exch2': row2.get('exchange'),
-                'time1': row1.get('fundingTimestamp'),
-                'time2': row2.get('fundingTimestamp'),
-                'fr1': row1.get('funding_rate'),
-                'fr2': row2.get('funding_rate'),
-                'interval1': row1.get('interval'),
-                'interval2': row2.get('interval'),
-                'bid1': row1.get('bid'),
-                'bid2': row2.get('bid'),
-                'ask1': row1.get('ask'),
-                'ask2': row2.get('ask'),
-                'maker1': row1.get('maker'),
-                'maker2': row2.get('maker'),
-                'taker1': row1.get('taker'),
-                'taker2': row2.get('taker'),
-                'diff': diff,
-                'pos1': pos1,
-                'pos2': pos2,
-            }
-
+                pi = np.nan
+            pis.append({**pair, 'tm': tm, 'pi': pi})
+        return pis
+
+    def _ticker_pairs(self,
+                      ticker: str,
+                      rows: list[dict],
+                      interval_equals: bool = True,
+                      pos_exists: bool = True,
+                      fr_mgmt: bool = True) -> list[dict]:
+        records = []
+        for row1, row2 in permutations(rows, 2):
+            pair = self._get_pair(row1, row2, ticker,
+                                  interval_equals, pos_exists)
+            if pair is None:
+                continue
+            if fr_mgmt and not pair['diff'] < 0:
+                continue
+            records.extend(self._get_pis(pair))
+        return records
+
+    def _build_pairs(self,
+                     infos: pd.DataFrame,
+                     interval_equals: bool = True,
+                     pos_exists: bool = True,
+                     fr_mgmt: bool = True) -> pd.DataFrame:
         records = []
         for ticker, group in infos.groupby('ticker'):
             if len(group) < 2:
                 continue
+            records.extend(self._ticker_pairs(ticker,
+                                              group.to_dict('records'),
+                                              interval_equals,
+                                              pos_exists,
+                                              fr_mgmt))
+        return pd.DataFrame(records)
+
+    def get_funding_projection(self,
+                               max_hours: int = 168,
+                               tolerance_minutes: int = 5,
+                               base_only: bool = True) -> FundingProjection:
+        key = (max_hours, tolerance_minutes, base_only)
+        if key not in self._projections:
+            self._projections[key] = FundingProjection.build(
+                data_map=self.data_map,
+                slots=self._get_time_slots(max_hours),
+                tz=self.tz,
+                tolerance_minutes=tolerance_minutes,
+                base_exch=self.base_exch if base_only else None)
+        return self._projections[key]
 
-            rows = group.to_dict('records')
-            for row1, row2 in permutations(rows, 2):
-                record = get_pair(row1, row2, ticker)
-                if record is not None:
-                    records.append(record)
-
-        temp = pd.DataFrame(records)
-        if not temp.empty:
-            temp['diff'] = temp['diff'].round(6)
-
-        pairs = temp[temp['diff'] < 0].sort_values(
-            by='diff', ascending=True) if fr_mgmt else temp
-
-        pis = []
-        for _, row in pairs.iterrows():
-            if row['pos1'] == 'L':
-                long_leg = {'bid': row['bid1'], 'ask': row['ask1'],
-                            'maker': row['maker1'], 'taker': row['taker1']}
-                short_leg = {'bid': row['bid2'], 'ask': row['ask2'],
-                             'maker': row['maker2'], 'taker': row['taker2']}
-
-            elif row['pos2'] == 'L':
-                long_leg = {'bid': row['bid2'], 'ask': row['ask2'],
-                            'maker': row['maker2'], 'taker': row['taker2']}
-                short_leg = {'bid': row['bid1'], 'ask': row['ask1'],
-                             'maker': row['maker1'], 'taker': row['taker1']}
-
-            else:
-                continue
-
-            # NOTE: Long maker, Short taker (LmSt)
-            try:
-                eff_l_bid = long_leg['bid'] * (1 - long_leg['maker'])
-                eff_s_bid = short_leg['bid'] * (1 - short_leg['taker'])
-                pi_bid = (eff_s_bid - eff_l_bid) / eff_l_bid
-            except Exception:
-                pi_bid = np.nan
-            row_bid = row.copy()
-            row_bid['tm'] = 'LmSt'
-            row_bid['pi'] = pi_bid
-
-            # NOTE: Long taker, Short maker (LtSm)
-            try:
-                eff_l_ask = long_leg['ask'] * (1 + long_leg['taker'])
-                eff_s_ask = short_leg['ask'] * (1 + short_leg['maker'])
-                pi_ask = (eff_s_ask - eff_l_ask) / eff_l_ask
-            except Exception:
-                pi_ask = np.nan
-            row_ask = row.copy()
-            row_ask['tm'] = 'LtSm'
-            row_ask['pi'] = pi_ask
-
-            pis.append(row_bid)
-            pis.append(row_ask)
+    def get_pair_table(self,
+                       interval_equals: bool = True,
+                       pos_exists: bool = True,
+                       fr_mgmt: bool = True) -> pd.DataFrame:
+        infos = self.get_info_table.reset_index()
+        if infos.empty:
+            return pd.DataFrame()
 
-        res = pd.DataFrame(pis)
+        res = self._build_pairs(infos, interval_equals, pos_exists, fr_mgmt)
+        if fr_mgmt and not res.empty:
+            res = res.sort_values(by='diff', ascending=True, kind='stable')
         return res
 
-    @property
-    def get_table(self):
-        pairs = self.get_pair_table(interval_equals=True,
-                                    pos_exists=True,
-                                    fr_mgmt=True)
+    @staticmethod
+    def _top_k_positions(values: np.ndarray, k: int | None = None) -> np.ndarray:
+        keys = -np.asarray(values, dtype=float)
+        if k is None or k >= len(keys):
+            return np.argsort(keys, kind='stable')
+        if k <= 0:
+            return np.array([], dtype=int)
+
+        # NOTE: Partial selection of the k largest, only those k get sorted
+        idx = np.argpartition(keys, k - 1)[:k]
+        return idx[np.lexsort((idx, keys[idx]))]
+
+    def _format_timestamp(self, ts, today: pd.Timestamp) -> str:
+        ts = pd.to_datetime(ts, errors='coerce')
+        if pd.isna(ts):
+            return ""
+        if ts.tzinfo is None:
+            ts = ts.tz_localize(self.tz)
+        else:
+            ts = ts.tz_convert(self.tz)
+        day_diff = (ts.normalize() - today).days
+        day_str = "T" if day_diff == 0 else f"T+{day_diff}"
+        hour = ts.hour
+        return f"{day_str} / {hour}"
+
+    def _rank_pairs(self,
+                    pairs: pd.DataFrame,
+                    k: int | None = None) -> pd.DataFrame:
         if pairs.empty:
             return pairs
 
-        pairs['diff'] = -pairs['diff']
+        pairs = pairs.assign(diff=-pairs['diff'])
         pairs['ER'] = pairs['diff'] + pairs['pi']
+        return pairs.iloc[self._top_k_positions(pairs['ER'].to_numpy(), k)]
 
-        pairs = pairs[['ticker',
-                       'exch1', 'exch2',
-                       'time1', 'interval1',
-                       'pos1', 'pos2', 'tm',
-                       'diff', 'ER']]
-        res = pairs.sort_values(by='ER', ascending=False)
+    def _rank_table(self,
+                    pairs: pd.DataFrame,
+                    k: int | None = None) -> pd.DataFrame:
+        if pairs.empty:
+            return pairs
+        return self._format_ranked(self._rank_pairs(pairs, k))
+
+    def _format_ranked(self, ranked: pd.DataFrame) -> pd.DataFrame:
+        if ranked.empty:
+            return ranked
+
+        res = ranked[['ticker',
+                      'exch1', 'exch2',
+                      'time1', 'interval1',
+                      'pos1', 'pos2', 'tm',
+                      'diff', 'ER']]
 
         res = res.rename(columns={'time1': 't', 'interval1': 'int'})
 
         today = pd.Timestamp.now(tz=self.tz).normalize()
-
-        def format_timestamp(ts):
-            ts = pd.to_datetime(ts, errors='coerce')
-            if pd.isna(ts):
-                return ""
-            if ts.tzinfo is None:
-                ts = ts.tz_localize(self.tz)
-            else:
-                ts = ts.tz_convert(self.tz)
-            day_diff = (ts.normalize() - today).days
-            day_str = "T" if day_diff == 0 else f"T+{day_diff}"
-            hour = ts.hour
-            return f"{day_str} / {hour}"
-
-        res['t'] = res['t'].apply(format_timestamp)
+        res['t'] = res['t'].apply(self._format_timestamp, today=today)
         res = res.set_index('ticker')
         return res
 
+    @cached_property
+    def _ranked_pairs(self) -> pd.DataFrame:
+        # NOTE: Ranked once per viewer, shared by the signal bus, get_table and
+        # the unfiltered top_opportunities the bot renders
+        pairs = self.get_pair_table(interval_equals=True,
+                                    pos_exists=True,
+                                    fr_mgmt=True)
+        return self._rank_pairs(pairs).reset_index(drop=True)
+
+    @property
+    def get_table(self):
+        return self._format_ranked(self._ranked_pairs)
+
+    def ranked_pairs(self, k: int | None = None) -> pd.DataFrame:
+        # NOTE: Same ranking as get_table, keeping symbols and quotes for execution
+        ranked = self._ranked_pairs
+        return ranked.iloc[:len(ranked) if k is None else max(k, 0)]
+
+    @staticmethod
+    def _filter_infos(infos: pd.DataFrame,
+                      filters: OpportunityFilter = None) -> pd.DataFrame:
+        if filters is None or infos.empty:
+            return infos
+
+        mask = np.ones(len(infos), dtype=bool)
+        if filters.min_quote_volume is not None:
+            mask &= (infos['quoteVolume'] >=
+                     filters.min_quote_volume).to_numpy()
+        if filters.exchanges is not None:
+            mask &= infos.index.get_level_values(
+                'exchange').isin(filters.exchanges)
+        if filters.settle is not None:
+            mask &= infos.index.get_level_values(
+                'settle').isin(filters.settle)
+        if filters.tickers is not None:
+            mask &= infos.index.get_level_values(
+                'ticker').isin(filters.tickers)
+        return infos[mask]
+
+    def top_opportunities(self,
+                          k: int = 10,
+                          filters: OpportunityFilter = None,
+                          interval_equals: bool = True,
+                          pos_exists: bool = True) -> pd.DataFrame:
+        if filters is None and interval_equals and pos_exists:
+            return self._format_ranked(self._ranked_pairs.iloc[:max(k, 0)])
+
+        infos = self._filter_infos(self.get_info_table, filters).reset_index()
+        if infos.empty:
+            return pd.DataFrame()
+
+        pairs = self._build_pairs(infos,
+                                  interval_equals=interval_equals,
+                                  pos_exists=pos_exists,
+                                  fr_mgmt=True)
+        return self._rank_table(pairs, k=k)
+
 
 # if __name__ == "__main__":
 #     viewer = TableViewer.default_viewer(base_exch='hyperliquid',
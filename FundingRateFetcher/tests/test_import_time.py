@@ -0,0 +1,67 @@
+import os
+import sys
+import subprocess
+import unittest
+import importlib.util
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ('ccxt', 'requests')
+# NOTE: Generous wall budget for `import exchange`, the point is to catch eager ccxt imports
+EXCHANGE_IMPORT_BUDGET_US = 500_000
+
+
+def import_profile(code: str) -> dict[str, int]:
+    """Runs code under `python -X importtime` and returns module -> cumulative us."""
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                          cwd=PACKAGE_DIR,
+                          capture_output=True,
+                          text=True)
+    if proc.returncode != 0:
+        raise AssertionError(proc.stderr)
+
+    profile = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        _, cumulative, name = line.split('|')
+        cumulative = cumulative.strip()
+        if cumulative.isdigit():
+            profile[name.strip()] = int(cumulative)
+    return profile
+
+
+def loaded(profile: dict[str, int], roots: tuple[str, ...]) -> list[str]:
+    return sorted(name for name in profile if name.split('.')[0] in roots)
+
+
+def has_module(name: str) -> bool:
+    return importlib.util.find_spec(name) is not None
+
+
+class ImportTimeTest(unittest.TestCase):
+    def test_exchange_manager_is_lazy(self):
+        profile = import_profile(
+            "import exchange\n"
+            "mgr = exchange.ExchangeManager()\n"
+            "assert len(mgr.exchanges) > 0\n"
+            "assert not mgr.exchanges.loaded\n")
+        self.assertEqual(loaded(profile, HEAVY_MODULES + ('pandas',)), [])
+        self.assertLess(profile['exchange'], EXCHANGE_IMPORT_BUDGET_US)
+
+    @unittest.skipUnless(all(map(has_module, ('pandas', 'tqdm'))),
+                         "pandas/tqdm are not installed")
+    def test_exception_defers_requests(self):
+        profile = import_profile("import exception")
+        self.assertEqual(loaded(profile, HEAVY_MODULES), [])
+
+    @unittest.skipUnless(all(map(has_module, ('pandas', 'pytz'))),
+                         "pandas/pytz are not installed")
+    def test_table_skips_fetch_pipeline(self):
+        # NOTE: Snapshot readers only need the viewer, not the fetch stack
+        profile = import_profile("import table")
+        self.assertEqual(
+            loaded(profile, HEAVY_MODULES + ('exchange', 'pipeline', 'fetcher')), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import asyncio
+import os
+import sys
+import unittest
+import importlib.util
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from render import detail_data
+
+HAS_TELEGRAM = importlib.util.find_spec('telegram') is not None
+CHAT_ID = -100
+
+
+class FakeBot:
+    def __init__(self):
+        self.calls = []
+
+    async def send_message(self, chat_id, text, parse_mode=None, reply_markup=None):
+        self.calls.append(('send', chat_id, text))
+        return type('Message', (), {'message_id': len(self.calls)})()
+
+    async def edit_message_text(self, chat_id, message_id, text, parse_mode=None,
+                                reply_markup=None):
+        self.calls.append(('edit', chat_id, text))
+
+
+def table_markup(snapshot_id: int):
+    from telegram import InlineKeyboardButton, InlineKeyboardMarkup
+    return InlineKeyboardMarkup([
+        [InlineKeyboardButton(text=label, callback_data=detail_data(snapshot_id, idx))]
+        for idx, label in enumerate(("BTC / binance / bybit", "ETH / okx / bybit"))
+    ])
+
+
+@unittest.skipUnless(HAS_TELEGRAM, "python-telegram-bot is not installed")
+class OutboxTest(unittest.TestCase):
+    def run_outbox(self, *messages):
+        from outbox import Outbox
+
+        async def main():
+            bot = FakeBot()
+            outbox = Outbox(bot, private_interval=0.0, group_interval=0.0)
+            try:
+                for kwargs in messages:
+                    outbox.send(**kwargs)
+                    while any(q.pending for q in outbox._chats.values()):
+                        await asyncio.sleep(0.01)
+                    await asyncio.sleep(0.01)
+            finally:
+                await outbox.close()
+            return bot, outbox
+
+        return asyncio.run(main())
+
+    def test_same_table_for_new_snapshot_is_skipped(self):
+        bot, outbox = self.run_outbox(
+            dict(chat_id=CHAT_ID, text="table", reply_markup=table_markup(1), slot="table"),
+            dict(chat_id=CHAT_ID, text="table", reply_markup=table_markup(2), slot="table"))
+        self.assertEqual(outbox.stats['sent'], 1)
+        self.assertEqual(outbox.stats['skipped'], 1)
+        self.assertEqual(outbox.stats['edited'], 0)
+        self.assertEqual([call[0] for call in bot.calls], ['send'])
+
+    def test_changed_table_is_edited(self):
+        bot, outbox = self.run_outbox(
+            dict(chat_id=CHAT_ID, text="table", reply_markup=table_markup(1), slot="table"),
+            dict(chat_id=CHAT_ID, text="table v2", reply_markup=table_markup(2), slot="table"))
+        self.assertEqual(outbox.stats['edited'], 1)
+        self.assertEqual([call[0] for call in bot.calls], ['send', 'edit'])
+
+    def test_string_chat_id_shares_queue(self):
+        bot, outbox = self.run_outbox(
+            dict(chat_id=str(CHAT_ID), text="table", slot="table"),
+            dict(chat_id=CHAT_ID, text="table", slot="table"))
+        self.assertEqual(list(outbox._chats), [CHAT_ID])
+        self.assertEqual(outbox.stats['skipped'], 1)
+        self.assertEqual(bot.calls, [('send', CHAT_ID, "table")])
+
+
+if __name__ == "__main__":
+    unittest.main()
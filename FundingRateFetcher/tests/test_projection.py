@@ -0,0 +1,36 @@
+import os
+import sys
+import unittest
+import importlib.util
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@unittest.skipUnless(importlib.util.find_spec('pandas') is not None,
+                     "pandas is not installed")
+class FundingProjectionTest(unittest.TestCase):
+    def test_duplicate_venue_rows_keep_latest_funding_time(self):
+        import pandas as pd
+        from projection import FundingProjection
+
+        start = pd.Timestamp('2024-01-01 00:00', tz='UTC')
+        slots = [start + pd.Timedelta(hours=h) for h in range(8)]
+        frame = pd.DataFrame({
+            'ticker': ['BTC', 'BTC', 'ETH'],
+            'settle': ['USDT', 'USDT', 'USDT'],
+            'funding_rate': [0.03, 0.01, 0.02],
+            'interval': [8, 8, 8],
+            'fundingTimestamp': [slots[2], slots[1], slots[1]],
+        })
+        # NOTE: The later-listed BTC row has the earlier funding time and must lose
+
+        projection = FundingProjection.build({'binance': frame}, slots, tz='UTC')
+        btc = projection.tickers.get_loc('BTC')
+        column = projection.cube[:, btc, 0]
+        self.assertEqual(column[2], 0.03)
+        self.assertEqual(column[1], 0.0)
+        self.assertEqual(projection.horizon(8).loc['BTC'].iloc[0], 0.03)
+
+
+if __name__ == "__main__":
+    unittest.main()
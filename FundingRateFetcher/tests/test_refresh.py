@@ -0,0 +1,77 @@
+import asyncio
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from refresh import RefreshCoordinator
+from signals import OpportunitySet, SignalBus, SignalFilter
+
+
+def pair(ticker: str, er: float) -> dict:
+    return {'ticker': ticker, 'exch1': 'binance', 'exch2': 'bybit',
+            'symbol1': f"{ticker}/USDT:USDT", 'symbol2': f"{ticker}/USDT:USDT",
+            'pos1': 'L', 'pos2': 'S', 'tm': 'T', 'diff': er, 'ER': er,
+            'bid1': 1.0, 'ask1': 1.1, 'bid2': float('nan'), 'ask2': None}
+
+
+class Records(list):
+    def to_dict(self, orient: str) -> list[dict]:
+        return list(self)
+
+
+class FakeViewer:
+    def __init__(self, pairs: list[dict]):
+        self.pairs = pairs
+        self.ranked_calls = 0
+
+    def ranked_pairs(self, k: int | None = None) -> Records:
+        self.ranked_calls += 1
+        return Records(self.pairs[:k])
+
+
+class RefreshSignalTest(unittest.TestCase):
+    def test_signal_is_ranked_once_per_snapshot(self):
+        viewer = FakeViewer([pair('BTC', 0.02), pair('ETH', 0.01)])
+
+        async def main():
+            bus = SignalBus()
+            sub = bus.subscribe()
+            coordinator = RefreshCoordinator(build=lambda: viewer, store={}, bus=bus)
+            snapshot = await coordinator.refresh()
+            return snapshot, await sub.get(timeout=1.0)
+
+        snapshot, signal = asyncio.run(main())
+        self.assertEqual(viewer.ranked_calls, 1)
+        self.assertEqual(signal.snapshot_id, snapshot.snapshot_id)
+        self.assertEqual([o.ticker for o in signal.opportunities], ['BTC', 'ETH'])
+        self.assertIsNone(signal.opportunities[0].bid2)
+
+    def test_signal_error_keeps_snapshot(self):
+        async def main():
+            coordinator = RefreshCoordinator(build=lambda: object(), store={}, bus=SignalBus())
+            return await coordinator.refresh(), coordinator._bus.published
+
+        snapshot, published = asyncio.run(main())
+        self.assertIsNotNone(snapshot.viewer)
+        self.assertEqual(published, 0)
+
+
+class SignalFilterTest(unittest.TestCase):
+    def test_empty_filtered_set_is_not_delivered(self):
+        signal = OpportunitySet.from_viewer(FakeViewer([pair('BTC', 0.02)]), snapshot_id=1)
+
+        async def main():
+            bus = SignalBus()
+            sub = bus.subscribe(SignalFilter(tickers=['ETH']))
+            bus.publish(signal)
+            return sub, await sub.get(timeout=0.05)
+
+        sub, delivered = asyncio.run(main())
+        self.assertIsNone(delivered)
+        self.assertEqual((sub.received, sub.skipped), (0, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
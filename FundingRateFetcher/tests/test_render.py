@@ -0,0 +1,44 @@
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import render
+from render import RenderCache, RenderedSnapshot, detail_data
+
+
+def rendered(snapshot_id: int, table: str = "table", detail: str = "row") -> RenderedSnapshot:
+    return RenderedSnapshot(snapshot_id=snapshot_id,
+                            table=table,
+                            buttons=(("BTC / binance / bybit", detail_data(snapshot_id, 0)),),
+                            details=(detail,))
+
+
+def snapshot(snapshot_id: int):
+    return type('Snapshot', (), {'snapshot_id': snapshot_id})()
+
+
+class RenderCacheTest(unittest.TestCase):
+    def render_all(self, cache: RenderCache, *renders: RenderedSnapshot):
+        for item in renders:
+            with mock.patch.object(render, 'render_snapshot', return_value=item):
+                cache.render(snapshot(item.snapshot_id))
+
+    def test_unchanged_table_keeps_shown_ids_resolvable(self):
+        cache = RenderCache(max_snapshots=2)
+        self.render_all(cache, *(rendered(i, detail=f"row {i}") for i in range(1, 6)))
+        # NOTE: Snapshot 1 is still on screen, it resolves to the newest details
+        self.assertEqual(cache.get(1).detail(0), "row 5")
+        self.assertEqual(cache.get(5).detail(0), "row 5")
+
+    def test_changed_table_expires_old_ids(self):
+        cache = RenderCache(max_snapshots=2)
+        self.render_all(cache, *(rendered(i, table=f"table {i}") for i in range(1, 4)))
+        self.assertIsNone(cache.get(1))
+        self.assertEqual(cache.get(2).table, "table 2")
+
+
+if __name__ == "__main__":
+    unittest.main()
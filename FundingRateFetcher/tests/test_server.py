@@ -0,0 +1,32 @@
+import os
+import sys
+import unittest
+import importlib.util
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+ETAG = '"1700000000000-0123456789ab"'
+
+
+@unittest.skipUnless(all(importlib.util.find_spec(name) for name in ('pandas', 'pytz')),
+                     "pandas/pytz are not installed")
+class IfNoneMatchTest(unittest.TestCase):
+    def not_modified(self, header):
+        from server import QueryHandler
+        return QueryHandler._not_modified(ETAG, header)
+
+    def test_matches_listed_and_weak_tags(self):
+        self.assertTrue(self.not_modified(ETAG))
+        self.assertTrue(self.not_modified(f'"other", {ETAG}'))
+        self.assertTrue(self.not_modified(f'W/{ETAG}'))
+        self.assertTrue(self.not_modified('*'))
+
+    def test_rejects_partial_and_missing_tags(self):
+        self.assertFalse(self.not_modified(None))
+        self.assertFalse(self.not_modified(''))
+        self.assertFalse(self.not_modified(f'"x{ETAG[1:]}'))
+        self.assertFalse(self.not_modified('"1700000000000-0123"'))
+
+
+if __name__ == "__main__":
+    unittest.main()
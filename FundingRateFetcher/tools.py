@@ -90,6 +90,28 @@ class Tools:
                     raise RuntimeError(
                         f"Failed to execute function after retry: {final_e}")
 
+    @staticmethod
+    def canonical_ticker(symbol: str) -> str:
+        ticker = symbol.split('/')[0]
+        match = re.match(r'^(\d+)([A-Za-z]+)$', ticker)
+        if match and int(match.group(1)) >= 10:
+            return match.group(2)
+        return ticker
+
+    @staticmethod
+    def find_ticker(data_map: dict[str, pd.DataFrame], ticker: str) -> pd.DataFrame:
+        datas = {}
+        for exch_name, df in data_map.items():
+            if isinstance(df, pd.DataFrame) and ticker in df.index:
+                data = df.loc[[ticker]]
+                datas[exch_name] = data
+
+        if not datas:
+            return pd.DataFrame()
+
+        res = pd.concat(datas, names=['exchange', 'ticker'])
+        return res
+
     @staticmethod
     def override_if_exists(main_dict: dict, exc_dict: dict):
         for key, exc_val in exc_dict.items():